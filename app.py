@@ -7,6 +7,7 @@ import base64
 from utils.stock_data import get_stock_data
 from utils.portfolio import get_portfolio_data
 from utils.db import get_portfolio_data_from_db, init_db, init_demo_data
+from utils.warmup import start_warmup_scheduler
 
 # Set page configuration (must be the first Streamlit command)
 st.set_page_config(
@@ -82,6 +83,9 @@ if not st.session_state.db_initialized:
     except Exception as e:
         st.error(f"Database initialization error: {e}")
 
+# Warm the data caches before each trading session (runs once per process)
+start_warmup_scheduler()
+
 # Display logo in sidebar
 display_logo()
 
@@ -1,6 +1,7 @@
 import streamlit as st
 import pandas as pd
 from utils.db import get_db_session, Portfolio, Stock, Holding, User
+from utils.symbols import canonical_symbol
 import datetime
 
 def show_portfolio_management():
@@ -190,10 +191,7 @@ def manage_holdings(user_id):
                 return
             
             # Format ticker for database
-            if not ticker.endswith(('.NS', '.BO')) and ticker not in ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'META']:
-                db_ticker = f"{ticker}.NS"
-            else:
-                db_ticker = ticker
+            db_ticker = canonical_symbol(ticker)
             
             # Check if stock exists
             stock = db.query(Stock).filter_by(ticker=db_ticker).first()
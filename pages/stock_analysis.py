@@ -403,15 +403,17 @@ def display_analysis_results(results):
                 tech_insights.append(f"- RSI at **{rsi:.1f}** is neutral")
         
         # MACD
-        macd_crossover = tech_analysis.get('macd_crossover')
-        if macd_crossover:
-            tech_insights.append(f"- Recent **{macd_crossover} MACD crossover** detected")
+        macd_crossovers = tech_analysis.get('macd_crossovers', [])
+        if macd_crossovers:
+            cross = macd_crossovers[-1]
+            tech_insights.append(f"- **{cross['direction']} MACD crossover** on {cross['date']:%d %b %Y}")
         
         # Golden/Death cross
-        if tech_analysis.get('golden_cross'):
-            tech_insights.append("- Recent **Golden Cross** (bullish signal)")
-        if tech_analysis.get('death_cross'):
-            tech_insights.append("- Recent **Death Cross** (bearish signal)")
+        for cross in tech_analysis.get('sma_crossovers', []):
+            if cross['direction'] == 'Bullish':
+                tech_insights.append(f"- **Golden Cross** on {cross['date']:%d %b %Y} (bullish signal)")
+            else:
+                tech_insights.append(f"- **Death Cross** on {cross['date']:%d %b %Y} (bearish signal)")
         
         # Display technical insights
         if tech_insights:
@@ -486,9 +488,12 @@ def display_analysis_results(results):
         with col2:
             st.write("**Trend Indicators**")
             trend_data = {
-                'Indicator': ['Trend', 'ADX', 'ADX Signal', '+DI', '-DI'],
+                'Indicator': ['Trend', 'Weekly Trend', 'Monthly Trend', 'Trend Confirmation', 'ADX', 'ADX Signal', '+DI', '-DI'],
                 'Value': [
                     tech_analysis.get('trend', 'N/A'),
+                    tech_analysis.get('weekly_trend', 'N/A'),
+                    tech_analysis.get('monthly_trend', 'N/A'),
+                    tech_analysis.get('trend_confirmation', 'N/A'),
                     f"{tech_analysis.get('adx', 0):.2f}",
                     tech_analysis.get('adx_signal', 'N/A'),
                     f"{tech_analysis.get('pdi', 0):.2f}",
@@ -528,6 +533,12 @@ def display_analysis_results(results):
             signals.append("🟢 Bullish RSI Divergence: Price making lower lows while RSI making higher lows")
         if tech_analysis.get('rsi_divergence') == 'Bearish':
             signals.append("🔴 Bearish RSI Divergence: Price making higher highs while RSI making lower highs")
+        for name, label in (('macd', 'MACD'), ('obv', 'OBV'), ('mfi', 'MFI')):
+            divergence = tech_analysis.get('divergences', {}).get(name)
+            if divergence == 'Bullish':
+                signals.append(f"🟢 Bullish {label} Divergence: Price making lower lows while {label} making higher lows")
+            if divergence == 'Bearish':
+                signals.append(f"🔴 Bearish {label} Divergence: Price making higher highs while {label} making lower highs")
         if tech_analysis.get('macd_crossover') == 'Bullish':
             signals.append("🟢 Bullish MACD Crossover: MACD line crossed above signal line")
         if tech_analysis.get('macd_crossover') == 'Bearish':
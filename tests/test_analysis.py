@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils.analysis import MIN_ANALYSIS_BARS, analyze_technical_indicators, technical_score_series
+from utils.stock_data import calculate_technical_indicators
+
+
+SIGNALS = ['rsi_signal', 'volume_signal', 'mfi_signal', 'tech_score', 'overall_technical']
+
+
+def _stock_data(bars, seed):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, bars)))
+    volume = rng.integers(1000, 5000, bars).astype(np.int64)
+    # Bursts and lulls so the volume signal takes all its values
+    volume[rng.choice(bars, bars // 10, replace=False)] *= 6
+    return calculate_technical_indicators(pd.DataFrame({
+        'date': pd.bdate_range('2016-01-01', periods=bars),
+        'open': close,
+        'high': close * (1 + rng.uniform(0, 0.02, bars)),
+        'low': close * (1 - rng.uniform(0, 0.02, bars)),
+        'close': close,
+        'volume': volume,
+    }))
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_score_series_matches_scalar_score_on_every_bar(seed):
+    stock_data = _stock_data(320, seed)
+    series = technical_score_series(stock_data)
+    assert series['tech_score'].iloc[:MIN_ANALYSIS_BARS - 1].isna().all()
+    
+    for end in range(MIN_ANALYSIS_BARS, len(stock_data) + 1, 3):
+        expected = analyze_technical_indicators(stock_data.iloc[:end])
+        row = series.iloc[end - 1]
+        assert [row[name] for name in SIGNALS] == [expected[name] for name in SIGNALS], end
+        assert row['trend'] == expected['trend'], end
@@ -0,0 +1,112 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from utils.async_fetch import AsyncFetchEngine
+
+
+RATE = 20.0
+BURST = 4
+MAX_CONCURRENCY = 3
+REQUESTS = 16
+
+# Time each response is held open, so concurrent requests overlap on the server
+RESPONSE_DELAY = 0.05
+
+# Allowance for floating-point error in the token grant times
+TIMING_SLACK = 1e-6
+
+
+class _RecordingHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.arrivals.append(time.monotonic())
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        time.sleep(RESPONSE_DELAY)
+        with server.lock:
+            server.in_flight -= 1
+        
+        body = self.path.encode()
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+def _record_grants(bucket):
+    # Clock readings at which the bucket handed out a token
+    grants = []
+    clock = bucket._clock
+    readings = []
+    
+    def recording_clock():
+        readings.append(clock())
+        return readings[-1]
+    
+    reserve = bucket._reserve
+    
+    def recording_reserve(tokens):
+        wait = reserve(tokens)
+        if wait == 0:
+            grants.append(readings[-1])
+        return wait
+    
+    bucket._clock = recording_clock
+    bucket._reserve = recording_reserve
+    return grants
+
+
+@pytest.fixture
+def server(monkeypatch):
+    for name in ('http_proxy', 'HTTP_PROXY', 'all_proxy', 'ALL_PROXY'):
+        monkeypatch.delenv(name, raising=False)
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _RecordingHandler)
+    server.lock = threading.Lock()
+    server.arrivals = []
+    server.in_flight = 0
+    server.max_in_flight = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetch_url_respects_rate_burst_and_concurrency(server):
+    engine = AsyncFetchEngine(
+        max_concurrency=MAX_CONCURRENCY,
+        rate_limits={'local': {'rate': RATE, 'burst': BURST}},
+    )
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    grants = _record_grants(engine.limiter('local'))
+    
+    async def fetch_all():
+        return await asyncio.gather(*(
+            engine.fetch_url(f"{base_url}/{i}", provider='local', timeout=5)
+            for i in range(REQUESTS)
+        ))
+    
+    bodies = asyncio.run(fetch_all())
+    
+    assert sorted(bodies) == sorted(f"/{i}".encode() for i in range(REQUESTS))
+    assert server.max_in_flight <= MAX_CONCURRENCY
+    
+    assert len(server.arrivals) == len(grants) == REQUESTS
+    
+    # Token grant times, not server arrivals: those also carry thread scheduling
+    # jitter, which bunches requests up on a loaded machine.
+    # Any run of requests fits in the burst plus the tokens refilled meanwhile
+    for i in range(len(grants)):
+        for j in range(i, len(grants)):
+            allowed = BURST + RATE * (grants[j] - grants[i] + TIMING_SLACK)
+            assert j - i + 1 <= allowed
+    
+    # The limit actually throttled: beyond the burst, requests came at the rate
+    assert grants[-1] - grants[0] >= (REQUESTS - BURST) / RATE - TIMING_SLACK
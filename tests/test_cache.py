@@ -0,0 +1,40 @@
+import json
+import time
+from utils import cache
+from utils.cache import NEGATIVE_CACHE_MAX_EMPTY, UNAVAILABLE_RECHECK_AFTER, NegativeCache
+
+
+def test_transport_errors_never_mark_a_symbol_unavailable(tmp_path):
+    negative_cache = NegativeCache(str(tmp_path / 'unavailable.json'))
+    for _ in range(3 * NEGATIVE_CACHE_MAX_EMPTY):
+        negative_cache.record_failure('AAPL')
+    
+    assert negative_cache.should_skip('AAPL')
+    assert not negative_cache.is_unavailable('AAPL')
+
+
+def test_unavailable_symbols_are_rechecked_after_expiry(tmp_path, monkeypatch):
+    path = str(tmp_path / 'unavailable.json')
+    negative_cache = NegativeCache(path)
+    for _ in range(NEGATIVE_CACHE_MAX_EMPTY):
+        negative_cache.record_failure('GONE.NS', empty=True)
+    assert negative_cache.is_unavailable('GONE.NS')
+    
+    # The re-check time is saved with the entry and survives a restart
+    reloaded = NegativeCache(path)
+    assert reloaded.is_unavailable('GONE.NS')
+    
+    later = time.time() + UNAVAILABLE_RECHECK_AFTER + 1
+    monkeypatch.setattr(cache.time, 'time', lambda: later)
+    assert not reloaded.is_unavailable('GONE.NS')
+    assert not reloaded.should_skip('GONE.NS')
+    assert reloaded.stats()['unavailable'] == 0
+
+
+def test_old_unavailable_list_without_recheck_times_is_retried(tmp_path):
+    path = tmp_path / 'unavailable.json'
+    path.write_text(json.dumps(['AAPL', 'MSFT']))
+    
+    negative_cache = NegativeCache(str(path))
+    assert not negative_cache.is_unavailable('AAPL')
+    assert not negative_cache.should_skip('MSFT')
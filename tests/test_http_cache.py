@@ -0,0 +1,42 @@
+from utils import http_cache
+from utils.http_cache import CachedSession, ResponseCache
+
+
+QUOTE_URL = 'https://query2.finance.yahoo.com/v10/finance/quoteSummary/AAPL'
+CHART_URL = 'https://query2.finance.yahoo.com/v8/finance/chart/AAPL'
+
+
+class _CountingLimiter:
+    def __init__(self):
+        self.tokens = 0
+    
+    def acquire_blocking(self, tokens=1):
+        self.tokens += tokens
+
+
+class _Response:
+    status_code = 200
+    content = b'{}'
+    headers = {'content-type': 'application/json'}
+
+
+def test_only_network_requests_take_rate_limit_tokens(tmp_path, monkeypatch):
+    sent = []
+    
+    def fake_request(self, method, url, **kwargs):
+        sent.append(url)
+        return _Response()
+    
+    monkeypatch.setattr(http_cache.curl_requests.Session, 'request', fake_request)
+    limiter = _CountingLimiter()
+    session = CachedSession(ResponseCache(str(tmp_path)), mode='normal', limiter=limiter)
+    
+    # A cacheable endpoint goes out once; the repeat is a cache hit
+    session.request('GET', QUOTE_URL, params={'modules': 'price'})
+    session.request('GET', QUOTE_URL, params={'modules': 'price'})
+    # Uncached endpoints go out every time
+    session.request('GET', CHART_URL)
+    session.request('GET', CHART_URL)
+    
+    assert sent == [QUOTE_URL, CHART_URL, CHART_URL]
+    assert limiter.tokens == len(sent)
@@ -0,0 +1,203 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils import indicators
+from utils import stock_data
+from utils.cache import indicator_cache
+from utils.indicators import compute_indicators, compute_tail, resolve_indicators, warmup_bars
+
+
+COLUMNS = ['sma_20', 'macd', 'rsi', 'adx', 'obv', 'daily_return']
+TAIL = 40
+
+# Output column order (MACD adds the EMAs it is built from)
+RESOLVED = resolve_indicators(COLUMNS)
+
+
+def _prices(bars, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, bars)))
+    return pd.DataFrame({
+        'date': pd.bdate_range('2016-01-01', periods=bars),
+        'open': close,
+        'high': close * 1.01,
+        'low': close * 0.99,
+        'close': close,
+        'volume': rng.integers(1000, 5000, bars).astype(np.int64),
+    })
+
+
+@pytest.fixture(autouse=True)
+def clear_indicator_cache():
+    indicator_cache.clear()
+    yield
+    indicator_cache.clear()
+
+
+def _record_lengths(monkeypatch, module, name):
+    lengths = []
+    original = getattr(module, name)
+    
+    def recording(high, low, close, volume, *args, **kwargs):
+        lengths.append(close.shape[0])
+        return original(high, low, close, volume, *args, **kwargs)
+    
+    monkeypatch.setattr(module, name, recording)
+    return lengths
+
+
+def test_looser_tolerance_needs_fewer_warmup_bars():
+    assert warmup_bars(COLUMNS, 1e-3) < warmup_bars(COLUMNS)
+
+
+@pytest.mark.parametrize('tolerance', [None, 1e-3])
+def test_tail_computes_windowed_indicators_over_trimmed_bars(monkeypatch, tolerance):
+    df = _prices(2600)
+    arrays = [df[name].to_numpy(dtype=np.float64) for name in ('high', 'low', 'close', 'volume')]
+    expected = compute_indicators(*arrays, COLUMNS)
+    
+    lengths = _record_lengths(monkeypatch, indicators, 'compute_indicators')
+    values = compute_tail(*arrays, TAIL, COLUMNS, tolerance)
+    
+    # One pass over the last bars plus warm-up, one over all bars for OBV and returns
+    assert sorted(lengths) == [TAIL + warmup_bars(COLUMNS, tolerance), len(df)]
+    bound = 1e-6 if tolerance is None else 1e-1
+    np.testing.assert_allclose(values[-TAIL:], expected[-TAIL:], rtol=bound, atol=bound)
+    assert np.isnan(values[:-TAIL, RESOLVED.index('rsi')]).all()
+
+
+def test_tail_without_enough_history_is_one_pass(monkeypatch):
+    df = _prices(250)
+    arrays = [df[name].to_numpy(dtype=np.float64) for name in ('high', 'low', 'close', 'volume')]
+    expected = compute_indicators(*arrays, COLUMNS)
+    
+    lengths = _record_lengths(monkeypatch, indicators, 'compute_indicators')
+    values = compute_tail(*arrays, TAIL, COLUMNS)
+    
+    assert lengths == [len(df)]
+    np.testing.assert_array_equal(values[-TAIL:], expected[-TAIL:])
+    np.testing.assert_array_equal(values[:, RESOLVED.index('obv')], expected[:, RESOLVED.index('obv')])
+    assert np.isnan(values[:-TAIL, RESOLVED.index('sma_20')]).all()
+
+
+def test_batch_tail_trims_panel_and_keeps_full_history_columns(monkeypatch):
+    frames = {'AAA': _prices(2600, seed=1), 'BBB': _prices(2600, seed=2)}
+    expected = {
+        ticker: stock_data.calculate_technical_indicators(df, COLUMNS, TAIL)
+        for ticker, df in frames.items()
+    }
+    indicator_cache.clear()
+    
+    lengths = _record_lengths(monkeypatch, stock_data, 'compute_panel')
+    results = stock_data.calculate_technical_indicators_batch(frames, COLUMNS, tail=TAIL)
+    
+    # The windowed panel sees the trimmed rows; OBV and returns one full pass
+    assert lengths == [TAIL + warmup_bars(COLUMNS), 2600]
+    for ticker, result in results.items():
+        pd.testing.assert_frame_equal(result, expected[ticker], rtol=1e-9)
+
+
+def _ta_reference(df):
+    # The ta-based implementation the NumPy engine replaced
+    from ta.momentum import RSIIndicator, StochasticOscillator
+    from ta.trend import ADXIndicator, EMAIndicator, SMAIndicator
+    from ta.volatility import BollingerBands
+    from ta.volume import MFIIndicator, OnBalanceVolumeIndicator
+    
+    high, low, close, volume = df['high'], df['low'], df['close'], df['volume']
+    reference = {f"sma_{window}": SMAIndicator(close=close, window=window).sma_indicator() for window in (20, 50, 200)}
+    reference['ema_12'] = EMAIndicator(close=close, window=12).ema_indicator()
+    reference['ema_26'] = EMAIndicator(close=close, window=26).ema_indicator()
+    reference['macd'] = reference['ema_12'] - reference['ema_26']
+    reference['macd_signal'] = EMAIndicator(close=reference['macd'], window=9).ema_indicator()
+    reference['macd_hist'] = reference['macd'] - reference['macd_signal']
+    reference['rsi'] = RSIIndicator(close=close, window=14).rsi()
+    stoch = StochasticOscillator(high=high, low=low, close=close, window=14, smooth_window=3)
+    reference['stoch_k'] = stoch.stoch()
+    reference['stoch_d'] = stoch.stoch_signal()
+    if len(df) > 14:
+        adx = ADXIndicator(high=high, low=low, close=close, window=14)
+        reference['adx'] = adx.adx()
+        reference['pdi'] = adx.adx_pos()
+        reference['ndi'] = adx.adx_neg()
+    bollinger = BollingerBands(close=close, window=20, window_dev=2)
+    reference['bollinger_high'] = bollinger.bollinger_hband()
+    reference['bollinger_low'] = bollinger.bollinger_lband()
+    reference['bollinger_mid'] = bollinger.bollinger_mavg()
+    reference['obv'] = OnBalanceVolumeIndicator(close=close, volume=volume).on_balance_volume()
+    reference['mfi'] = MFIIndicator(high=high, low=low, close=close, volume=volume, window=14).money_flow_index()
+    return reference
+
+
+def _ohlcv(bars, seed=0, zero_volume=False):
+    df = _prices(bars, seed)
+    rng = np.random.default_rng(seed + 100)
+    df['high'] = df['close'] * (1 + rng.uniform(0, 0.02, bars))
+    df['low'] = df['close'] * (1 - rng.uniform(0, 0.02, bars))
+    if zero_volume:
+        df.loc[df.index[bars // 3:bars // 3 + 20], 'volume'] = 0
+    return df
+
+
+@pytest.mark.parametrize('bars, zero_volume', [(30, False), (120, False), (260, False), (2600, False), (260, True)])
+def test_matches_ta_reference(bars, zero_volume):
+    df = _ohlcv(bars, seed=bars, zero_volume=zero_volume)
+    result = stock_data.calculate_technical_indicators(df)
+    
+    for name, expected in _ta_reference(df).items():
+        actual = result[name].to_numpy(dtype=np.float64)
+        expected = expected.to_numpy(dtype=np.float64)
+        np.testing.assert_array_equal(np.isnan(actual), np.isnan(expected), err_msg=name)
+        np.testing.assert_allclose(actual, expected, rtol=1e-7, atol=1e-7, equal_nan=True, err_msg=name)
+
+
+def test_panel_matches_per_ticker_computation():
+    frames = {
+        'AAA': _ohlcv(400, seed=1),
+        'BBB': _ohlcv(300, seed=2).iloc[50:],                   # starts later
+        'CCC': _ohlcv(400, seed=3).drop(index=range(100, 110)),  # missing dates
+    }
+    prices = indicators.price_panel(frames)
+    values = indicators.compute_panel(*(prices[field].to_numpy() for field in ('high', 'low', 'close', 'volume')))
+    dates = prices.index.to_numpy()
+    
+    for j, df in enumerate(frames.values()):
+        expected = compute_indicators(*(df[field].to_numpy() for field in ('high', 'low', 'close', 'volume')))
+        rows = np.searchsorted(dates, df['date'].to_numpy())
+        np.testing.assert_allclose(values[rows, j], expected, rtol=1e-12, atol=1e-12, equal_nan=True)
+
+
+def test_batch_keeps_nan_closes_of_a_frame():
+    df = _ohlcv(300, seed=4)
+    df.loc[df.index[150], 'close'] = np.nan
+    frames = {'AAA': df, 'BBB': _ohlcv(300, seed=5)}
+    expected = stock_data.calculate_technical_indicators(df)
+    indicator_cache.clear()
+    
+    result = stock_data.calculate_technical_indicators_batch(frames)['AAA']
+    pd.testing.assert_frame_equal(result, expected)
+
+
+@pytest.mark.parametrize('window', [1, 3, 14, 20, 64, 300])
+def test_rolling_extremes_match_pandas(window):
+    rng = np.random.default_rng(window)
+    x = rng.normal(0, 1, (250, 3))
+    x[[10, 11, 120], [0, 0, 2]] = np.nan
+    
+    expected = pd.DataFrame(x).rolling(window)
+    np.testing.assert_array_equal(indicators.rolling_max(x, window), expected.max().to_numpy())
+    np.testing.assert_array_equal(indicators.rolling_min(x, window), expected.min().to_numpy())
+
+
+@pytest.mark.skipif(not indicators.NUMBA_AVAILABLE, reason='numba is not installed')
+def test_numba_kernels_match_numpy_fallback(monkeypatch):
+    df = _ohlcv(2600, seed=6)
+    arrays = [df[field].to_numpy(dtype=np.float64) for field in ('high', 'low', 'close', 'volume')]
+    
+    monkeypatch.setattr(indicators, 'INDICATOR_BACKEND', 'numba')
+    compiled = compute_indicators(*arrays)
+    monkeypatch.setattr(indicators, 'INDICATOR_BACKEND', 'numpy')
+    fallback = compute_indicators(*arrays)
+    
+    np.testing.assert_array_equal(np.isnan(compiled), np.isnan(fallback))
+    np.testing.assert_allclose(compiled, fallback, rtol=1e-12, atol=1e-11, equal_nan=True)
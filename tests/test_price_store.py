@@ -0,0 +1,40 @@
+import pandas as pd
+from utils.price_store import needs_readjustment
+
+
+def _prices(dates, closes, dividends=None):
+    return pd.DataFrame({
+        'date': pd.to_datetime(dates),
+        'close': closes,
+        'dividends': dividends if dividends is not None else [0.0] * len(closes),
+        'stock_splits': [0.0] * len(closes),
+    })
+
+
+STORED = _prices(['2026-10-12', '2026-10-13', '2026-10-14'], [100.0, 101.0, 102.0])
+
+
+def test_clean_delta_is_merged():
+    fresh = _prices(['2026-10-13', '2026-10-14', '2026-10-15'], [101.0, 102.0, 103.0])
+    assert not needs_readjustment(STORED, fresh)
+
+
+def test_dividend_on_new_bar_needs_readjustment():
+    fresh = _prices(['2026-10-13', '2026-10-14', '2026-10-15'], [101.0, 102.0, 103.0], [0.0, 0.0, 1.5])
+    assert needs_readjustment(STORED, fresh)
+
+
+def test_dividend_on_stored_overlap_bar_is_ignored():
+    fresh = _prices(['2026-10-13', '2026-10-14', '2026-10-15'], [101.0, 102.0, 103.0], [0.0, 1.5, 0.0])
+    assert not needs_readjustment(STORED, fresh)
+
+
+def test_rebased_overlap_closes_need_readjustment():
+    fresh = _prices(['2026-10-13', '2026-10-14', '2026-10-15'], [100.0, 101.0, 103.0])
+    assert needs_readjustment(STORED, fresh)
+
+
+def test_moving_last_stored_bar_is_not_readjusted():
+    # The last stored bar was stored mid-session and has moved since
+    fresh = _prices(['2026-10-13', '2026-10-14'], [101.0, 102.5])
+    assert not needs_readjustment(STORED, fresh)
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from utils.signals import cross_points, divergence, swing_points
+
+
+# Price with swing lows on bars 10 and 25 (the second lower) and a swing high on
+# bar 17, and an indicator with a higher low on bar 25: a bullish divergence
+KNOTS = [0, 10, 17, 25, 32]
+PRICE = np.interp(np.arange(33), KNOTS, [100, 90, 97, 85, 92])
+INDICATOR = np.interp(np.arange(33), KNOTS, [50, 30, 45, 35, 48])
+
+
+def _loop_crossings(fast, slow):
+    # The per-bar comparison analyze_technical_indicators used before cross_points
+    crossings = []
+    for i in range(len(fast) - 1):
+        if fast[i] < slow[i] and fast[i + 1] > slow[i + 1]:
+            crossings.append((i + 1, 1))
+        if fast[i] > slow[i] and fast[i + 1] < slow[i + 1]:
+            crossings.append((i + 1, -1))
+    return crossings
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_cross_points_match_loop(seed):
+    rng = np.random.default_rng(seed)
+    # Rounded values are often equal, so ties between crossings are covered
+    fast = np.round(rng.normal(0, 1, 300))
+    slow = np.round(rng.normal(0, 1, 300))
+    fast[50:60] = np.nan
+    slow[200] = np.nan
+    
+    positions, directions = cross_points(fast, slow)
+    assert list(zip(positions.tolist(), directions.tolist())) == _loop_crossings(fast, slow)
+
+
+def test_swing_points_on_constructed_sequence():
+    highs, lows = swing_points(PRICE, order=3)
+    assert np.flatnonzero(highs).tolist() == [17]
+    assert np.flatnonzero(lows).tolist() == [10, 25]
+    
+    # Only the first bar of a flat top is a swing high
+    highs, _ = swing_points([0, 1, 2, 5, 5, 5, 2, 1, 0], order=2)
+    assert np.flatnonzero(highs).tolist() == [3]
+
+
+def test_divergence_on_constructed_sequences():
+    assert divergence(PRICE, INDICATOR, order=3, lookback=None) == 1
+    # Mirrored: higher high in price, lower high in the indicator
+    assert divergence(200 - PRICE, 100 - INDICATOR, order=3, lookback=None) == -1
+    # Indicator confirming the lower low
+    assert divergence(PRICE, PRICE, order=3, lookback=None) == 0
+    
+    # Column-wise on a panel
+    panel = divergence(np.column_stack([PRICE, 200 - PRICE, PRICE]),
+                       np.column_stack([INDICATOR, 100 - INDICATOR, PRICE]), order=3, lookback=None)
+    assert panel.tolist() == [1, -1, 0]
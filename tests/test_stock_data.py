@@ -0,0 +1,161 @@
+import os
+import pandas as pd
+import pytest
+from utils import price_store
+from utils import stock_data
+from utils.cache import NegativeCache, data_cache
+from utils.price_store import merge_prices
+
+
+SESSIONS = pd.to_datetime(['2026-10-13', '2026-10-14'])
+
+
+def _history(index, base):
+    return pd.DataFrame({
+        'Open': [base, base + 1.0],
+        'High': [base + 2.0, base + 3.0],
+        'Low': [base - 1.0, base],
+        'Close': [base + 1.0, base + 2.0],
+        'Volume': [1000, 2000],
+        'Dividends': [0.0, 0.0],
+        'Stock Splits': [0.0, 0.0],
+    }, index=index)
+
+
+@pytest.fixture
+def price_store_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(price_store, 'PRICE_STORE_DIR', str(tmp_path))
+    monkeypatch.setattr(stock_data, 'negative_cache', NegativeCache(str(tmp_path / 'unavailable.json')))
+    data_cache.clear()
+    yield tmp_path
+    data_cache.clear()
+
+
+def test_batch_download_keeps_exchange_local_dates(price_store_dir, monkeypatch):
+    calls = []
+    
+    def fake_download(tickers, **kwargs):
+        calls.append(kwargs)
+        # With ignore_tz=True yfinance returns each ticker's exchange-local dates
+        frames = {ticker: _history(SESSIONS, 100.0 * (i + 1)) for i, ticker in enumerate(tickers)}
+        return pd.concat(frames, axis=1)
+    
+    monkeypatch.setattr(stock_data.yf, 'download', fake_download)
+    results = stock_data.get_stock_data_batch(['RELIANCE.NS', 'AAPL'], period='1mo', incremental=False)
+    
+    assert calls and all(call['ignore_tz'] is True for call in calls)
+    for ticker in ('RELIANCE.NS', 'AAPL'):
+        assert list(results[ticker]['date']) == list(SESSIONS)
+    
+    # The single-ticker path (tz-aware history at local midnight) lands on the
+    # same dates, so merging both paths into the store does not duplicate bars
+    for ticker, tz in (('RELIANCE.NS', 'Asia/Kolkata'), ('AAPL', 'America/New_York')):
+        single = stock_data._normalize_history(_history(SESSIONS.tz_localize(tz), 50.0))
+        merged = merge_prices(price_store.load_prices(ticker), single)
+        assert len(merged) == len(SESSIONS)
+        assert list(merged['date']) == list(SESSIONS)
+
+
+def test_batch_delta_with_dividend_replaces_stored_history(price_store_dir, monkeypatch):
+    stored = stock_data._normalize_history(_history(SESSIONS, 100.0))
+    price_store.save_prices('AAPL', stored)
+    monkeypatch.setattr(stock_data, 'covers_period', lambda df, period: df is not None)
+    monkeypatch.setattr(stock_data, 'is_fresh', lambda ticker: False)
+    
+    calls = []
+    
+    def fake_download(tickers, **kwargs):
+        calls.append(kwargs)
+        if kwargs['start'] == '2026-10-13':
+            # Full re-download: every bar on the new, dividend-adjusted basis
+            dates, closes = ['2026-10-13', '2026-10-14', '2026-10-15'], [91.0, 92.0, 94.0]
+        else:
+            # Delta from the overlap bar, with a dividend on the new bar
+            dates, closes = ['2026-10-14', '2026-10-15'], [92.0, 94.0]
+        hist = pd.DataFrame({
+            'Open': closes, 'High': closes, 'Low': closes, 'Close': closes,
+            'Volume': [1000] * len(closes),
+            'Dividends': [0.0] * (len(closes) - 1) + [1.0],
+            'Stock Splits': [0.0] * len(closes),
+        }, index=pd.to_datetime(dates))
+        return pd.concat({tickers[0]: hist}, axis=1)
+    
+    monkeypatch.setattr(stock_data.yf, 'download', fake_download)
+    monkeypatch.setattr(stock_data, 'delta_start', lambda df: '2026-10-14')
+    results = stock_data.get_stock_data_batch(['AAPL'], period='1mo')
+    
+    assert [call['start'] for call in calls] == ['2026-10-14', '2026-10-13']
+    saved = price_store.load_prices('AAPL')
+    assert list(saved['close']) == pytest.approx([91.0, 92.0, 94.0])
+    assert list(results['AAPL']['close']) == pytest.approx([91.0, 92.0, 94.0])
+
+
+def _stale_store(ticker, monkeypatch):
+    # Stored bars covering the period, written long enough ago to need a refresh
+    price_store.save_prices(ticker, stock_data._normalize_history(_history(SESSIONS, 100.0)))
+    path = price_store._store_path(ticker)
+    written = os.path.getmtime(path) - 2 * price_store.PRICE_STORE_EXPIRY
+    os.utime(path, (written, written))
+    monkeypatch.setattr(stock_data, 'covers_period', lambda df, period: df is not None)
+
+
+def test_intraday_change_of_last_bar_is_merged_without_redownload(price_store_dir, monkeypatch):
+    _stale_store('AAPL', monkeypatch)
+    calls = []
+    
+    class FakeTicker:
+        def __init__(self, ticker, session=None):
+            pass
+        
+        def history(self, **kwargs):
+            calls.append(kwargs)
+            hist = _history(SESSIONS, 100.0)
+            hist.loc[SESSIONS[-1], 'Close'] = 102.5
+            return hist
+    
+    monkeypatch.setattr(stock_data.yf, 'Ticker', FakeTicker)
+    result = stock_data.get_stock_data('AAPL', period='1mo')
+    
+    assert calls == [{'start': '2026-10-13'}]
+    assert list(result['close']) == pytest.approx([101.0, 102.5])
+    assert price_store.is_fresh('AAPL')
+
+
+def test_failed_batch_delta_serves_stored_bars_as_stale(price_store_dir, monkeypatch):
+    _stale_store('AAPL', monkeypatch)
+    
+    def failing_download(tickers, **kwargs):
+        raise ConnectionError('throttled')
+    
+    monkeypatch.setattr(stock_data.yf, 'download', failing_download)
+    results = stock_data.get_stock_data_batch(['AAPL'], period='1mo')
+    
+    assert list(results['AAPL']['close']) == pytest.approx([101.0, 102.0])
+    assert not price_store.is_fresh('AAPL')
+    assert stock_data.negative_cache.should_skip('AAPL')
+    assert not stock_data.negative_cache.is_unavailable('AAPL')
+
+
+def test_failed_info_lookup_is_not_cached(tmp_path, monkeypatch):
+    data_cache.clear()
+    monkeypatch.setattr(stock_data, 'negative_cache', NegativeCache(str(tmp_path / 'unavailable.json')))
+    created = []
+    
+    class FakeTicker:
+        recommendations = None
+        financials = balance_sheet = cashflow = pd.DataFrame()
+        
+        def __init__(self, ticker, session=None):
+            created.append(ticker)
+        
+        @property
+        def info(self):
+            raise ConnectionError('info lookup failed')
+    
+    monkeypatch.setattr(stock_data.yf, 'Ticker', FakeTicker)
+    first = stock_data.get_fundamental_data('AAPL')
+    stock_data.get_fundamental_data('AAPL')
+    
+    assert first['market_cap'] is None
+    assert len(created) == 2
+    data_cache.clear()
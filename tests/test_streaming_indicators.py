@@ -0,0 +1,93 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from utils.indicators import INDICATOR_COLUMNS
+from utils.streaming_indicators import MonotonicWindow, RollingWindow, StreamingIndicators, refresh_state
+
+
+def _prices(bars, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, bars)))
+    return pd.DataFrame({
+        'date': pd.bdate_range('2025-01-01', periods=bars),
+        'high': close * (1 + rng.uniform(0, 0.02, bars)),
+        'low': close * (1 - rng.uniform(0, 0.02, bars)),
+        'close': close,
+        'volume': rng.integers(1000, 5000, bars).astype(np.float64),
+    })
+
+
+def _bars(df):
+    return df[['date', 'high', 'low', 'close', 'volume']].to_dict('records')
+
+
+def _state_json(state):
+    # NaN-safe comparison of two states
+    return json.dumps(state.to_dict(), sort_keys=True)
+
+
+def test_window_undo_restores_the_window():
+    rng = np.random.default_rng(1)
+    rolling = RollingWindow(5)
+    highs = MonotonicWindow(5, largest=True)
+    for value in rng.normal(size=20):
+        rolling.push(value)
+        highs.push(value)
+    before = (list(rolling.values), rolling.total, highs.to_list())
+    
+    for value in (10.0, -10.0, float('nan')):
+        rolling.undo(rolling.push(value))
+        highs.undo(highs.push(value))
+        assert (list(rolling.values), rolling.total, highs.to_list()) == before
+
+
+def test_revised_last_bar_matches_replaying_the_final_bar():
+    df = _prices(300)
+    bars = _bars(df)
+    expected = StreamingIndicators.from_history(df)
+    
+    state = StreamingIndicators.from_history(df.iloc[:-1])
+    # Intraday versions of the last bar, then its final values
+    for scale in (0.97, 1.04, 1.0):
+        bar = dict(bars[-1], high=bars[-1]['high'] * scale, close=bars[-1]['close'] * scale)
+        values = state.update(bar)
+    
+    assert _state_json(state) == _state_json(expected)
+    assert json.dumps(values) == json.dumps(expected.values)
+
+
+def test_update_does_not_copy_the_whole_state(monkeypatch):
+    df = _prices(300)
+    state = StreamingIndicators.from_history(df)
+    
+    def fail(self):
+        raise AssertionError('update serialized the whole state')
+    
+    monkeypatch.setattr(StreamingIndicators, 'to_dict', fail)
+    last = _bars(df)[-1]
+    state.update(dict(last, close=last['close'] * 1.01))
+    state.update(dict(last, date=last['date'] + pd.offsets.BDay()))
+
+
+def test_saved_state_can_still_revise_its_last_bar(tmp_path):
+    df = _prices(300)
+    refresh_state('TEST', df.iloc[:-1], str(tmp_path))
+    
+    revised = df.copy()
+    revised.loc[revised.index[-2], 'close'] *= 1.02
+    state = refresh_state('TEST', revised, str(tmp_path))
+    
+    # Restored windows re-sum their values, so totals may differ in the last bits
+    expected = StreamingIndicators.from_history(revised)
+    for restored in (state, StreamingIndicators.load('TEST', str(tmp_path))):
+        assert restored.last_date == expected.last_date
+        assert restored.values == pytest.approx(expected.values, rel=1e-9, nan_ok=True)
+
+
+def test_older_bar_is_rejected():
+    df = _prices(50)
+    state = StreamingIndicators.from_history(df)
+    with pytest.raises(ValueError):
+        state.update(_bars(df)[-2])
+    assert set(state.values) == set(INDICATOR_COLUMNS)
@@ -0,0 +1,33 @@
+from utils import symbols
+from utils.symbols import resolve_symbol
+
+
+def test_resolves_symbol_by_isin():
+    info = resolve_symbol('INE002A01018')
+    assert info.symbol == 'RELIANCE.NS'
+    assert info.isin == 'INE002A01018'
+    
+    assert resolve_symbol('us0378331005').symbol == 'AAPL'
+
+
+def test_bse_listing_keeps_isin_and_scrip_code():
+    info = resolve_symbol('RELIANCE.BO')
+    assert info.isin == 'INE002A01018'
+    assert resolve_symbol('BOM:500325') is info
+
+
+def test_every_seeded_row_has_an_isin():
+    infos = set(symbols._load_symbol_master().values())
+    assert infos and all(info.isin for info in infos)
+
+
+def test_unknown_symbols_do_not_grow_the_alias_index():
+    aliases = symbols._get_aliases()
+    size = len(aliases)
+    for i in range(100):
+        assert resolve_symbol(f"unknown{i}.bo").symbol == f"UNKNOWN{i}.BO"
+    assert len(aliases) == size
+    
+    # Repeated lookups are served from the bounded cache
+    assert resolve_symbol('unknown0.BO') is resolve_symbol('UNKNOWN0.BO')
+    assert symbols._infer_symbol.cache_info().maxsize == symbols.INFERRED_SYMBOL_CACHE_SIZE
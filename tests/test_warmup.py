@@ -0,0 +1,62 @@
+import pandas as pd
+import pytest
+from utils import price_store
+from utils import stock_data
+from utils import warmup
+from utils.analysis import ANALYSIS_INDICATORS, CONFIRMATION_TIMEFRAMES, TIMEFRAME_INDICATORS
+from utils.cache import CACHE_TTLS, data_cache, indicator_cache
+
+
+def _history(bars):
+    dates = pd.bdate_range(end='2026-10-16', periods=bars)
+    close = [100.0 + i % 7 for i in range(bars)]
+    return pd.DataFrame({
+        'Open': close, 'High': close, 'Low': close, 'Close': close,
+        'Volume': [1000] * bars,
+        'Dividends': [0.0] * bars,
+        'Stock Splits': [0.0] * bars,
+    }, index=dates)
+
+
+@pytest.fixture
+def warm_environment(tmp_path, monkeypatch):
+    monkeypatch.setattr(price_store, 'PRICE_STORE_DIR', str(tmp_path))
+    monkeypatch.setattr(
+        stock_data.yf, 'download',
+        lambda tickers, **kwargs: pd.concat({ticker: _history(300) for ticker in tickers}, axis=1),
+    )
+    
+    async def no_fundamentals(symbols):
+        return 0
+    
+    monkeypatch.setattr(warmup, '_warm_fundamentals', no_fundamentals)
+    data_cache.clear()
+    indicator_cache.clear()
+    yield
+    data_cache.clear()
+    indicator_cache.clear()
+
+
+def test_warmed_prices_are_still_cached_at_the_open():
+    now = pd.Timestamp('2026-10-19 08:00', tz=warmup.WARMUP_TIMEZONE)  # a Monday
+    run_at = warmup.next_warmup_time(now)
+    market_open = pd.Timestamp('2026-10-19 09:15', tz=warmup.WARMUP_TIMEZONE)
+    
+    assert run_at < market_open
+    assert run_at + pd.Timedelta(seconds=CACHE_TTLS['prices']) > market_open
+
+
+def test_analysis_reads_warmed_indicators(warm_environment):
+    report = warmup.warm_caches(['AAPL'])
+    assert report['indicators'] == 1
+    
+    # The same lookups perform_complete_analysis makes are all cache hits
+    misses = indicator_cache.stats()['misses']
+    df = stock_data.get_stock_data('AAPL')
+    stock_data.calculate_technical_indicators(df, ANALYSIS_INDICATORS)
+    for timeframe in CONFIRMATION_TIMEFRAMES:
+        stock_data.calculate_timeframe_indicators(df, timeframe, TIMEFRAME_INDICATORS)
+    
+    stats = indicator_cache.stats()
+    assert stats['misses'] == misses
+    assert stats['hits'] == 1 + len(CONFIRMATION_TIMEFRAMES)
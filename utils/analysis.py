@@ -1,6 +1,43 @@
 import pandas as pd
 import numpy as np
-from utils.stock_data import get_stock_data, calculate_technical_indicators, get_fundamental_data, get_industry_averages
+from utils.stock_data import get_stock_data, calculate_technical_indicators, calculate_timeframe_indicators, get_fundamental_data, get_industry_averages
+from utils.signals import find_crossovers, find_divergences
+
+# Indicator columns read by analyze_technical_indicators (also covers the price
+# chart on the stock analysis page)
+ANALYSIS_INDICATORS = [
+    'sma_20', 'sma_50', 'sma_200',
+    'macd', 'macd_signal', 'macd_hist',
+    'rsi',
+    'adx', 'pdi', 'ndi',
+    'bollinger_high', 'bollinger_low', 'bollinger_mid',
+    'obv', 'mfi',
+    'daily_return', 'volatility_30d',
+]
+
+# Higher timeframes, resampled from the daily bars, that confirm the daily trend
+CONFIRMATION_TIMEFRAMES = ['weekly', 'monthly']
+
+# Indicator columns read from the weekly and monthly bars (MACD resolves to the
+# EMAs it is built from)
+TIMEFRAME_INDICATORS = ['macd', 'macd_signal']
+
+# Bars of history analyze_technical_indicators needs (the 200-day SMA)
+MIN_ANALYSIS_BARS = 200
+
+# Weights of the component signals in the technical score
+TECH_SCORE_WEIGHTS = {
+    'trend': 0.3,
+    'macd': 0.2,
+    'rsi': 0.15,
+    'bollinger': 0.1,
+    'volume': 0.1,
+    'mfi': 0.15,
+}
+
+# Most recent bars scanned for golden/death crosses and for MACD crossovers
+SMA_CROSS_LOOKBACK = 20
+MACD_CROSS_LOOKBACK = 5
 
 def analyze_technical_indicators(stock_data):
     """
@@ -13,7 +50,7 @@ def analyze_technical_indicators(stock_data):
         dict: Analysis results for technical indicators
     """
     # Check if we have enough data
-    if stock_data is None or len(stock_data) < 200:
+    if stock_data is None or len(stock_data) < MIN_ANALYSIS_BARS:
         return {
             'status': 'error',
             'message': 'Insufficient data for technical analysis'
@@ -29,17 +66,9 @@ def analyze_technical_indicators(stock_data):
     sma_200 = latest['sma_200']
     
     # Check for golden cross / death cross (SMA 50 crossing SMA 200)
-    golden_cross = False
-    death_cross = False
-    for i in range(-20, -1):
-        if i+1 >= len(stock_data) or i >= len(stock_data):
-            continue
-        if stock_data.iloc[i]['sma_50'] < stock_data.iloc[i]['sma_200'] and \
-           stock_data.iloc[i+1]['sma_50'] > stock_data.iloc[i+1]['sma_200']:
-            golden_cross = True
-        if stock_data.iloc[i]['sma_50'] > stock_data.iloc[i]['sma_200'] and \
-           stock_data.iloc[i+1]['sma_50'] < stock_data.iloc[i+1]['sma_200']:
-            death_cross = True
+    sma_crossovers = find_crossovers(stock_data, 'sma_50', 'sma_200', SMA_CROSS_LOOKBACK)
+    golden_cross = any(cross['direction'] == 'Bullish' for cross in sma_crossovers)
+    death_cross = any(cross['direction'] == 'Bearish' for cross in sma_crossovers)
     
     # Trend determination
     trend = 'Sideways'
@@ -81,17 +110,9 @@ def analyze_technical_indicators(stock_data):
     elif macd < 0:
         macd_signal_strength = -1  # Weakly bearish
     
-    # MACD crossover in last 5 days
-    macd_crossover = None
-    for i in range(-5, 0):
-        if i+1 >= len(stock_data) or i >= len(stock_data):
-            continue
-        if stock_data.iloc[i]['macd'] < stock_data.iloc[i]['macd_signal'] and \
-           stock_data.iloc[i+1]['macd'] > stock_data.iloc[i+1]['macd_signal']:
-            macd_crossover = 'Bullish'
-        if stock_data.iloc[i]['macd'] > stock_data.iloc[i]['macd_signal'] and \
-           stock_data.iloc[i+1]['macd'] < stock_data.iloc[i+1]['macd_signal']:
-            macd_crossover = 'Bearish'
+    # MACD crossover in last 5 days (the most recent one wins)
+    macd_crossovers = find_crossovers(stock_data, 'macd', 'macd_signal', MACD_CROSS_LOOKBACK)
+    macd_crossover = macd_crossovers[-1]['direction'] if macd_crossovers else None
     
     # RSI analysis
     rsi = latest['rsi']
@@ -112,43 +133,9 @@ def analyze_technical_indicators(stock_data):
         rsi_signal = 'Approaching Oversold'
         rsi_signal_strength = 0.5
     
-    # RSI divergence check (simplified)
-    rsi_divergence = None
-    # Check last 20 days for divergence
-    price_highs = []
-    rsi_highs = []
-    price_lows = []
-    rsi_lows = []
-    
-    for i in range(-20, 0):
-        if i >= len(stock_data) or i+1 >= len(stock_data) or i-1 < 0 or i-1 >= len(stock_data):
-            continue
-        # Check for price highs
-        if stock_data.iloc[i]['close'] > stock_data.iloc[i-1]['close'] and \
-           stock_data.iloc[i]['close'] > stock_data.iloc[i+1]['close']:
-            price_highs.append((i, stock_data.iloc[i]['close']))
-        # Check for RSI highs
-        if stock_data.iloc[i]['rsi'] > stock_data.iloc[i-1]['rsi'] and \
-           stock_data.iloc[i]['rsi'] > stock_data.iloc[i+1]['rsi']:
-            rsi_highs.append((i, stock_data.iloc[i]['rsi']))
-        # Check for price lows
-        if stock_data.iloc[i]['close'] < stock_data.iloc[i-1]['close'] and \
-           stock_data.iloc[i]['close'] < stock_data.iloc[i+1]['close']:
-            price_lows.append((i, stock_data.iloc[i]['close']))
-        # Check for RSI lows
-        if stock_data.iloc[i]['rsi'] < stock_data.iloc[i-1]['rsi'] and \
-           stock_data.iloc[i]['rsi'] < stock_data.iloc[i+1]['rsi']:
-            rsi_lows.append((i, stock_data.iloc[i]['rsi']))
-    
-    # Check for bullish divergence (price making lower lows, RSI making higher lows)
-    if len(price_lows) >= 2 and len(rsi_lows) >= 2:
-        if price_lows[-1][1] < price_lows[-2][1] and rsi_lows[-1][1] > rsi_lows[-2][1]:
-            rsi_divergence = 'Bullish'
-    
-    # Check for bearish divergence (price making higher highs, RSI making lower highs)
-    if len(price_highs) >= 2 and len(rsi_highs) >= 2:
-        if price_highs[-1][1] > price_highs[-2][1] and rsi_highs[-1][1] < rsi_highs[-2][1]:
-            rsi_divergence = 'Bearish'
+    # Divergences between price swings and RSI, MACD, OBV and MFI
+    divergences = find_divergences(stock_data)
+    rsi_divergence = divergences.get('rsi')
     
     # Bollinger Bands analysis
     bb_high = latest['bollinger_high']
@@ -192,6 +179,29 @@ def analyze_technical_indicators(stock_data):
         else:
             adx_signal = 'Moderate Downtrend'
     
+    # Weekly and monthly trend confirmation, from bars resampled out of the same
+    # daily data (no extra download)
+    timeframe_trends = {
+        timeframe: analyze_timeframe_trend(
+            calculate_timeframe_indicators(stock_data, timeframe, TIMEFRAME_INDICATORS)
+        )
+        for timeframe in CONFIRMATION_TIMEFRAMES
+    }
+    
+    trend_direction = int(np.sign(trend_strength))
+    higher_directions = [
+        result['direction'] for result in timeframe_trends.values()
+        if result['trend'] != 'Insufficient data'
+    ]
+    if trend_direction == 0 or not higher_directions:
+        trend_confirmation = 'Unconfirmed'
+    elif all(direction == trend_direction for direction in higher_directions):
+        trend_confirmation = 'Confirmed'
+    elif any(direction == -trend_direction for direction in higher_directions):
+        trend_confirmation = 'Contradicted'
+    else:
+        trend_confirmation = 'Partial'
+    
     # Calculate volatility
     volatility = latest.get('volatility_30d', stock_data['daily_return'].std())
     volatility_signal = 'Average'
@@ -243,22 +253,22 @@ def analyze_technical_indicators(stock_data):
     tech_score = 0
     
     # Trend component (weight: 30%)
-    tech_score += trend_strength * 0.3
+    tech_score += trend_strength * TECH_SCORE_WEIGHTS['trend']
     
     # MACD component (weight: 20%)
-    tech_score += macd_signal_strength * 0.2
+    tech_score += macd_signal_strength * TECH_SCORE_WEIGHTS['macd']
     
     # RSI component (weight: 15%)
-    tech_score += rsi_signal_strength * 0.15
+    tech_score += rsi_signal_strength * TECH_SCORE_WEIGHTS['rsi']
     
     # Bollinger Bands component (weight: 10%)
-    tech_score += bb_signal_strength * 0.1
+    tech_score += bb_signal_strength * TECH_SCORE_WEIGHTS['bollinger']
     
     # Volume component (weight: 10%)
-    tech_score += volume_signal_strength * 0.1
+    tech_score += volume_signal_strength * TECH_SCORE_WEIGHTS['volume']
     
     # MFI component (weight: 15%)
-    tech_score += mfi_signal_strength * 0.15
+    tech_score += mfi_signal_strength * TECH_SCORE_WEIGHTS['mfi']
     
     # Scale the score to range from -10 to 10
     tech_score = round(tech_score * 10, 1)
@@ -283,19 +293,25 @@ def analyze_technical_indicators(stock_data):
         'sma_200': sma_200,
         'golden_cross': golden_cross,
         'death_cross': death_cross,
+        'sma_crossovers': sma_crossovers,
         'macd': macd,
         'macd_signal': macd_signal,
         'macd_hist': macd_hist,
         'macd_crossover': macd_crossover,
+        'macd_crossovers': macd_crossovers,
         'rsi': rsi,
         'rsi_signal': rsi_signal,
         'rsi_divergence': rsi_divergence,
+        'divergences': divergences,
         'bollinger_high': bb_high,
         'bollinger_low': bb_low,
         'bollinger_mid': bb_mid,
         'bollinger_signal': bb_signal,
         'adx': adx,
         'adx_signal': adx_signal,
+        'weekly_trend': timeframe_trends['weekly']['trend'],
+        'monthly_trend': timeframe_trends['monthly']['trend'],
+        'trend_confirmation': trend_confirmation,
         'volatility': volatility,
         'volatility_signal': volatility_signal,
         'volume_signal': volume_signal,
@@ -307,6 +323,155 @@ def analyze_technical_indicators(stock_data):
     }
 
 
+def analyze_timeframe_trend(bars):
+    """
+    Determines the trend on weekly or monthly bars from the close, the 12- and
+    26-period EMAs and MACD. Indicators without enough bars yet are left out.
+    
+    Args:
+        bars (pandas.DataFrame): Resampled bars with 'ema_12', 'ema_26', 'macd' and
+            'macd_signal' columns (see calculate_timeframe_indicators)
+    
+    Returns:
+        dict: 'trend' ('Uptrend', 'Downtrend', 'Mixed' or 'Insufficient data') and
+              'direction' (1, -1 or 0)
+    """
+    if bars is None or bars.empty or 'ema_12' not in bars.columns or pd.isna(bars['ema_12'].iloc[-1]):
+        return {'trend': 'Insufficient data', 'direction': 0}
+    
+    latest = bars.iloc[-1]
+    
+    # Each available indicator votes up or down
+    votes = [np.sign(latest['close'] - latest['ema_12'])]
+    if not pd.isna(latest['ema_26']):
+        votes.append(np.sign(latest['ema_12'] - latest['ema_26']))
+    if not pd.isna(latest['macd_signal']):
+        votes.append(np.sign(latest['macd'] - latest['macd_signal']))
+    
+    if all(vote > 0 for vote in votes):
+        return {'trend': 'Uptrend', 'direction': 1}
+    if all(vote < 0 for vote in votes):
+        return {'trend': 'Downtrend', 'direction': -1}
+    return {'trend': 'Mixed', 'direction': 0}
+
+
+def technical_score_series(stock_data):
+    """
+    Computes the component signals, tech_score and overall_technical of
+    analyze_technical_indicators for every bar at once, as if the frame ended on
+    that bar. The last row matches analyze_technical_indicators exactly.
+    
+    Args:
+        stock_data (pandas.DataFrame): DataFrame with stock data and indicators
+    
+    Returns:
+        pandas.DataFrame: One row per bar (same index as stock_data) with the
+                          signal labels, their strengths, 'tech_score' and
+                          'overall_technical'; both are missing (NaN) on bars with
+                          fewer than MIN_ANALYSIS_BARS bars of history
+    """
+    def column(name, default=np.nan):
+        if name not in stock_data.columns:
+            return np.full(len(stock_data), default)
+        return stock_data[name].to_numpy(dtype=np.float64)
+    
+    price = column('close')
+    sma_20 = column('sma_20')
+    sma_50 = column('sma_50')
+    sma_200 = column('sma_200')
+    
+    # Trend: the same ordered rules as the scalar function, one np.select per signal
+    trend_conditions = [
+        (price > sma_20) & (sma_20 > sma_50) & (sma_50 > sma_200),
+        (price > sma_50) & (sma_50 > sma_200),
+        (price < sma_20) & (sma_20 < sma_50) & (sma_50 < sma_200),
+        (price < sma_50) & (sma_50 < sma_200),
+    ]
+    trend = np.select(trend_conditions, ['Strong Uptrend', 'Uptrend', 'Strong Downtrend', 'Downtrend'], 'Consolidating')
+    trend_strength = np.select(trend_conditions, [2, 1, -2, -1], 0)
+    
+    # MACD
+    macd = column('macd')
+    macd_signal = column('macd_signal')
+    macd_signal_strength = np.select(
+        [(macd > 0) & (macd > macd_signal), macd > 0, (macd < 0) & (macd < macd_signal), macd < 0],
+        [2, 1, -2, -1],
+        0,
+    )
+    
+    # RSI
+    rsi = column('rsi')
+    rsi_conditions = [rsi > 70, rsi > 65, rsi < 30, rsi < 35]
+    rsi_signal = np.select(rsi_conditions, ['Overbought', 'Approaching Overbought', 'Oversold', 'Approaching Oversold'], 'Neutral')
+    rsi_signal_strength = np.select(rsi_conditions, [-1, -0.5, 1, 0.5], 0)
+    
+    # Bollinger Bands
+    bb_high = column('bollinger_high')
+    bb_low = column('bollinger_low')
+    bb_conditions = [price > bb_high * 0.98, price > bb_high, price < bb_low * 1.02, price < bb_low]
+    bb_signal = np.select(bb_conditions, ['Upper Band Test', 'Overbought (BB)', 'Lower Band Test', 'Oversold (BB)'], 'Neutral')
+    bb_signal_strength = np.select(bb_conditions, [-0.5, -1, 0.5, 1], 0)
+    
+    # Volume: average of the last 5 bars against the last 20 (fewer at the start).
+    # Integer volumes are summed exactly, so the means equal the scalar function's.
+    volume = stock_data['volume'].to_numpy()
+    totals = np.concatenate([[0], np.cumsum(volume)])
+    rows = np.arange(1, len(volume) + 1)
+    recent_volume_avg = (totals[rows] - totals[np.maximum(rows - 5, 0)]) / np.minimum(rows, 5)
+    longer_volume_avg = (totals[rows] - totals[np.maximum(rows - 20, 0)]) / np.minimum(rows, 20)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        volume_ratio = np.where(longer_volume_avg > 0, recent_volume_avg / longer_volume_avg, 1)
+    volume_conditions = [volume_ratio > 1.5, volume_ratio < 0.7]
+    volume_signal = np.select(volume_conditions, ['Increasing', 'Decreasing'], 'Average')
+    volume_signal_strength = np.select(volume_conditions, [0.5, -0.5], 0)
+    
+    # Money Flow Index (neutral if not available)
+    mfi = column('mfi', 50)
+    mfi_conditions = [mfi > 80, mfi < 20]
+    mfi_signal = np.select(mfi_conditions, ['Overbought (MFI)', 'Oversold (MFI)'], 'Neutral')
+    mfi_signal_strength = np.select(mfi_conditions, [-1, 1], 0)
+    
+    # Weighted sum in the scalar function's order, so the floating-point result is identical
+    tech_score = trend_strength * TECH_SCORE_WEIGHTS['trend']
+    tech_score = tech_score + macd_signal_strength * TECH_SCORE_WEIGHTS['macd']
+    tech_score = tech_score + rsi_signal_strength * TECH_SCORE_WEIGHTS['rsi']
+    tech_score = tech_score + bb_signal_strength * TECH_SCORE_WEIGHTS['bollinger']
+    tech_score = tech_score + volume_signal_strength * TECH_SCORE_WEIGHTS['volume']
+    tech_score = tech_score + mfi_signal_strength * TECH_SCORE_WEIGHTS['mfi']
+    
+    # Scores take few distinct values; rounding them with Python's round keeps its
+    # correctly rounded results (np.round can differ by 0.1 on near-ties)
+    distinct, inverse = np.unique(tech_score * 10, return_inverse=True)
+    tech_score = np.array([round(score, 1) for score in distinct.tolist()])[inverse]
+    
+    overall_technical = np.select(
+        [tech_score >= 7, tech_score >= 3, tech_score >= -3, tech_score >= -7],
+        ['Strong Buy', 'Buy', 'Neutral', 'Sell'],
+        'Strong Sell',
+    ).astype(object)
+    
+    # Bars the scalar function would reject for insufficient data
+    insufficient = rows < MIN_ANALYSIS_BARS
+    tech_score[insufficient] = np.nan
+    overall_technical[insufficient] = None
+    
+    return pd.DataFrame({
+        'trend': trend,
+        'trend_strength': trend_strength,
+        'macd_signal_strength': macd_signal_strength,
+        'rsi_signal': rsi_signal,
+        'rsi_signal_strength': rsi_signal_strength,
+        'bollinger_signal': bb_signal,
+        'bollinger_signal_strength': bb_signal_strength,
+        'volume_signal': volume_signal,
+        'volume_signal_strength': volume_signal_strength,
+        'mfi_signal': mfi_signal,
+        'mfi_signal_strength': mfi_signal_strength,
+        'tech_score': tech_score,
+        'overall_technical': overall_technical,
+    }, index=stock_data.index)
+
+
 def analyze_fundamental_data(fundamental_data):
     """
     Analyzes fundamental data for a stock.
@@ -749,18 +914,21 @@ def analyze_behavioral_sentiment(ticker):
         }
     }
 
-def perform_complete_analysis(ticker):
+def perform_complete_analysis(ticker, stock_data=None):
     """
     Performs a complete analysis of a stock including technical, fundamental, and behavioral.
     
     Args:
         ticker (str): Stock ticker symbol
+        stock_data (pandas.DataFrame, optional): Pre-fetched price data, e.g. from
+            get_stock_data_batch. Fetched with get_stock_data if not given.
     
     Returns:
         dict: Complete analysis results
     """
     # Get stock data
-    stock_data = get_stock_data(ticker)
+    if stock_data is None:
+        stock_data = get_stock_data(ticker)
     if stock_data is None:
         return {
             'ticker': ticker,
@@ -768,8 +936,8 @@ def perform_complete_analysis(ticker):
             'status': 'error'
         }
     
-    # Calculate technical indicators
-    stock_data_with_indicators = calculate_technical_indicators(stock_data)
+    # Calculate the technical indicators the analysis and charts read
+    stock_data_with_indicators = calculate_technical_indicators(stock_data, ANALYSIS_INDICATORS)
     
     # Get fundamental data
     fundamental_data = get_fundamental_data(ticker)
@@ -0,0 +1,163 @@
+import asyncio
+import threading
+import time
+import urllib.request
+import weakref
+
+
+# Maximum number of upstream requests in flight at once
+MAX_CONCURRENT_FETCHES = 8
+
+# Token-bucket settings per provider: sustained requests per second and burst size
+PROVIDER_RATE_LIMITS = {
+    'yahoo': {'rate': 2.0, 'burst': 5},
+}
+DEFAULT_RATE_LIMIT = {'rate': 1.0, 'burst': 1}
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter.
+    
+    Tokens refill continuously at `rate` per second up to `capacity`. Each request
+    takes one token and waits when none are left. State is guarded by a thread
+    lock, so one bucket can be shared by several event loops and threads.
+    """
+
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens):
+        """
+        Takes tokens if available.
+        
+        Args:
+            tokens (float): Number of tokens needed
+        
+        Returns:
+            float: 0 if the tokens were taken, otherwise seconds to wait before retrying
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    async def acquire(self, tokens=1):
+        """
+        Waits until tokens are available and takes them.
+        
+        Args:
+            tokens (float): Number of tokens to take (default: 1)
+        """
+        while True:
+            wait = self._reserve(tokens)
+            if wait == 0:
+                return
+            await asyncio.sleep(wait)
+
+    def acquire_blocking(self, tokens=1):
+        """
+        Blocking variant of acquire for synchronous callers.
+        
+        Args:
+            tokens (float): Number of tokens to take (default: 1)
+        """
+        while True:
+            wait = self._reserve(tokens)
+            if wait == 0:
+                return
+            time.sleep(wait)
+
+
+class AsyncFetchEngine:
+    """
+    Runs upstream fetches on asyncio with a concurrency cap and per-provider
+    token-bucket rate limits.
+    
+    Blocking functions (such as the yfinance-based fetchers) run in worker threads
+    via asyncio.to_thread, so network waits for different symbols overlap.
+    """
+
+    def __init__(self, max_concurrency=MAX_CONCURRENT_FETCHES, rate_limits=None):
+        self.max_concurrency = max_concurrency
+        self.rate_limits = dict(PROVIDER_RATE_LIMITS if rate_limits is None else rate_limits)
+        self._buckets = {}
+        self._buckets_lock = threading.Lock()
+        # asyncio primitives belong to one event loop, so keep a semaphore per loop
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    def limiter(self, provider):
+        """
+        Returns the token bucket for a provider, creating it on first use.
+        
+        Args:
+            provider (str): Provider name, e.g. 'yahoo'
+        
+        Returns:
+            TokenBucket: The provider's rate limiter
+        """
+        with self._buckets_lock:
+            bucket = self._buckets.get(provider)
+            if bucket is None:
+                limits = self.rate_limits.get(provider, DEFAULT_RATE_LIMIT)
+                bucket = TokenBucket(limits['rate'], limits['burst'])
+                self._buckets[provider] = bucket
+            return bucket
+
+    def _semaphore(self):
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def run(self, provider, fn, *args, **kwargs):
+        """
+        Runs a fetch under the concurrency cap and the provider's rate limit.
+        
+        Args:
+            provider (str): Provider whose rate limit applies, or None for fetches
+                that rate-limit their own requests (e.g. through http_session)
+            fn (callable): Blocking function or coroutine function doing the fetch
+        
+        Returns:
+            The fetch result
+        """
+        async with self._semaphore():
+            if provider is not None:
+                await self.limiter(provider).acquire()
+            if asyncio.iscoroutinefunction(fn):
+                return await fn(*args, **kwargs)
+            return await asyncio.to_thread(fn, *args, **kwargs)
+
+    async def fetch_url(self, url, provider='yahoo', timeout=30):
+        """
+        Downloads a URL under the engine's limits.
+        
+        Args:
+            url (str): URL to fetch
+            provider (str): Provider whose rate limit applies (default: 'yahoo')
+            timeout (float): Socket timeout in seconds (default: 30)
+        
+        Returns:
+            bytes: Response body
+        """
+        def _get():
+            with urllib.request.urlopen(url, timeout=timeout) as response:
+                return response.read()
+
+        return await self.run(provider, _get)
+
+
+# Shared engine used by the async data fetchers
+fetch_engine = AsyncFetchEngine()
@@ -0,0 +1,343 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+
+# Upper bound on the memory held by the in-process data cache
+CACHE_MAX_BYTES = 256 * 1024 * 1024  # 256 MB
+
+# Time-to-live per data type, in seconds
+CACHE_TTLS = {
+    'prices': 5 * 60,              # Daily bars; the last bar moves during market hours
+    'fundamentals': 6 * 60 * 60,   # Company info and financial statements
+}
+DEFAULT_TTL = 5 * 60
+
+# Separate budget for computed indicator frames. They are keyed by a hash of
+# their input, so an entry can never go stale and only byte pressure evicts it.
+INDICATOR_CACHE_MAX_BYTES = 128 * 1024 * 1024  # 128 MB
+
+# Backoff for symbols whose lookups fail: the delay doubles with each failure
+NEGATIVE_CACHE_BASE_DELAY = 60               # 1 minute
+NEGATIVE_CACHE_MAX_DELAY = 6 * 60 * 60       # 6 hours
+# Consecutive empty responses after which a symbol is treated as unavailable
+NEGATIVE_CACHE_MAX_EMPTY = 5
+# Time after which an unavailable symbol is tried again (e.g. a relisting, or
+# empty answers that were really an upstream outage)
+UNAVAILABLE_RECHECK_AFTER = 7 * 24 * 60 * 60  # 7 days
+UNAVAILABLE_SYMBOLS_FILE = os.path.join('cache', 'unavailable_symbols.json')
+
+
+def estimate_size(value):
+    """
+    Estimates the memory held by a cached value.
+    DataFrames and Series are measured with memory_usage(deep=True); frames with
+    only fixed-width columns are sized from their dtypes, which is much cheaper.
+    
+    Args:
+        value: Cached object
+    
+    Returns:
+        int: Approximate size in bytes
+    """
+    if isinstance(value, pd.DataFrame):
+        dtypes = value.dtypes
+        if all(dtype.kind in 'biufcmM' for dtype in dtypes):
+            row_bytes = sum(dtype.itemsize for dtype in dtypes)
+            return int(value.index.memory_usage(deep=True)) + len(value) * row_bytes
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            sys.getsizeof(k) + estimate_size(v) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+def content_hash(df):
+    """
+    Hashes the contents of a DataFrame: index, column names, dtypes and values.
+    Fixed-width columns are hashed from their raw bytes, which is several times
+    faster than pandas.util.hash_pandas_object.
+    
+    Args:
+        df (pandas.DataFrame): Frame to hash
+    
+    Returns:
+        str: Hex digest; equal frames give equal digests
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((df.shape, list(df.columns), [str(dtype) for dtype in df.dtypes])).encode('utf-8'))
+    for values in [df.index] + [df[column] for column in df.columns]:
+        array = values.to_numpy()
+        if array.dtype.hasobject:
+            array = pd.util.hash_array(array)
+        digest.update(np.ascontiguousarray(array).view(np.uint8))
+    return digest.hexdigest()
+
+
+class MemoryCache:
+    """
+    Thread-safe LRU cache bounded by total bytes, with a TTL per data type.
+    
+    Entries are keyed by (data_type, key). When adding an entry would exceed
+    max_bytes, the least recently used entries are evicted first. Data types
+    whose TTL is None never expire.
+    """
+
+    def __init__(self, max_bytes=CACHE_MAX_BYTES, ttls=None):
+        self.max_bytes = max_bytes
+        self.ttls = dict(CACHE_TTLS if ttls is None else ttls)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = {}
+        self._misses = {}
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, data_type, key):
+        """
+        Looks up a cached value.
+        
+        Args:
+            data_type (str): Kind of data, e.g. 'prices' or 'fundamentals'
+            key (hashable): Identifies the value within its data type
+        
+        Returns:
+            The cached value, or None on a miss
+        """
+        entry_key = (data_type, key)
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry is not None and entry[2] < time.monotonic():
+                self._remove(entry_key)
+                self._expirations += 1
+                entry = None
+
+            if entry is None:
+                self._misses[data_type] = self._misses.get(data_type, 0) + 1
+                return None
+
+            self._entries.move_to_end(entry_key)
+            self._hits[data_type] = self._hits.get(data_type, 0) + 1
+            return entry[0]
+
+    def set(self, data_type, key, value):
+        """
+        Stores a value, evicting least recently used entries if needed.
+        Values larger than the whole cache are not stored.
+        
+        Args:
+            data_type (str): Kind of data, used to pick the TTL
+            key (hashable): Identifies the value within its data type
+            value: Object to cache (None is never cached)
+        """
+        if value is None:
+            return
+
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+
+        ttl = self.ttls.get(data_type, DEFAULT_TTL)
+        expires_at = float('inf') if ttl is None else time.monotonic() + ttl
+        entry_key = (data_type, key)
+        with self._lock:
+            if entry_key in self._entries:
+                self._remove(entry_key)
+
+            while self._entries and self._bytes + size > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self._evictions += 1
+
+            self._entries[entry_key] = (value, size, expires_at)
+            self._bytes += size
+
+    def invalidate(self, data_type, key=None):
+        """
+        Drops one cached value, or every value of a data type if no key is given.
+        
+        Args:
+            data_type (str): Kind of data
+            key (hashable, optional): Value to drop
+        """
+        with self._lock:
+            if key is not None:
+                if (data_type, key) in self._entries:
+                    self._remove((data_type, key))
+                return
+            for entry_key in [k for k in self._entries if k[0] == data_type]:
+                self._remove(entry_key)
+
+    def clear(self):
+        """
+        Empties the cache. Counters are kept.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """
+        Returns cache counters for sizing the cache from real traffic.
+        
+        Returns:
+            dict: Hits, misses, evictions, expirations, entry count and bytes in use,
+                  with hits and misses also broken down by data type
+        """
+        with self._lock:
+            return {
+                'hits': sum(self._hits.values()),
+                'misses': sum(self._misses.values()),
+                'evictions': self._evictions,
+                'expirations': self._expirations,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits_by_type': dict(self._hits),
+                'misses_by_type': dict(self._misses),
+            }
+
+    def _remove(self, entry_key):
+        # Caller must hold self._lock
+        _, size, _ = self._entries.pop(entry_key)
+        self._bytes -= size
+
+
+class NegativeCache:
+    """
+    Remembers symbols whose lookups failed so they are not retried at full cost.
+    
+    Each failure doubles the time before the next attempt, from
+    NEGATIVE_CACHE_BASE_DELAY up to NEGATIVE_CACHE_MAX_DELAY. Symbols that are
+    reported as delisted, or that come back empty NEGATIVE_CACHE_MAX_EMPTY times
+    in a row, are marked unavailable until UNAVAILABLE_RECHECK_AFTER has passed;
+    that list is saved to disk with each symbol's re-check time so it survives
+    restarts. Failures that are not empty answers (network errors, throttling)
+    only back off.
+    """
+
+    def __init__(self, path=UNAVAILABLE_SYMBOLS_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._failures = {}  # symbol -> (failure count, empty count, retry at)
+        self._unavailable = self._load()  # symbol -> re-check time (Unix time)
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r') as f:
+                entries = json.load(f)
+        except Exception as e:
+            print(f"Error reading unavailable symbols: {e}")
+            return {}
+        # Older files hold a plain list without re-check times; those symbols
+        # are retried
+        return entries if isinstance(entries, dict) else {}
+
+    def _save(self):
+        # Caller must hold self._lock
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'w') as f:
+                json.dump(dict(sorted(self._unavailable.items())), f)
+        except Exception as e:
+            print(f"Error saving unavailable symbols: {e}")
+
+    def should_skip(self, symbol):
+        """
+        Checks whether a symbol is unavailable or still backing off.
+        
+        Args:
+            symbol (str): Canonical ticker symbol
+        
+        Returns:
+            bool: True if the symbol should not be fetched right now
+        """
+        if self.is_unavailable(symbol):
+            return True
+        failure = self._failures.get(symbol)
+        return failure is not None and failure[2] > time.monotonic()
+
+    def is_unavailable(self, symbol):
+        """
+        Checks whether a symbol is marked unavailable and not yet due for a re-check.
+        
+        Args:
+            symbol (str): Canonical ticker symbol
+        
+        Returns:
+            bool: True for delisted or persistently empty symbols
+        """
+        recheck_at = self._unavailable.get(symbol)
+        return recheck_at is not None and recheck_at > time.time()
+
+    def record_failure(self, symbol, empty=False, delisted=False):
+        """
+        Records a failed lookup and schedules the next allowed attempt.
+        
+        Args:
+            symbol (str): Canonical ticker symbol
+            empty (bool): The provider answered but returned no data (not for
+                network errors or throttling, which only back off)
+            delisted (bool): The provider reported the symbol as delisted
+        """
+        with self._lock:
+            failures, empties, _ = self._failures.get(symbol, (0, 0, 0))
+            failures += 1
+            empties = empties + 1 if empty else 0
+            delay = min(NEGATIVE_CACHE_BASE_DELAY * 2 ** (failures - 1), NEGATIVE_CACHE_MAX_DELAY)
+            self._failures[symbol] = (failures, empties, time.monotonic() + delay)
+
+            if delisted or empties >= NEGATIVE_CACHE_MAX_EMPTY:
+                self._unavailable[symbol] = time.time() + UNAVAILABLE_RECHECK_AFTER
+                self._save()
+
+    def record_success(self, symbol):
+        """
+        Clears the failure history of a symbol after a successful lookup.
+        
+        Args:
+            symbol (str): Canonical ticker symbol
+        """
+        with self._lock:
+            self._failures.pop(symbol, None)
+            if symbol in self._unavailable:
+                del self._unavailable[symbol]
+                self._save()
+
+    def stats(self):
+        """
+        Returns the number of symbols backing off and marked unavailable.
+        
+        Returns:
+            dict: Counts of backing-off and unavailable symbols
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {
+                'backing_off': sum(1 for failure in self._failures.values() if failure[2] > now),
+                'unavailable': sum(1 for recheck_at in self._unavailable.values() if recheck_at > time.time()),
+            }
+
+
+# Shared cache for price and fundamentals lookups in this process
+data_cache = MemoryCache()
+
+# Shared cache for computed indicator frames, keyed by content_hash of the input
+indicator_cache = MemoryCache(max_bytes=INDICATOR_CACHE_MAX_BYTES, ttls={'indicators': None})
+
+# Shared record of symbols whose lookups keep failing
+negative_cache = NegativeCache()
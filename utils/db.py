@@ -5,6 +5,7 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 import datetime
 from urllib.parse import quote_plus
+from utils.symbols import canonical_symbol, display_symbol
 
 # Provide a default SQLite database URL if DATABASE_URL is not set
 DATABASE_URL = os.environ.get('DATABASE_URL', 'sqlite:///default.db')
@@ -302,7 +303,7 @@ def get_portfolio_data_from_db(user_id=1, portfolio_id=1):
             
             # Create holding dict
             holding_dict = {
-                'ticker': stock.ticker.replace('.NS', ''),
+                'ticker': display_symbol(stock.ticker),
                 'name': stock.name,
                 'sector': stock.sector,
                 'quantity': holding.quantity,
@@ -367,11 +368,8 @@ def get_or_create_stock(ticker):
     db = get_db_session()
     
     try:
-        # Format ticker for database (add .NS for Indian stocks)
-        if not ticker.endswith(('.NS', '.BO')) and ticker not in ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'META']:
-            db_ticker = f"{ticker}.NS"
-        else:
-            db_ticker = ticker
+        # Store stocks under their canonical symbol (e.g. 'RELIANCE.NS')
+        db_ticker = canonical_symbol(ticker)
         
         # Check if stock exists
         stock = db.query(Stock).filter_by(ticker=db_ticker).first()
@@ -0,0 +1,206 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from urllib.parse import urlencode
+from curl_cffi import requests as curl_requests
+from utils.async_fetch import fetch_engine
+
+
+# Directory for cached upstream responses (one gzip file per request)
+HTTP_CACHE_DIR = os.path.join('cache', 'http')
+
+# Expiry per endpoint, in seconds. Matched against the request URL in order;
+# URLs that match no entry are never cached (e.g. cookie and crumb requests).
+HTTP_CACHE_EXPIRY = [
+    ('/v10/finance/quoteSummary/', 6 * 60 * 60),       # info, recommendations
+    ('/ws/fundamentals-timeseries/', 24 * 60 * 60),    # financials, balance sheet, cash flow
+    ('/v7/finance/quote', 15 * 60),                    # quote fields merged into info
+]
+
+# 'normal' serves fresh entries and fetches the rest, 'replay' serves only from
+# the cache whatever the age (for offline benchmarking), 'off' disables caching
+HTTP_CACHE_MODE = os.environ.get('HTTP_CACHE_MODE', 'normal')
+
+# Query parameters that change per session and must not affect the cache key
+VOLATILE_PARAMS = {'crumb'}
+
+
+def endpoint_expiry(url):
+    """
+    Looks up the cache expiry for a URL.
+    
+    Args:
+        url (str): Request URL
+    
+    Returns:
+        int: Expiry in seconds, or None if the endpoint is not cached
+    """
+    for pattern, expiry in HTTP_CACHE_EXPIRY:
+        if pattern in url:
+            return expiry
+    return None
+
+
+def cache_key(method, url, params=None):
+    """
+    Builds the cache key of a request from its method, URL and parameters.
+    
+    Args:
+        method (str): HTTP method
+        url (str): Request URL
+        params (dict, optional): Query parameters
+    
+    Returns:
+        str: Hex digest identifying the request
+    """
+    stable_params = sorted(
+        (str(k), str(v)) for k, v in (params or {}).items() if k not in VOLATILE_PARAMS
+    )
+    raw = f"{method.upper()} {url}?{urlencode(stable_params)}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """
+    Stores raw upstream response bodies gzip-compressed on disk.
+    
+    Each entry holds a JSON metadata line (URL, status, content type, time
+    stored) followed by the body. Freshness uses the file modification time.
+    """
+
+    def __init__(self, cache_dir=HTTP_CACHE_DIR):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.gz")
+
+    def load(self, key, expiry=None):
+        """
+        Reads a cached response.
+        
+        Args:
+            key (str): Cache key from cache_key()
+            expiry (int, optional): Maximum age in seconds (None accepts any age)
+        
+        Returns:
+            tuple: (metadata dict, body bytes), or None on a miss
+        """
+        path = self._path(key)
+        try:
+            if expiry is not None and datetime.now().timestamp() - os.path.getmtime(path) >= expiry:
+                raise FileNotFoundError(path)
+            with gzip.open(path, 'rb') as f:
+                meta_line, body = f.read().split(b'\n', 1)
+            entry = (json.loads(meta_line), body)
+        except FileNotFoundError:
+            entry = None
+        except Exception as e:
+            print(f"Error reading HTTP cache entry {key}: {e}")
+            entry = None
+
+        with self._lock:
+            if entry is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return entry
+
+    def save(self, key, meta, body):
+        """
+        Writes a response to the cache, replacing any previous entry.
+        
+        Args:
+            key (str): Cache key from cache_key()
+            meta (dict): JSON-serializable response metadata
+            body (bytes): Raw response body
+        """
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with gzip.open(tmp_path, 'wb') as f:
+                f.write(json.dumps(meta).encode('utf-8') + b'\n' + body)
+            # Swap the file in atomically so readers never see a partial write
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Error saving HTTP cache entry {key}: {e}")
+
+    def stats(self):
+        """
+        Returns hit and miss counters.
+        
+        Returns:
+            dict: Hits and misses since start-up
+        """
+        with self._lock:
+            return {'hits': self._hits, 'misses': self._misses}
+
+
+class CachedSession(curl_requests.Session):
+    """
+    curl_cffi session (the transport yfinance uses) that answers GET requests to
+    known Yahoo Finance endpoints from a ResponseCache.
+    
+    Only successful responses are stored. Bodies are cached as received, below
+    any parsing, so changes to the DataFrame-building code do not invalidate them.
+    Every request that goes out to the network takes a token from the limiter;
+    cache hits do not.
+    """
+
+    def __init__(self, response_cache=None, mode=HTTP_CACHE_MODE, limiter=None, **kwargs):
+        kwargs.setdefault('impersonate', 'chrome')
+        super().__init__(**kwargs)
+        self.response_cache = response_cache or ResponseCache()
+        self.mode = mode
+        self.limiter = limiter
+
+    def request(self, method, url, params=None, **kwargs):
+        expiry = endpoint_expiry(url)
+        if self.mode == 'off' or method.upper() != 'GET' or expiry is None:
+            if self.mode == 'replay':
+                raise ConnectionError(f"HTTP cache replay: no network access for {url}")
+            return self._send(method, url, params=params, **kwargs)
+
+        key = cache_key(method, url, params)
+        entry = self.response_cache.load(key, None if self.mode == 'replay' else expiry)
+        if entry is not None:
+            return self._build_response(*entry)
+        if self.mode == 'replay':
+            raise ConnectionError(f"HTTP cache replay: no cached response for {url}")
+
+        response = self._send(method, url, params=params, **kwargs)
+        if response.status_code == 200:
+            meta = {
+                'url': url,
+                'status': response.status_code,
+                'content_type': response.headers.get('content-type'),
+                'stored_at': datetime.now().isoformat(),
+            }
+            self.response_cache.save(key, meta, response.content)
+        return response
+
+    def _send(self, method, url, **kwargs):
+        # The network branch: one rate-limit token per outgoing request
+        if self.limiter is not None:
+            self.limiter.acquire_blocking()
+        return super().request(method, url, **kwargs)
+
+    def _build_response(self, meta, body):
+        response = curl_requests.Response()
+        response.url = meta['url']
+        response.status_code = meta['status']
+        response.content = body
+        if meta.get('content_type'):
+            response.headers['content-type'] = meta['content_type']
+        return response
+
+
+# Shared session passed to yfinance by the data fetchers, under the Yahoo rate limit
+http_session = CachedSession(limiter=fetch_engine.limiter('yahoo'))
@@ -0,0 +1,1241 @@
+import os
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from utils.jit_kernels import NUMBA_AVAILABLE, jit_recurrence, jit_obv
+
+
+# Indicator parameters (same defaults as the ta library objects they replace)
+SMA_WINDOWS = (20, 50, 200)
+EMA_FAST = 12
+EMA_SLOW = 26
+MACD_SIGNAL_WINDOW = 9
+RSI_WINDOW = 14
+STOCH_WINDOW = 14
+STOCH_SMOOTH_WINDOW = 3
+ADX_WINDOW = 14
+BOLLINGER_WINDOW = 20
+BOLLINGER_DEV = 2
+MFI_WINDOW = 14
+VOLATILITY_WINDOW = 30
+DONCHIAN_WINDOW = 20
+WILLIAMS_R_WINDOW = 14
+YEAR_HIGH_LOW_WINDOW = 252  # trading days in 52 weeks
+
+# Built-in output columns, computed by default and laid out in this order in the
+# indicator array. Indicators added with register_indicator follow them.
+INDICATOR_COLUMNS = [
+    'sma_20', 'sma_50', 'sma_200',
+    'ema_12', 'ema_26',
+    'macd', 'macd_signal', 'macd_hist',
+    'rsi',
+    'stoch_k', 'stoch_d',
+    'adx', 'pdi', 'ndi',
+    'bollinger_high', 'bollinger_low', 'bollinger_mid',
+    'obv', 'mfi',
+    'daily_return', 'volatility_30d',
+    'donchian_high', 'donchian_low', 'donchian_mid',
+    'williams_r',
+    'high_52w', 'low_52w',
+]
+
+# Price fields indicator nodes can read
+PRICE_FIELDS = ('high', 'low', 'close', 'volume')
+
+# Backend for the sequential recursions (EMAs, Wilder smoothing for RSI and ADX,
+# OBV): 'numba' runs compiled row-by-row loops, 'numpy' the vectorized versions
+# below. Defaults to numba when it is installed; INDICATOR_BACKEND=numpy forces NumPy.
+INDICATOR_BACKEND = os.environ.get('INDICATOR_BACKEND', 'numba' if NUMBA_AVAILABLE else 'numpy')
+if INDICATOR_BACKEND == 'numba' and not NUMBA_AVAILABLE:
+    print("numba is not installed, using the NumPy indicator kernels")
+    INDICATOR_BACKEND = 'numpy'
+
+# Largest rescaling factor used when solving recurrences blockwise; bounds the
+# rounding error to about RECURRENCE_MAX_SCALE times machine precision
+RECURRENCE_MAX_SCALE = 1e3
+
+# Tail mode: weight an exponentially smoothed indicator may still give to the
+# bars before its warm-up window. Sets the convergence window of EMAs, RSI and ADX.
+CONVERGENCE_TOLERANCE = 1e-6
+
+# Indicators that depend on every earlier bar (OBV is cumulative) or that callers
+# read over the whole period (daily returns). Tail mode computes them over the
+# full history; both are a single pass over the bars.
+FULL_HISTORY_INDICATORS = {'obv', 'daily_return'}
+
+# All kernels below work along axis 0 (time), so they accept a single series of
+# shape (n,) or several aligned series of shape (n, k).
+
+
+def shift(x, periods=1):
+    """
+    Shifts values forward in time, filling the first rows with NaN.
+    
+    Args:
+        x (numpy.ndarray): Values along axis 0
+        periods (int): Number of rows to shift (default: 1)
+    
+    Returns:
+        numpy.ndarray: Shifted copy of x
+    """
+    out = np.empty_like(x)
+    out[:periods] = np.nan
+    out[periods:] = x[:-periods]
+    return out
+
+
+def recurrence(x, decay, gain, out):
+    """
+    Evaluates the linear recurrence y[0] = x[0], y[i] = decay * y[i-1] + gain * x[i].
+    This covers EMAs (adjust=False) and Wilder smoothing.
+    
+    Args:
+        x (numpy.ndarray): Input values along axis 0
+        decay (float or numpy.ndarray): Weight of the previous output
+        gain (float or numpy.ndarray): Weight of the current input
+        out (numpy.ndarray): Array receiving the outputs (same shape as x)
+    
+    Returns:
+        numpy.ndarray: out
+    """
+    if INDICATOR_BACKEND == 'numba':
+        return jit_recurrence(x, decay, gain, out)
+
+    n = x.shape[0]
+    if n == 0:
+        return out
+    out[0] = x[0]
+
+    # Solve the recurrence a block of rows at a time: within a block,
+    # y[s+t] = decay^(t+1) * y[s-1] + decay^t * cumsum(gain * x[s+j] / decay^j).
+    # Blocks are kept short enough that decay^-t stays below RECURRENCE_MAX_SCALE.
+    decay = np.asarray(decay, dtype=np.float64)
+    smallest_decay = decay.min()
+    if smallest_decay <= 0:
+        block = 1
+    elif smallest_decay >= 1:
+        block = n
+    else:
+        block = max(1, int(np.log(RECURRENCE_MAX_SCALE) / -np.log(smallest_decay)))
+
+    steps = np.arange(min(block, n)).reshape((-1,) + (1,) * (x.ndim - 1))
+    powers = decay ** steps
+    inverse_powers = 1.0 / powers
+    next_powers = powers * decay
+
+    for start in range(1, n, block):
+        stop = min(start + block, n)
+        length = stop - start
+        scaled = np.cumsum(gain * x[start:stop] * inverse_powers[:length], axis=0)
+        out[start:stop] = next_powers[:length] * out[start - 1] + powers[:length] * scaled
+    return out
+
+
+def _first_valid_row(x):
+    valid = ~np.isnan(x)
+    if x.ndim > 1:
+        valid = valid.all(axis=tuple(range(1, x.ndim)))
+    rows = np.flatnonzero(valid)
+    return rows[0] if len(rows) else x.shape[0]
+
+
+def rolling(x, window, reducer, out=None, **kwargs):
+    """
+    Applies a reduction over a trailing window, like pandas rolling(window) with
+    min_periods=window. Windows containing NaN produce NaN.
+    
+    Args:
+        x (numpy.ndarray): Values along axis 0
+        window (int): Window length
+        reducer (callable): NumPy reduction such as np.mean, np.sum or np.std
+        out (numpy.ndarray, optional): Array receiving the result
+        **kwargs: Extra arguments for the reducer (e.g. ddof)
+    
+    Returns:
+        numpy.ndarray: Rolling values (NaN for the first window - 1 rows)
+    """
+    if out is None:
+        out = np.empty(x.shape)
+    out[:window - 1] = np.nan
+    if x.shape[0] >= window:
+        windows = sliding_window_view(x, window, axis=0)
+        out[window - 1:] = reducer(windows, axis=-1, **kwargs)
+    return out
+
+
+def rolling_extreme(x, window, largest=True, out=None):
+    """
+    Trailing-window maximum or minimum in O(n) whatever the window length
+    (van Herk/Gil-Werman: running extremes from both ends of fixed blocks, so
+    every window is covered by one suffix and one prefix). Windows containing
+    NaN produce NaN.
+    
+    Args:
+        x (numpy.ndarray): Values along axis 0
+        window (int): Window length
+        largest (bool): Maximum if True, minimum otherwise
+        out (numpy.ndarray, optional): Array receiving the result
+    
+    Returns:
+        numpy.ndarray: Rolling extremes (NaN for the first window - 1 rows)
+    """
+    if out is None:
+        out = np.empty(x.shape)
+    n = x.shape[0]
+    out[:window - 1] = np.nan
+    if n < window:
+        return out
+    
+    ufunc = np.maximum if largest else np.minimum
+    blocks = -(-n // window)
+    padded = np.full((blocks * window,) + x.shape[1:], -np.inf if largest else np.inf)
+    padded[:n] = x
+    shaped = padded.reshape((blocks, window) + x.shape[1:])
+    prefix = ufunc.accumulate(shaped, axis=1).reshape(padded.shape)
+    suffix = ufunc.accumulate(shaped[:, ::-1], axis=1)[:, ::-1].reshape(padded.shape)
+    ufunc(suffix[:n - window + 1], prefix[window - 1:n], out=out[window - 1:])
+    return out
+
+
+def rolling_max(x, window, out=None):
+    """
+    Trailing-window maximum (pandas rolling(window).max()), see rolling_extreme.
+    
+    Args:
+        x (numpy.ndarray): Values along axis 0
+        window (int): Window length
+        out (numpy.ndarray, optional): Array receiving the result
+    
+    Returns:
+        numpy.ndarray: Rolling maximums
+    """
+    return rolling_extreme(x, window, True, out)
+
+
+def rolling_min(x, window, out=None):
+    """
+    Trailing-window minimum (pandas rolling(window).min()), see rolling_extreme.
+    
+    Args:
+        x (numpy.ndarray): Values along axis 0
+        window (int): Window length
+        out (numpy.ndarray, optional): Array receiving the result
+    
+    Returns:
+        numpy.ndarray: Rolling minimums
+    """
+    return rolling_extreme(x, window, False, out)
+
+
+def rolling_sum(x, window, out=None):
+    """
+    Trailing-window sum computed from cumulative sums in O(n), whatever the
+    window length. Windows containing NaN produce NaN.
+    
+    Args:
+        x (numpy.ndarray): Values along axis 0
+        window (int): Window length
+        out (numpy.ndarray, optional): Array receiving the result
+    
+    Returns:
+        numpy.ndarray: Rolling sums (NaN for the first window - 1 rows)
+    """
+    if out is None:
+        out = np.empty(x.shape)
+    out[:window - 1] = np.nan
+    if x.shape[0] < window:
+        return out
+    
+    missing = np.isnan(x)
+    totals = np.zeros((x.shape[0] + 1,) + x.shape[1:])
+    np.cumsum(np.where(missing, 0.0, x), axis=0, out=totals[1:])
+    np.subtract(totals[window:], totals[:-window], out=out[window - 1:])
+    if missing.any():
+        counts = np.zeros(totals.shape, dtype=np.int64)
+        np.cumsum(missing, axis=0, out=counts[1:])
+        out[window - 1:][counts[window:] != counts[:-window]] = np.nan
+    return out
+
+
+def sma(x, window, out=None):
+    """
+    Simple moving average (ta SMAIndicator).
+    
+    Args:
+        x (numpy.ndarray): Values along axis 0
+        window (int): Window length
+        out (numpy.ndarray, optional): Array receiving the result
+    
+    Returns:
+        numpy.ndarray: Moving average
+    """
+    out = rolling_sum(x, window, out)
+    out /= window
+    return out
+
+
+def ewm(x, alpha, min_periods, out=None):
+    """
+    Exponentially weighted mean with adjust=False. Leading NaN rows are skipped
+    and the recursion starts at the first complete row, as in pandas.
+    
+    Args:
+        x (numpy.ndarray): Values along axis 0
+        alpha (float or numpy.ndarray): Smoothing factor
+        min_periods (int): Observations required before a value is produced
+        out (numpy.ndarray, optional): Array receiving the result
+    
+    Returns:
+        numpy.ndarray: Weighted mean
+    """
+    if out is None:
+        out = np.empty(x.shape)
+    start = _first_valid_row(x)
+    out[:start] = np.nan
+    if start < x.shape[0]:
+        recurrence(x[start:], 1 - alpha, alpha, out[start:])
+    out[start:start + min_periods - 1] = np.nan
+    return out
+
+
+def ema(x, window, out=None):
+    """
+    Exponential moving average (ta EMAIndicator).
+    
+    Args:
+        x (numpy.ndarray): Values along axis 0
+        window (int): Span of the average
+        out (numpy.ndarray, optional): Array receiving the result
+    
+    Returns:
+        numpy.ndarray: Moving average
+    """
+    return ewm(x, 2.0 / (window + 1), window, out)
+
+
+def rsi_from_averages(avg_gain, avg_loss, out=None):
+    """
+    Converts average gains and losses into RSI values.
+    
+    Args:
+        avg_gain (numpy.ndarray): Wilder average of upward moves
+        avg_loss (numpy.ndarray): Wilder average of downward moves
+        out (numpy.ndarray, optional): Array receiving the result
+    
+    Returns:
+        numpy.ndarray: RSI (100 where there were no losses)
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = np.where(avg_loss == 0, 100.0, 100.0 - 100.0 / (1.0 + avg_gain / avg_loss))
+    if out is None:
+        return result
+    out[...] = result
+    return out
+
+
+def price_moves(close):
+    """
+    Splits bar-to-bar changes into upward and downward moves, as ta's RSI does.
+    
+    Args:
+        close (numpy.ndarray): Closing prices along axis 0
+    
+    Returns:
+        tuple: (upward moves, downward moves), both non-negative and 0 on the first row
+    """
+    diff = close - shift(close)
+    with np.errstate(invalid='ignore'):
+        up = np.where(diff > 0, diff, 0.0)
+        down = np.where(diff < 0, -diff, 0.0)
+    return up, down
+
+
+def rsi(close, window=RSI_WINDOW, out=None):
+    """
+    Relative Strength Index (ta RSIIndicator).
+    
+    Args:
+        close (numpy.ndarray): Closing prices along axis 0
+        window (int): Smoothing window (default: 14)
+        out (numpy.ndarray, optional): Array receiving the result
+    
+    Returns:
+        numpy.ndarray: RSI values
+    """
+    return wilder_rsi(stacked_price_moves(close), window, out)
+
+
+def rolling_std(x, window, ddof=0, out=None):
+    """
+    Trailing-window standard deviation (pandas rolling(window).std(ddof)).
+    
+    Args:
+        x (numpy.ndarray): Values along axis 0
+        window (int): Window length
+        ddof (int): Delta degrees of freedom (default: 0, as ta's Bollinger bands)
+        out (numpy.ndarray, optional): Array receiving the result
+    
+    Returns:
+        numpy.ndarray: Rolling standard deviations
+    """
+    return rolling(x, window, np.std, out, ddof=ddof)
+
+
+def range_position(close, highest, lowest, out=None):
+    """
+    Position of the close within the high-low range, 0 to 100 (stochastic %K).
+    
+    Args:
+        close (numpy.ndarray): Closing prices along axis 0
+        highest (numpy.ndarray): Highest highs over the look-back window
+        lowest (numpy.ndarray): Lowest lows over the look-back window
+        out (numpy.ndarray, optional): Array receiving the result
+    
+    Returns:
+        numpy.ndarray: Range position
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.divide(100 * (close - lowest), highest - lowest, out=out)
+
+
+def williams_position(close, highest, lowest, out=None):
+    """
+    Distance of the close below the highest high, -100 to 0 (Williams %R).
+    
+    Args:
+        close (numpy.ndarray): Closing prices along axis 0
+        highest (numpy.ndarray): Highest highs over the look-back window
+        lowest (numpy.ndarray): Lowest lows over the look-back window
+        out (numpy.ndarray, optional): Array receiving the result
+    
+    Returns:
+        numpy.ndarray: %R values
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.divide(-100 * (highest - close), highest - lowest, out=out)
+
+
+def midpoint(upper, lower, out=None):
+    """
+    Middle of a channel, computed as ta's DonchianChannel does.
+    
+    Args:
+        upper (numpy.ndarray): Upper band
+        lower (numpy.ndarray): Lower band
+        out (numpy.ndarray, optional): Array receiving the result
+    
+    Returns:
+        numpy.ndarray: Middle band
+    """
+    return np.add((upper - lower) / 2.0, lower, out=out)
+
+
+def band(mid, deviation, multiplier, out=None):
+    """
+    Band at a multiple of a deviation around a middle line (Bollinger bands).
+    
+    Args:
+        mid (numpy.ndarray): Middle line
+        deviation (numpy.ndarray): Rolling standard deviation
+        multiplier (float): Number of deviations (negative for the lower band)
+        out (numpy.ndarray, optional): Array receiving the result
+    
+    Returns:
+        numpy.ndarray: Band values
+    """
+    return np.add(mid, multiplier * deviation, out=out)
+
+
+def stochastic(high, low, close, window=STOCH_WINDOW, smooth_window=STOCH_SMOOTH_WINDOW,
+               out_k=None, out_d=None):
+    """
+    Stochastic oscillator %K and its moving average %D (ta StochasticOscillator).
+    
+    Args:
+        high (numpy.ndarray): High prices along axis 0
+        low (numpy.ndarray): Low prices along axis 0
+        close (numpy.ndarray): Closing prices along axis 0
+        window (int): Look-back window (default: 14)
+        smooth_window (int): %D smoothing window (default: 3)
+        out_k (numpy.ndarray, optional): Array receiving %K
+        out_d (numpy.ndarray, optional): Array receiving %D
+    
+    Returns:
+        tuple: (%K, %D)
+    """
+    out_k = range_position(close, rolling_max(high, window), rolling_min(low, window), out_k)
+    return out_k, sma(out_k, smooth_window, out_d)
+
+
+def williams_r(high, low, close, window=WILLIAMS_R_WINDOW, out=None):
+    """
+    Williams %R (ta WilliamsRIndicator).
+    
+    Args:
+        high (numpy.ndarray): High prices along axis 0
+        low (numpy.ndarray): Low prices along axis 0
+        close (numpy.ndarray): Closing prices along axis 0
+        window (int): Look-back window (default: 14)
+        out (numpy.ndarray, optional): Array receiving the result
+    
+    Returns:
+        numpy.ndarray: %R between -100 and 0
+    """
+    return williams_position(close, rolling_max(high, window), rolling_min(low, window), out)
+
+
+def donchian(high, low, window=DONCHIAN_WINDOW, out_high=None, out_low=None, out_mid=None):
+    """
+    Donchian channel (ta DonchianChannel): highest high, lowest low and their midpoint.
+    
+    Args:
+        high (numpy.ndarray): High prices along axis 0
+        low (numpy.ndarray): Low prices along axis 0
+        window (int): Look-back window (default: 20)
+        out_high (numpy.ndarray, optional): Array receiving the upper band
+        out_low (numpy.ndarray, optional): Array receiving the lower band
+        out_mid (numpy.ndarray, optional): Array receiving the middle band
+    
+    Returns:
+        tuple: (upper band, lower band, middle band)
+    """
+    upper = rolling_max(high, window, out_high)
+    lower = rolling_min(low, window, out_low)
+    return upper, lower, midpoint(upper, lower, out_mid)
+
+
+def true_range(high, low, close, out=None):
+    """
+    True range: the bar's range extended to the previous close.
+    
+    Args:
+        high (numpy.ndarray): High prices along axis 0
+        low (numpy.ndarray): Low prices along axis 0
+        close (numpy.ndarray): Closing prices along axis 0
+        out (numpy.ndarray, optional): Array receiving the result
+    
+    Returns:
+        numpy.ndarray: True range (NaN on the first row)
+    """
+    prev_close = shift(close)
+    return np.subtract(np.maximum(high, prev_close), np.minimum(low, prev_close), out=out)
+
+
+def directional_movement(high, low):
+    """
+    Upward and downward directional movement (+DM, -DM) per bar.
+    
+    Args:
+        high (numpy.ndarray): High prices along axis 0
+        low (numpy.ndarray): Low prices along axis 0
+    
+    Returns:
+        numpy.ndarray: +DM and -DM stacked on a new last axis
+    """
+    up_move = high - shift(high)
+    down_move = shift(low) - low
+    with np.errstate(invalid='ignore'):
+        plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+        minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+    return np.stack([plus_dm, minus_dm], axis=-1)
+
+
+def _wilder_sums(x, window):
+    # ta seeds with the sum of the first `window` values after the leading NaN row,
+    # then adds one new value per bar and never fills the last element
+    n = x.shape[0]
+    sums = np.zeros((n - window + 1,) + x.shape[1:])
+    sums[0] = x[1:window + 1].sum(axis=0)
+    if n - window >= 2:
+        seq = np.concatenate([sums[:1], x[window + 1:]])
+        recurrence(seq, 1 - 1.0 / window, 1.0, sums[:n - window])
+    return sums
+
+
+def directional_index(true_range_values, movement, window=ADX_WINDOW):
+    """
+    Wilder-smoothed +DI, -DI and DX as ta's ADXIndicator computes them, on its
+    own row layout (one row per bar from bar window - 1 on).
+    
+    Args:
+        true_range_values (numpy.ndarray): True range along axis 0
+        movement (numpy.ndarray): +DM and -DM from directional_movement
+        window (int): Smoothing window (default: 14)
+    
+    Returns:
+        numpy.ndarray: +DI, -DI and DX stacked on a new last axis (no rows when
+                       there are fewer than window + 2 bars)
+    """
+    if true_range_values.shape[0] < window + 2:
+        return np.zeros((0,) + true_range_values.shape[1:] + (3,))
+
+    # Smooth all three series in one pass
+    sums = _wilder_sums(np.concatenate([true_range_values[..., None], movement], axis=-1), window)
+    trs, dip, din = sums[..., 0], sums[..., 1], sums[..., 2]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pos_di = np.where(trs != 0, 100 * dip / trs, 0.0)
+        neg_di = np.where(trs != 0, 100 * din / trs, 0.0)
+        di_sum = pos_di + neg_di
+        dx = np.where(di_sum != 0, 100 * np.abs((pos_di - neg_di) / di_sum), 0.0)
+    return np.stack([pos_di, neg_di, dx], axis=-1)
+
+
+def directional_indicator(close, index, component, window=ADX_WINDOW, out=None):
+    """
+    Places +DI (component 0) or -DI (component 1) on the bar rows, with ta's
+    zero-filled warm-up rows.
+    
+    Args:
+        close (numpy.ndarray): Closing prices along axis 0 (for the output shape)
+        index (numpy.ndarray): Output of directional_index
+        component (int): 0 for +DI, 1 for -DI
+        window (int): Smoothing window (default: 14)
+        out (numpy.ndarray, optional): Array receiving the result
+    
+    Returns:
+        numpy.ndarray: +DI or -DI per bar
+    """
+    out = np.zeros(close.shape) if out is None else out
+    out[...] = 0
+    if index.shape[0]:
+        out[window + 1:] = index[1:-1, ..., component]
+    return out
+
+
+def adx_from_index(close, index, window=ADX_WINDOW, out=None):
+    """
+    Smooths DX into ADX, reported from bar 2 * window - 1 (zero before, as in ta).
+    
+    Args:
+        close (numpy.ndarray): Closing prices along axis 0 (for the output shape)
+        index (numpy.ndarray): Output of directional_index
+        window (int): Smoothing window (default: 14)
+        out (numpy.ndarray, optional): Array receiving the result
+    
+    Returns:
+        numpy.ndarray: ADX per bar
+    """
+    out = np.zeros(close.shape) if out is None else out
+    out[...] = 0
+    m = index.shape[0]
+    if m > window:
+        dx = index[..., 2]
+        seq = np.concatenate([dx[:window].mean(axis=0)[None], dx[window:m - 1]])
+        recurrence(seq, (window - 1.0) / window, 1.0 / window, out[2 * window - 1:])
+    return out
+
+
+def adx(high, low, close, window=ADX_WINDOW, out_adx=None, out_pos=None, out_neg=None):
+    """
+    Average Directional Index with +DI and -DI, reproducing ta's ADXIndicator
+    (including its zero-filled warm-up rows).
+    
+    Args:
+        high (numpy.ndarray): High prices along axis 0
+        low (numpy.ndarray): Low prices along axis 0
+        close (numpy.ndarray): Closing prices along axis 0
+        window (int): Smoothing window (default: 14)
+        out_adx (numpy.ndarray, optional): Array receiving ADX
+        out_pos (numpy.ndarray, optional): Array receiving +DI
+        out_neg (numpy.ndarray, optional): Array receiving -DI
+    
+    Returns:
+        tuple: (ADX, +DI, -DI)
+    """
+    index = directional_index(true_range(high, low, close), directional_movement(high, low), window)
+    return (
+        adx_from_index(close, index, window, out_adx),
+        directional_indicator(close, index, 0, window, out_pos),
+        directional_indicator(close, index, 1, window, out_neg),
+    )
+
+
+def obv(close, volume, out=None):
+    """
+    On-balance volume (ta OnBalanceVolumeIndicator).
+    
+    Args:
+        close (numpy.ndarray): Closing prices along axis 0
+        volume (numpy.ndarray): Volumes along axis 0
+        out (numpy.ndarray, optional): Array receiving the result
+    
+    Returns:
+        numpy.ndarray: Cumulative on-balance volume
+    """
+    if INDICATOR_BACKEND == 'numba':
+        return jit_obv(close, volume, out)
+    with np.errstate(invalid='ignore'):
+        signed_volume = np.where(close < shift(close), -volume, volume)
+    return np.cumsum(signed_volume, axis=0, out=out)
+
+
+def typical_price(high, low, close, out=None):
+    """
+    Typical price (high + low + close) / 3.
+    
+    Args:
+        high (numpy.ndarray): High prices along axis 0
+        low (numpy.ndarray): Low prices along axis 0
+        close (numpy.ndarray): Closing prices along axis 0
+        out (numpy.ndarray, optional): Array receiving the result
+    
+    Returns:
+        numpy.ndarray: Typical prices
+    """
+    return np.divide(high + low + close, 3.0, out=out)
+
+
+def money_flows(price, volume):
+    """
+    Signed raw money flow per bar, as used by ta's MFIIndicator.
+    
+    Args:
+        price (numpy.ndarray): Typical prices along axis 0
+        volume (numpy.ndarray): Volumes along axis 0
+    
+    Returns:
+        numpy.ndarray: Positive flows and negative flows (as positive numbers)
+                       stacked on a new last axis
+    """
+    prev_price = shift(price)
+    with np.errstate(invalid='ignore'):
+        direction = np.where(price > prev_price, 1.0, np.where(price < prev_price, -1.0, 0.0))
+    flow = price * volume * direction
+    return np.stack([np.where(flow >= 0, flow, 0.0), np.where(flow < 0, -flow, 0.0)], axis=-1)
+
+
+def money_flow_index(flows, window=MFI_WINDOW, out=None):
+    """
+    Money Flow Index from the positive and negative flows.
+    
+    Args:
+        flows (numpy.ndarray): Output of money_flows
+        window (int): Look-back window (default: 14)
+        out (numpy.ndarray, optional): Array receiving the result
+    
+    Returns:
+        numpy.ndarray: MFI values
+    """
+    sums = rolling_sum(flows, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.subtract(100, 100 / (1 + sums[..., 0] / sums[..., 1]), out=out)
+
+
+def mfi(high, low, close, volume, window=MFI_WINDOW, out=None):
+    """
+    Money Flow Index (ta MFIIndicator).
+    
+    Args:
+        high (numpy.ndarray): High prices along axis 0
+        low (numpy.ndarray): Low prices along axis 0
+        close (numpy.ndarray): Closing prices along axis 0
+        volume (numpy.ndarray): Volumes along axis 0
+        window (int): Look-back window (default: 14)
+        out (numpy.ndarray, optional): Array receiving the result
+    
+    Returns:
+        numpy.ndarray: MFI values
+    """
+    return money_flow_index(money_flows(typical_price(high, low, close), volume), window, out)
+
+
+def stacked_price_moves(close):
+    """
+    Upward and downward moves from price_moves, stacked on a new last axis.
+    
+    Args:
+        close (numpy.ndarray): Closing prices along axis 0
+    
+    Returns:
+        numpy.ndarray: Moves, shape close.shape + (2,)
+    """
+    return np.stack(price_moves(close), axis=-1)
+
+
+def wilder_rsi(moves, window=RSI_WINDOW, out=None):
+    """
+    RSI from stacked upward and downward moves (see rsi).
+    
+    Args:
+        moves (numpy.ndarray): Output of stacked_price_moves
+        window (int): Smoothing window (default: 14)
+        out (numpy.ndarray, optional): Array receiving the result
+    
+    Returns:
+        numpy.ndarray: RSI values
+    """
+    averages = ewm(moves, 1.0 / window, window)
+    return rsi_from_averages(averages[..., 0], averages[..., 1], out)
+
+
+def percent_change(close, out=None):
+    """
+    Bar-to-bar change in percent.
+    
+    Args:
+        close (numpy.ndarray): Closing prices along axis 0
+        out (numpy.ndarray, optional): Array receiving the result
+    
+    Returns:
+        numpy.ndarray: Daily returns in percent (NaN on the first row)
+    """
+    return np.multiply(close / shift(close) - 1, 100, out=out)
+
+
+def convergence_bars(alpha, tolerance=None):
+    """
+    Number of bars after which an exponential recursion has forgotten its
+    starting value to within tolerance.
+    
+    Args:
+        alpha (float): Smoothing factor
+        tolerance (float, optional): Weight left on the start (default: CONVERGENCE_TOLERANCE)
+    
+    Returns:
+        int: Bars needed for (1 - alpha) ** bars <= tolerance
+    """
+    tolerance = CONVERGENCE_TOLERANCE if tolerance is None else tolerance
+    return int(np.ceil(np.log(tolerance) / np.log(1 - alpha)))
+
+
+class Indicator:
+    """
+    Node of the indicator graph: an array function of price fields and other
+    nodes, with fixed parameters.
+    """
+    
+    def __init__(self, name, inputs, function, params=None, column=True, warmup=0, full_history=False):
+        self.name = name
+        self.inputs = tuple(inputs)
+        self.function = function
+        self.params = dict(params or {})
+        self.column = column
+        self.warmup = warmup
+        self.full_history = full_history
+        # Nodes applying the same function with the same parameters to the same
+        # inputs are computed once per request (e.g. sma_20 and bollinger_mid)
+        self.signature = (function, tuple(sorted(self.params.items())))
+    
+    def own_warmup(self, tolerance=None):
+        """
+        Bars this node needs on top of the warm-up of its inputs.
+        
+        Args:
+            tolerance (float, optional): Convergence tolerance (default: CONVERGENCE_TOLERANCE)
+        
+        Returns:
+            int: Warm-up bars
+        """
+        return self.warmup(tolerance) if callable(self.warmup) else self.warmup
+    
+    def __repr__(self):
+        return f"Indicator({self.name!r}, inputs={self.inputs!r}, params={self.params!r})"
+
+
+# Registered indicators and intermediates by name, in registration order
+INDICATORS = {}
+
+
+def register_indicator(name, inputs, function, params=None, column=True, warmup=0, full_history=False):
+    """
+    Adds an indicator (or an intermediate series) to the indicator graph.
+    
+    The function is called as function(*input_arrays, **params), with out=<output
+    column> added for columns; inputs are arrays along axis 0 like the kernels in
+    this module. Registered columns can be requested by name everywhere
+    INDICATOR_COLUMNS can (indicator_frame, compute_tail, indicator_panel, the
+    batch functions in stock_data) but are only computed when asked for.
+    
+    Args:
+        name (str): Unique node name
+        inputs (iterable): Price fields (PRICE_FIELDS) or registered node names
+        function (callable): Array function computing the node
+        params (dict, optional): Keyword arguments for the function
+        column (bool): True for an output column, False for an intermediate
+        warmup (int or callable): Bars needed on top of the inputs' warm-up, or a
+            function of the convergence tolerance returning them
+        full_history (bool): Always computed over all bars (see FULL_HISTORY_INDICATORS)
+    
+    Returns:
+        Indicator: The registered node
+    """
+    if name in INDICATORS or name in PRICE_FIELDS:
+        raise ValueError(f"Indicator already registered: {name}")
+    for source in inputs:
+        if source not in INDICATORS and source not in PRICE_FIELDS:
+            raise ValueError(f"Unknown input for {name}: {source}")
+    
+    node = Indicator(name, inputs, function, params, column, warmup, full_history)
+    INDICATORS[name] = node
+    if full_history:
+        FULL_HISTORY_INDICATORS.add(name)
+    return node
+
+
+def _smoothing_warmup(window, alpha):
+    # Window of the seed plus the bars an exponential recursion needs to converge
+    return lambda tolerance: max(window - 1, convergence_bars(alpha, tolerance))
+
+
+def _register_builtin_indicators():
+    for window in SMA_WINDOWS:
+        register_indicator(f"sma_{window}", ['close'], sma, {'window': window}, warmup=window - 1)
+    
+    for window in (EMA_FAST, EMA_SLOW):
+        register_indicator(
+            f"ema_{window}", ['close'], ema, {'window': window},
+            warmup=_smoothing_warmup(window, 2.0 / (window + 1)),
+        )
+    register_indicator('macd', [f"ema_{EMA_FAST}", f"ema_{EMA_SLOW}"], np.subtract)
+    register_indicator(
+        'macd_signal', ['macd'], ema, {'window': MACD_SIGNAL_WINDOW},
+        warmup=_smoothing_warmup(MACD_SIGNAL_WINDOW, 2.0 / (MACD_SIGNAL_WINDOW + 1)),
+    )
+    register_indicator('macd_hist', ['macd', 'macd_signal'], np.subtract)
+    
+    register_indicator('price_moves', ['close'], stacked_price_moves, column=False, warmup=1)
+    register_indicator(
+        'rsi', ['price_moves'], wilder_rsi, {'window': RSI_WINDOW},
+        warmup=_smoothing_warmup(RSI_WINDOW, 1.0 / RSI_WINDOW),
+    )
+    
+    register_indicator('stoch_high', ['high'], rolling_max, {'window': STOCH_WINDOW}, column=False, warmup=STOCH_WINDOW - 1)
+    register_indicator('stoch_low', ['low'], rolling_min, {'window': STOCH_WINDOW}, column=False, warmup=STOCH_WINDOW - 1)
+    register_indicator('stoch_k', ['close', 'stoch_high', 'stoch_low'], range_position)
+    register_indicator('stoch_d', ['stoch_k'], sma, {'window': STOCH_SMOOTH_WINDOW}, warmup=STOCH_SMOOTH_WINDOW - 1)
+    
+    # DI sums start after one window; ADX smooths DX after a second one
+    wilder_adx = lambda tolerance: convergence_bars(1.0 / ADX_WINDOW, tolerance)
+    register_indicator('true_range', ['high', 'low', 'close'], true_range, column=False, warmup=1)
+    register_indicator('directional_movement', ['high', 'low'], directional_movement, column=False, warmup=1)
+    register_indicator(
+        'directional_index', ['true_range', 'directional_movement'], directional_index,
+        {'window': ADX_WINDOW}, column=False,
+        warmup=lambda tolerance: ADX_WINDOW + wilder_adx(tolerance),
+    )
+    register_indicator(
+        'adx', ['close', 'directional_index'], adx_from_index, {'window': ADX_WINDOW},
+        warmup=lambda tolerance: ADX_WINDOW - 1 + wilder_adx(tolerance),
+    )
+    register_indicator('pdi', ['close', 'directional_index'], directional_indicator, {'component': 0, 'window': ADX_WINDOW})
+    register_indicator('ndi', ['close', 'directional_index'], directional_indicator, {'component': 1, 'window': ADX_WINDOW})
+    
+    register_indicator('bollinger_mid', ['close'], sma, {'window': BOLLINGER_WINDOW}, warmup=BOLLINGER_WINDOW - 1)
+    register_indicator('bollinger_std', ['close'], rolling_std, {'window': BOLLINGER_WINDOW}, column=False, warmup=BOLLINGER_WINDOW - 1)
+    register_indicator('bollinger_high', ['bollinger_mid', 'bollinger_std'], band, {'multiplier': BOLLINGER_DEV})
+    register_indicator('bollinger_low', ['bollinger_mid', 'bollinger_std'], band, {'multiplier': -BOLLINGER_DEV})
+    
+    register_indicator('obv', ['close', 'volume'], obv, full_history=True)
+    register_indicator('typical_price', ['high', 'low', 'close'], typical_price, column=False)
+    register_indicator('money_flows', ['typical_price', 'volume'], money_flows, column=False, warmup=1)
+    register_indicator('mfi', ['money_flows'], money_flow_index, {'window': MFI_WINDOW}, warmup=MFI_WINDOW - 1)
+    
+    register_indicator('daily_return', ['close'], percent_change, warmup=1, full_history=True)
+    register_indicator(
+        'volatility_30d', ['daily_return'], rolling_std, {'window': VOLATILITY_WINDOW, 'ddof': 1},
+        warmup=VOLATILITY_WINDOW - 1,
+    )
+    
+    register_indicator('donchian_high', ['high'], rolling_max, {'window': DONCHIAN_WINDOW}, warmup=DONCHIAN_WINDOW - 1)
+    register_indicator('donchian_low', ['low'], rolling_min, {'window': DONCHIAN_WINDOW}, warmup=DONCHIAN_WINDOW - 1)
+    register_indicator('donchian_mid', ['donchian_high', 'donchian_low'], midpoint)
+    register_indicator('williams_high', ['high'], rolling_max, {'window': WILLIAMS_R_WINDOW}, column=False, warmup=WILLIAMS_R_WINDOW - 1)
+    register_indicator('williams_low', ['low'], rolling_min, {'window': WILLIAMS_R_WINDOW}, column=False, warmup=WILLIAMS_R_WINDOW - 1)
+    register_indicator('williams_r', ['close', 'williams_high', 'williams_low'], williams_position)
+    register_indicator('high_52w', ['high'], rolling_max, {'window': YEAR_HIGH_LOW_WINDOW}, warmup=YEAR_HIGH_LOW_WINDOW - 1)
+    register_indicator('low_52w', ['low'], rolling_min, {'window': YEAR_HIGH_LOW_WINDOW}, warmup=YEAR_HIGH_LOW_WINDOW - 1)
+
+
+_register_builtin_indicators()
+
+
+def _evaluation_order(names):
+    # Nodes needed for names, each after the nodes it reads
+    order = []
+    seen = set()
+    
+    def visit(name):
+        if name in seen or name in PRICE_FIELDS:
+            return
+        seen.add(name)
+        for source in INDICATORS[name].inputs:
+            visit(source)
+        order.append(name)
+    
+    for name in names:
+        visit(name)
+    return order
+
+
+def resolve_indicators(indicators=None):
+    """
+    Expands requested indicators with the indicator columns they are computed from.
+    
+    Args:
+        indicators (iterable, optional): Indicator names (default: all of INDICATOR_COLUMNS)
+    
+    Returns:
+        list: Indicators to compute, in INDICATOR_COLUMNS order followed by
+              other registered indicators in registration order
+    """
+    if indicators is None:
+        return list(INDICATOR_COLUMNS)
+    
+    indicators = list(indicators)
+    for name in indicators:
+        if name not in INDICATORS or not INDICATORS[name].column:
+            raise ValueError(f"Unknown indicator: {name}")
+    needed = set(_evaluation_order(indicators))
+    extra = [name for name, node in INDICATORS.items() if node.column and name not in INDICATOR_COLUMNS]
+    return [name for name in INDICATOR_COLUMNS + extra if name in needed]
+
+
+def indicator_parameters():
+    """
+    Returns the current indicator graph, for keying cached results.
+    
+    Returns:
+        tuple: Inputs and parameters of every registered node, and the
+               convergence tolerance used in tail mode
+    """
+    nodes = tuple(
+        (name, node.inputs, node.signature[1])
+        for name, node in INDICATORS.items()
+    )
+    return nodes + (CONVERGENCE_TOLERANCE,)
+
+
+def compute_indicators(high, low, close, volume, indicators=None, out=None):
+    """
+    Computes the requested indicators (and their dependencies) into one
+    preallocated array. Only the nodes they need are evaluated, and shared
+    intermediates (e.g. the true range or the highest high of a window) once.
+    
+    Args:
+        high (numpy.ndarray): High prices along axis 0
+        low (numpy.ndarray): Low prices along axis 0
+        close (numpy.ndarray): Closing prices along axis 0
+        volume (numpy.ndarray): Volumes along axis 0
+        indicators (iterable, optional): Indicator names (default: all)
+        out (numpy.ndarray, optional): Array of shape close.shape + (number of
+            resolved indicators,)
+    
+    Returns:
+        numpy.ndarray: Indicator values, last axis ordered as resolve_indicators(indicators)
+    """
+    prices = [np.asarray(a, dtype=np.float64) for a in (high, low, close, volume)]
+    
+    columns = resolve_indicators(indicators)
+    position = {name: i for i, name in enumerate(columns)}
+    if out is None:
+        out = np.empty(prices[2].shape + (len(columns),), order='F')
+    
+    # Values by node key: the field name for prices, the function, parameters
+    # and input keys for registered nodes
+    keys = {field: field for field in PRICE_FIELDS}
+    values = dict(zip(PRICE_FIELDS, prices))
+    for name in _evaluation_order(columns):
+        node = INDICATORS[name]
+        key = node.signature + tuple(keys[source] for source in node.inputs)
+        keys[name] = key
+        target = out[..., position[name]] if name in position else None
+        
+        if key not in values:
+            args = [values[keys[source]] for source in node.inputs]
+            if target is None:
+                values[key] = node.function(*args, **node.params)
+            else:
+                values[key] = node.function(*args, out=target, **node.params)
+        if target is not None and values[key] is not target:
+            target[...] = values[key]
+    return out
+
+
+def indicator_frame(df, indicators=None, tail=None, tolerance=None):
+    """
+    Computes indicators for a price frame.
+    
+    Args:
+        df (pandas.DataFrame): Price data with 'high', 'low', 'close' and 'volume' columns
+        indicators (iterable, optional): Indicator names (default: all)
+        tail (int, optional): Only the last tail rows are needed (see compute_tail)
+        tolerance (float, optional): Convergence tolerance in tail mode (default:
+            CONVERGENCE_TOLERANCE)
+    
+    Returns:
+        pandas.DataFrame: Requested indicators and their dependencies, sharing df's
+                          index and backed by a single 2-D array without copying
+    """
+    columns = resolve_indicators(indicators)
+    arrays = [df[name].to_numpy() for name in ('high', 'low', 'close', 'volume')]
+    if tail is None:
+        values = compute_indicators(*arrays, columns)
+    else:
+        values = compute_tail(*(np.asarray(a, dtype=np.float64) for a in arrays), tail, columns, tolerance)
+    return pd.DataFrame(values, index=df.index, columns=columns, copy=False)
+
+
+def warmup_bars(indicators=None, tolerance=None):
+    """
+    Bars of history needed before the first bar whose indicator values must be
+    exact: each node's own warm-up (a window, or a window plus a convergence
+    window for smoothed ones) on top of the warm-up of its inputs.
+    FULL_HISTORY_INDICATORS are left out.
+    
+    Args:
+        indicators (iterable, optional): Indicator names (default: all)
+        tolerance (float, optional): Convergence tolerance (default: CONVERGENCE_TOLERANCE)
+    
+    Returns:
+        int: Warm-up bars for the most demanding requested indicator
+    """
+    columns = resolve_indicators(indicators)
+    totals = {field: 0 for field in PRICE_FIELDS}
+    for name in _evaluation_order(columns):
+        node = INDICATORS[name]
+        inherited = max(totals[source] for source in node.inputs)
+        totals[name] = inherited + node.own_warmup(tolerance)
+    return max((totals[name] for name in columns if name not in FULL_HISTORY_INDICATORS), default=0)
+
+
+def compute_tail(high, low, close, volume, bars, indicators=None, tolerance=None):
+    """
+    Computes indicators for the last bars only. Windowed and smoothed indicators
+    are computed over the last bars plus their warm-up; FULL_HISTORY_INDICATORS
+    over all bars. The last bars match compute_indicators within tolerance.
+    Series no longer than bars plus warm-up are computed in a single pass.
+    
+    Args:
+        high (numpy.ndarray): High prices along axis 0
+        low (numpy.ndarray): Low prices along axis 0
+        close (numpy.ndarray): Closing prices along axis 0
+        volume (numpy.ndarray): Volumes along axis 0
+        bars (int): Number of most recent bars needed
+        indicators (iterable, optional): Indicator names (default: all)
+        tolerance (float, optional): Convergence tolerance (default: CONVERGENCE_TOLERANCE)
+    
+    Returns:
+        numpy.ndarray: Same layout as compute_indicators; rows before the last
+                       bars are NaN except in FULL_HISTORY_INDICATORS columns
+    """
+    columns = resolve_indicators(indicators)
+    n = close.shape[0]
+    first = max(n - bars, 0)
+    start = max(first - warmup_bars(columns, tolerance), 0)
+
+    windowed = [name for name in columns if name not in FULL_HISTORY_INDICATORS]
+    full = [name for name in columns if name in FULL_HISTORY_INDICATORS]
+    if start == 0:
+        # Nothing to trim: one pass over all bars, blanked before the last bars
+        out = compute_indicators(high, low, close, volume, columns)
+        for name in windowed:
+            out[:first, ..., columns.index(name)] = np.nan
+        return out
+    
+    out = np.full(close.shape + (len(columns),), np.nan, order='F')
+    if windowed:
+        computed = resolve_indicators(windowed)
+        values = compute_indicators(high[start:], low[start:], close[start:], volume[start:], computed)
+        for i, name in enumerate(computed):
+            if name in windowed:
+                out[first:, ..., columns.index(name)] = values[first - start:, ..., i]
+    if full:
+        values = compute_indicators(high, low, close, volume, full)
+        for i, name in enumerate(full):
+            out[..., columns.index(name)] = values[..., i]
+    return out
+
+
+def compute_panel(high, low, close, volume, indicators=None):
+    """
+    Computes indicators for many tickers at once from (dates x tickers) arrays.
+    Dates on which a ticker has no bar are NaN. Each ticker's result is the same
+    as computing its own series alone with those dates left out. A NaN close is
+    read as "no bar" wherever it occurs, so a series with NaN closes inside its
+    history differs from compute_indicators on it, which carries the NaN through
+    the windows.
+    
+    Args:
+        high (numpy.ndarray): High prices, shape (dates, tickers)
+        low (numpy.ndarray): Low prices, shape (dates, tickers)
+        close (numpy.ndarray): Closing prices, shape (dates, tickers)
+        volume (numpy.ndarray): Volumes, shape (dates, tickers)
+        indicators (iterable, optional): Indicator names (default: all)
+    
+    Returns:
+        numpy.ndarray: Shape (dates, tickers, indicators), last axis ordered as
+                       resolve_indicators(indicators); NaN where a ticker has no bar
+    """
+    arrays = [np.asarray(a, dtype=np.float64) for a in (high, low, close, volume)]
+    valid = ~np.isnan(arrays[2])
+    if valid.all():
+        return compute_indicators(*arrays, indicators)
+
+    # Move each ticker's bars to the top of its column so every series starts on
+    # row 0 without gaps, compute, then put the results back on their dates
+    order = np.argsort(~valid, axis=0, kind='stable')
+    compact = [np.take_along_axis(a, order, axis=0) for a in arrays]
+    values = compute_indicators(*compact, indicators)
+    out = np.empty_like(values)
+    out[order, np.arange(order.shape[1])] = values
+    out[~valid] = np.nan
+    return out
+
+
+def price_panel(frames):
+    """
+    Aligns per-ticker price frames on a common date index.
+    
+    Args:
+        frames (dict): Ticker to price DataFrame with 'date', 'high', 'low',
+            'close' and 'volume' columns
+    
+    Returns:
+        pandas.DataFrame: Indexed by date, with (field, ticker) column MultiIndex
+    """
+    tickers = list(frames)
+    fields = ['high', 'low', 'close', 'volume']
+    dates = np.unique(np.concatenate([frames[t]['date'].to_numpy() for t in tickers]))
+
+    # One (dates x fields x tickers) block filled column by column; cheaper than
+    # concatenating hundreds of frames with pandas alignment
+    values = np.full((len(dates), len(fields), len(tickers)), np.nan)
+    for j, ticker in enumerate(tickers):
+        df = frames[ticker]
+        rows = np.searchsorted(dates, df['date'].to_numpy())
+        for i, field in enumerate(fields):
+            values[rows, i, j] = df[field].to_numpy()
+
+    columns = pd.MultiIndex.from_product([fields, tickers])
+    return pd.DataFrame(
+        values.reshape(len(dates), -1),
+        index=pd.Index(dates, name='date'),
+        columns=columns,
+        copy=False,
+    )
+
+
+def indicator_panel(prices, indicators=None):
+    """
+    Computes indicators for a price panel in one vectorized pass.
+    
+    Args:
+        prices (pandas.DataFrame): Panel from price_panel, indexed by date with
+            (field, ticker) columns
+        indicators (iterable, optional): Indicator names (default: all)
+    
+    Returns:
+        pandas.DataFrame: Indexed by date, with (indicator, ticker) column MultiIndex,
+                          e.g. result['rsi'] is a dates x tickers frame
+    """
+    tickers = prices['close'].columns
+    values = compute_panel(
+        prices['high'][tickers].to_numpy(),
+        prices['low'][tickers].to_numpy(),
+        prices['close'][tickers].to_numpy(),
+        prices['volume'][tickers].to_numpy(),
+        indicators,
+    )
+    n, k, c = values.shape
+    columns = pd.MultiIndex.from_product([resolve_indicators(indicators), tickers])
+    return pd.DataFrame(values.reshape(n, k * c, order='F'), index=prices.index, columns=columns, copy=False)
@@ -0,0 +1,95 @@
+import os
+import numpy as np
+
+
+# Compiled kernels are cached on disk, so a cold start (e.g. a new Streamlit
+# process) loads machine code instead of compiling. Must be set before numba loads.
+os.environ.setdefault('NUMBA_CACHE_DIR', os.path.join('cache', 'numba'))
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# numba is optional; utils.indicators falls back to its NumPy kernels without it
+NUMBA_AVAILABLE = njit is not None
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True)
+    def _recurrence_2d(x, decay, gain, out):
+        n, m = x.shape
+        for j in range(m):
+            out[0, j] = x[0, j]
+        for i in range(1, n):
+            for j in range(m):
+                out[i, j] = decay[j] * out[i - 1, j] + gain[j] * x[i, j]
+
+    @njit(cache=True)
+    def _obv_2d(close, volume, out):
+        n, m = close.shape
+        for j in range(m):
+            total = 0.0
+            for i in range(n):
+                if i > 0 and close[i, j] < close[i - 1, j]:
+                    total -= volume[i, j]
+                else:
+                    total += volume[i, j]
+                out[i, j] = total
+
+
+def _as_columns(x):
+    # Kernels take C-contiguous float64 arrays of shape (rows, columns)
+    return np.ascontiguousarray(np.reshape(x, (x.shape[0], -1)), dtype=np.float64)
+
+
+def _per_column(value, shape):
+    return np.ascontiguousarray(np.broadcast_to(np.asarray(value, dtype=np.float64), shape).reshape(-1))
+
+
+def jit_recurrence(x, decay, gain, out):
+    """
+    Compiled version of indicators.recurrence: y[0] = x[0],
+    y[i] = decay * y[i-1] + gain * x[i], evaluated row by row.
+    
+    Args:
+        x (numpy.ndarray): Input values along axis 0
+        decay (float or numpy.ndarray): Weight of the previous output, broadcast
+            over the trailing axes of x
+        gain (float or numpy.ndarray): Weight of the current input
+        out (numpy.ndarray): Array receiving the outputs (same shape as x)
+    
+    Returns:
+        numpy.ndarray: out
+    """
+    if x.shape[0] == 0:
+        return out
+    columns = _as_columns(x)
+    result = np.empty(columns.shape)
+    _recurrence_2d(columns, _per_column(decay, x.shape[1:]), _per_column(gain, x.shape[1:]), result)
+    out[...] = result.reshape(x.shape)
+    return out
+
+
+def jit_obv(close, volume, out=None):
+    """
+    Compiled version of indicators.obv, fusing the signed volume and the
+    running total into one pass.
+    
+    Args:
+        close (numpy.ndarray): Closing prices along axis 0
+        volume (numpy.ndarray): Volumes along axis 0
+        out (numpy.ndarray, optional): Array receiving the result
+    
+    Returns:
+        numpy.ndarray: Cumulative on-balance volume
+    """
+    if out is None:
+        out = np.empty(close.shape)
+    if close.shape[0] == 0:
+        return out
+    result = np.empty((close.shape[0], int(np.prod(close.shape[1:], dtype=np.int64))))
+    _obv_2d(_as_columns(close), _as_columns(volume), result)
+    out[...] = result.reshape(close.shape)
+    return out
@@ -2,7 +2,8 @@ import pandas as pd
 import numpy as np
 import datetime
 import yfinance as yf
-from utils.stock_data import get_stock_data
+from utils.stock_data import get_stock_data_batch
+from utils.symbols import canonical_symbol
 
 
 def get_portfolio_data():
@@ -211,17 +212,18 @@ def calculate_portfolio_metrics(portfolio):
     total_weight = 0
     
     # Get correlation matrix for diversification calculation
-    tickers = [holding['ticker'] + '.NS' for holding in holdings]
+    tickers = [canonical_symbol(holding['ticker']) for holding in holdings]
     start_date = datetime.datetime.now() - datetime.timedelta(days=365)
     end_date = datetime.datetime.now()
     
     try:
         # Try to fetch historical data for correlation matrix
         stock_data = {}
+        batch_data = get_stock_data_batch(tickers, period='1y')
         for ticker in tickers:
-            data = get_stock_data(ticker, period='1y')
+            data = batch_data.get(ticker)
             if data is not None:
-                stock_data[ticker] = data['close']
+                stock_data[ticker] = data.set_index('date')['close']
         
         # Create a DataFrame with all stock prices
         if stock_data:
@@ -0,0 +1,315 @@
+import os
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+
+# Create a directory for the on-disk price store (one Parquet file per ticker)
+PRICE_STORE_DIR = os.path.join('cache', 'prices')
+os.makedirs(PRICE_STORE_DIR, exist_ok=True)
+PRICE_STORE_EXPIRY = 15 * 60  # 15 minutes in seconds
+
+# Number of already-stored bars re-requested on an incremental refresh, so that
+# revised closes for recent sessions are picked up
+DELTA_OVERLAP_BARS = 3
+
+# Relative difference between a re-read overlap close and the stored close above
+# which the delta is taken to be adjusted on a different basis (a dividend or
+# split since the stored bars were downloaded)
+ADJUSTMENT_TOLERANCE = 1e-3
+
+# Allow a few days of slack when checking history coverage (weekends and holidays)
+COVERAGE_GRACE_DAYS = 5
+
+# Bar timeframes built from the stored daily bars (weeks start on Monday)
+TIMEFRAMES = ('daily', 'weekly', 'monthly')
+
+PERIOD_OFFSETS = {
+    '1d': pd.DateOffset(days=1),
+    '5d': pd.DateOffset(days=5),
+    '1mo': pd.DateOffset(months=1),
+    '3mo': pd.DateOffset(months=3),
+    '6mo': pd.DateOffset(months=6),
+    '1y': pd.DateOffset(years=1),
+    '2y': pd.DateOffset(years=2),
+    '5y': pd.DateOffset(years=5),
+    '10y': pd.DateOffset(years=10),
+}
+
+
+def _store_path(ticker):
+    """
+    Returns the Parquet file path for a ticker.
+    
+    Args:
+        ticker (str): Stock ticker symbol
+    
+    Returns:
+        str: Path of the ticker's price file
+    """
+    safe_ticker = ticker.replace('/', '_').replace('^', '_')
+    return os.path.join(PRICE_STORE_DIR, f"{safe_ticker}.parquet")
+
+
+def period_start(period, tz=None):
+    """
+    Converts a yfinance period string into the first date it covers.
+    
+    Args:
+        period (str): Period string such as '1mo', '1y' or 'ytd'
+        tz: Timezone of the price data, if the dates are timezone-aware
+    
+    Returns:
+        pandas.Timestamp: Start of the period, or None for 'max'/unknown periods
+    """
+    today = pd.Timestamp.now(tz=tz).normalize()
+    if period == 'ytd':
+        return today.replace(month=1, day=1)
+    offset = PERIOD_OFFSETS.get(period)
+    if offset is None:
+        return None
+    return today - offset
+
+
+def longest_period(*periods):
+    """
+    Returns the period reaching furthest back in time.
+    
+    Args:
+        *periods (str): Period strings such as '6mo' or '1y'
+    
+    Returns:
+        str: The longest of the given periods ('max' beats everything)
+    """
+    earliest = pd.Timestamp.min
+    return min(periods, key=lambda p: period_start(p) or earliest)
+
+
+def load_prices(ticker):
+    """
+    Loads the stored daily bars for a ticker.
+    
+    Args:
+        ticker (str): Stock ticker symbol
+    
+    Returns:
+        pandas.DataFrame: Stored price data, or None if nothing is stored
+    """
+    path = _store_path(ticker)
+    if not os.path.exists(path):
+        return None
+    try:
+        return pd.read_parquet(path)
+    except Exception as e:
+        print(f"Error reading price store for {ticker}: {e}")
+        return None
+
+
+def save_prices(ticker, df):
+    """
+    Writes daily bars for a ticker to the store, replacing the previous file.
+    
+    Args:
+        ticker (str): Stock ticker symbol
+        df (pandas.DataFrame): Price data with a 'date' column
+    """
+    path = _store_path(ticker)
+    tmp_path = f"{path}.tmp"
+    try:
+        df.to_parquet(tmp_path, index=False)
+        # Swap the file in atomically so readers never see a partial write
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"Error saving price store for {ticker}: {e}")
+
+
+def is_fresh(ticker):
+    """
+    Checks whether the stored bars for a ticker were written recently.
+    
+    Args:
+        ticker (str): Stock ticker symbol
+    
+    Returns:
+        bool: True if the stored file is younger than PRICE_STORE_EXPIRY
+    """
+    path = _store_path(ticker)
+    if not os.path.exists(path):
+        return False
+    return datetime.now().timestamp() - os.path.getmtime(path) < PRICE_STORE_EXPIRY
+
+
+def delta_start(df):
+    """
+    Returns the start date for an incremental refresh of a stored series.
+    The window reaches DELTA_OVERLAP_BARS back so recent bars are re-read.
+    
+    Args:
+        df (pandas.DataFrame): Stored price data with a 'date' column
+    
+    Returns:
+        str: Start date in 'YYYY-MM-DD' format
+    """
+    overlap = min(DELTA_OVERLAP_BARS, len(df))
+    return df['date'].iloc[-overlap].strftime('%Y-%m-%d')
+
+
+def needs_readjustment(stored, fresh):
+    """
+    Checks whether an incremental download was adjusted on a different basis
+    than the stored bars. Yahoo adjusts the whole history for dividends and
+    splits, so merging such a delta would leave a price step at the seam.
+    
+    Args:
+        stored (pandas.DataFrame): Stored price data with 'date' and 'close' columns
+        fresh (pandas.DataFrame): Normalized delta download, including the
+            'dividends' and 'stock_splits' columns when available
+    
+    Returns:
+        bool: True if a bar not stored yet carries a dividend or split, or if a
+              re-read close of a completed bar differs from the stored one by
+              more than ADJUSTMENT_TOLERANCE
+    """
+    last_stored = stored['date'].iloc[-1]
+    
+    # Actions on re-read overlap bars were already applied when they were stored
+    new_bars = fresh[fresh['date'] > last_stored]
+    for column in ('dividends', 'stock_splits'):
+        if column in new_bars.columns and (new_bars[column].fillna(0) != 0).any():
+            return True
+    
+    # The last stored bar may have been stored mid-session and still be moving,
+    # so only the completed bars before it are compared
+    completed = stored[stored['date'] < last_stored]
+    stored_close, fresh_close = completed.set_index('date')['close'].align(
+        fresh.set_index('date')['close'], join='inner'
+    )
+    if stored_close.empty:
+        return False
+    change = np.abs(fresh_close.to_numpy(dtype=np.float64) / stored_close.to_numpy(dtype=np.float64) - 1)
+    return bool((change > ADJUSTMENT_TOLERANCE).any())
+
+
+def history_start(df):
+    """
+    Returns the first stored date, for re-downloading a whole stored series.
+    
+    Args:
+        df (pandas.DataFrame): Stored price data with a 'date' column
+    
+    Returns:
+        str: Start date in 'YYYY-MM-DD' format
+    """
+    return df['date'].iloc[0].strftime('%Y-%m-%d')
+
+
+def covers_period(df, period):
+    """
+    Checks whether stored bars reach back to the start of a period.
+    
+    Args:
+        df (pandas.DataFrame): Stored price data with a 'date' column
+        period (str): Requested period
+    
+    Returns:
+        bool: True if no older bars are needed to serve the period
+    """
+    if df is None or df.empty:
+        return False
+    start = period_start(period, df['date'].dt.tz)
+    if start is None:
+        return False
+    return df['date'].iloc[0] <= start + pd.Timedelta(days=COVERAGE_GRACE_DAYS)
+
+
+def slice_period(df, period):
+    """
+    Returns the bars of a stored series that fall inside a period.
+    The result is a positional slice of df (a view, not a copy), so its index
+    keeps the row positions of the full series.
+    
+    Args:
+        df (pandas.DataFrame): Price data with a 'date' column, sorted by date
+        period (str): Requested period
+    
+    Returns:
+        pandas.DataFrame: Bars within the period
+    """
+    start = period_start(period, df['date'].dt.tz)
+    if start is None:
+        return df
+    return df.iloc[df['date'].searchsorted(start):]
+
+
+def merge_prices(stored, fresh):
+    """
+    Merges freshly downloaded bars into the stored series.
+    Fresh bars replace stored bars with the same date.
+    
+    Args:
+        stored (pandas.DataFrame): Previously stored price data (may be None)
+        fresh (pandas.DataFrame): Newly downloaded price data
+    
+    Returns:
+        pandas.DataFrame: Combined price data sorted by date
+    """
+    if stored is None or stored.empty:
+        return fresh.reset_index(drop=True)
+    combined = pd.concat([stored, fresh], ignore_index=True)
+    combined = combined.drop_duplicates(subset='date', keep='last')
+    return combined.sort_values('date').reset_index(drop=True)
+
+
+def period_labels(dates, timeframe):
+    """
+    Labels each daily bar with the week or month it belongs to.
+    
+    Args:
+        dates (numpy.ndarray): Bar dates (datetime64)
+        timeframe (str): 'weekly' or 'monthly'
+    
+    Returns:
+        numpy.ndarray: Integer period label per bar
+    """
+    if timeframe == 'weekly':
+        # 1970-01-01 was a Thursday; shift by three days so weeks start on Monday
+        days = dates.astype('datetime64[D]').astype('int64')
+        return (days + 3) // 7
+    if timeframe == 'monthly':
+        return dates.astype('datetime64[M]').astype('int64')
+    raise ValueError(f"Unknown timeframe: {timeframe}")
+
+
+def resample_prices(df, timeframe):
+    """
+    Aggregates daily bars into weekly or monthly OHLCV bars: first open, highest
+    high, lowest low, last close and total volume of each period. Each bar is
+    dated on the last trading day of its period, so the current period is a
+    partial bar that grows until the period ends.
+    
+    Args:
+        df (pandas.DataFrame): Daily price data with 'date', 'open', 'high', 'low',
+            'close' and 'volume' columns, sorted by date
+        timeframe (str): 'daily' (returns df unchanged), 'weekly' or 'monthly'
+    
+    Returns:
+        pandas.DataFrame: Resampled bars with the same columns and dtypes
+    """
+    if timeframe == 'daily' or df.empty:
+        return df
+    
+    # Bars are sorted, so each period is a run of rows; aggregate every run at once
+    labels = period_labels(df['date'].to_numpy(), timeframe)
+    starts = np.flatnonzero(np.r_[True, labels[1:] != labels[:-1]])
+    ends = np.r_[starts[1:], len(labels)] - 1
+    
+    high = df['high'].to_numpy()
+    low = df['low'].to_numpy()
+    return pd.DataFrame({
+        'date': df['date'].to_numpy()[ends],
+        'open': df['open'].to_numpy()[starts],
+        'high': np.maximum.reduceat(high, starts),
+        'low': np.minimum.reduceat(low, starts),
+        'close': df['close'].to_numpy()[ends],
+        'volume': np.add.reduceat(df['volume'].to_numpy(), starts),
+    })
@@ -1,6 +1,9 @@
 import pandas as pd
 import numpy as np
-from utils.analysis import perform_complete_analysis
+from utils.analysis import perform_complete_analysis, ANALYSIS_INDICATORS
+from utils.stock_data import get_stock_data_batch, calculate_technical_indicators_batch
+from utils.cache import negative_cache
+from utils.symbols import canonical_symbol
 
 def generate_stock_recommendation(analysis_results, time_horizon='medium_term'):
     """
@@ -224,6 +227,15 @@ def generate_all_recommendations(portfolio, time_horizon='medium_term'):
     """
     recommendations = []
     
+    # Fetch price history for all holdings in grouped requests up front
+    tickers = [holding.get('ticker') for holding in portfolio.get('holdings', []) if holding.get('ticker')]
+    batch_data = get_stock_data_batch(tickers)
+    
+    # Compute indicators for all holdings in one panel pass; the per-holding
+    # analysis below picks them up from the indicator cache. Tail mode would not
+    # pay off here: the 200-day SMA alone needs nearly all of a year of bars.
+    calculate_technical_indicators_batch(batch_data, ANALYSIS_INDICATORS)
+    
     # Run analysis and generate recommendations for each holding
     for holding in portfolio.get('holdings', []):
         ticker = holding.get('ticker')
@@ -232,9 +244,14 @@ def generate_all_recommendations(portfolio, time_horizon='medium_term'):
         if not ticker:
             continue
         
+        # Skip delisted or persistently empty symbols
+        if negative_cache.is_unavailable(canonical_symbol(ticker)):
+            print(f"Skipping unavailable ticker {ticker}")
+            continue
+        
         try:
             # Perform analysis
-            analysis_results = perform_complete_analysis(ticker)
+            analysis_results = perform_complete_analysis(ticker, stock_data=batch_data.get(ticker))
             
             # Generate recommendation with the specified time horizon
             recommendation = generate_stock_recommendation(analysis_results, time_horizon=time_horizon)
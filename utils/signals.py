@@ -0,0 +1,187 @@
+import numpy as np
+
+
+# Direction labels for upward and downward crossings (and divergences), as used
+# in the analysis results
+CROSSOVER_DIRECTIONS = {1: 'Bullish', -1: 'Bearish'}
+
+# Bars on each side a swing high (low) must exceed (stay below)
+SWING_ORDER = 3
+
+# Most recent bars searched for divergences between price and an indicator
+DIVERGENCE_LOOKBACK = 40
+
+# Indicator columns checked for divergences from the closing price
+DIVERGENCE_INDICATORS = ('rsi', 'macd', 'obv', 'mfi')
+
+
+def cross_points(fast, slow):
+    """
+    Finds the bars on which one series crosses another: fast below slow on the
+    previous bar and above it on this one (or the reverse). Bars where either
+    series is NaN never form a crossing.
+    
+    Args:
+        fast (numpy.ndarray): Series that crosses
+        slow (numpy.ndarray): Series that is crossed, same length as fast
+    
+    Returns:
+        tuple: (positions of the bars completing a crossing, directions as
+               1 for upward and -1 for downward crossings)
+    """
+    fast = np.asarray(fast, dtype=np.float64)
+    slow = np.asarray(slow, dtype=np.float64)
+
+    with np.errstate(invalid='ignore'):
+        below = fast < slow
+        above = fast > slow
+    upward = below[:-1] & above[1:]
+    downward = above[:-1] & below[1:]
+
+    positions = np.flatnonzero(upward | downward) + 1
+    directions = np.where(upward[positions - 1], 1, -1)
+    return positions, directions
+
+
+def find_crossovers(df, fast, slow, lookback=None):
+    """
+    Finds the crossings of two columns within the most recent bars.
+    
+    Args:
+        df (pandas.DataFrame): Price data with indicator columns
+        fast (str): Column that crosses (e.g. 'sma_50' or 'macd')
+        slow (str): Column that is crossed (e.g. 'sma_200' or 'macd_signal')
+        lookback (int, optional): Number of most recent bars scanned; crossings
+            between consecutive bars inside this window are reported (default: all)
+    
+    Returns:
+        list: One dict per crossing, oldest first, with 'date' (the 'date' column,
+              or the index label if there is none) and 'direction' ('Bullish' or
+              'Bearish')
+    """
+    if lookback is not None:
+        df = df.iloc[-lookback:]
+    positions, directions = cross_points(df[fast].to_numpy(), df[slow].to_numpy())
+
+    dates = df['date'] if 'date' in df.columns else df.index.to_series()
+    return [
+        {'date': date, 'direction': CROSSOVER_DIRECTIONS[direction]}
+        for date, direction in zip(dates.iloc[positions].tolist(), directions.tolist())
+    ]
+
+
+def swing_points(x, order=SWING_ORDER):
+    """
+    Marks swing highs and lows: bars higher (lower) than the order bars on either
+    side. On a flat top or bottom only its first bar is marked. The last order
+    bars are never marked, as their right side is not known yet.
+    
+    Args:
+        x (numpy.ndarray): Values along axis 0, e.g. closes of shape (bars,) or
+            (bars, tickers)
+        order (int): Bars compared on each side (default: SWING_ORDER)
+    
+    Returns:
+        tuple: (swing high mask, swing low mask), both shaped like x
+    """
+    x = np.asarray(x, dtype=np.float64)
+    n = x.shape[0]
+    highs = np.zeros(x.shape, dtype=bool)
+    lows = np.zeros(x.shape, dtype=bool)
+    if n < 2 * order + 1:
+        return highs, lows
+    
+    center = x[order:n - order]
+    high = highs[order:n - order]
+    low = lows[order:n - order]
+    high[...] = True
+    low[...] = True
+    with np.errstate(invalid='ignore'):
+        for k in range(1, order + 1):
+            left = x[order - k:n - order - k]
+            right = x[order + k:n - order + k]
+            high &= (center > left) & (center >= right)
+            low &= (center < left) & (center <= right)
+    return highs, lows
+
+
+def _last_two(mask):
+    # Rows of the last and second-to-last True values per column (-1 if missing)
+    rows = np.arange(mask.shape[0]).reshape((-1,) + (1,) * (mask.ndim - 1))
+    last = np.where(mask, rows, -1).max(axis=0)
+    previous = np.where(mask & (rows < last), rows, -1).max(axis=0)
+    return previous, last
+
+
+def _values_at(x, rows):
+    return np.take_along_axis(x, np.expand_dims(rows, 0), axis=0)[0]
+
+
+def divergence(price, indicator, order=SWING_ORDER, lookback=DIVERGENCE_LOOKBACK):
+    """
+    Detects regular divergences between price and an indicator at the last two
+    price swings in the lookback window. Bullish: price makes a lower low while
+    the indicator makes a higher low. Bearish: price makes a higher high while
+    the indicator makes a lower high. If both occur, the one with the more
+    recent swing counts. Works on many tickers at once (e.g. columns of an
+    indicator_panel).
+    
+    Args:
+        price (numpy.ndarray): Closing prices along axis 0, shape (bars,) or
+            (bars, tickers)
+        indicator (numpy.ndarray): Indicator values, same shape as price
+        order (int): Swing order (default: SWING_ORDER)
+        lookback (int, optional): Most recent bars searched (default:
+            DIVERGENCE_LOOKBACK; None for all bars)
+    
+    Returns:
+        numpy.ndarray: 1 for bullish, -1 for bearish, 0 for no divergence, with
+                       price's shape minus the first axis (0-d for one series)
+    """
+    price = np.asarray(price, dtype=np.float64)
+    indicator = np.asarray(indicator, dtype=np.float64)
+    if lookback is not None:
+        price = price[-lookback:]
+        indicator = indicator[-lookback:]
+    if price.shape[0] == 0:
+        return np.zeros(price.shape[1:], dtype=int)
+    
+    highs, lows = swing_points(price, order)
+    previous_low, last_low = _last_two(lows)
+    previous_high, last_high = _last_two(highs)
+    
+    with np.errstate(invalid='ignore'):
+        bullish = (
+            (previous_low >= 0)
+            & (_values_at(price, last_low) < _values_at(price, previous_low))
+            & (_values_at(indicator, last_low) > _values_at(indicator, previous_low))
+        )
+        bearish = (
+            (previous_high >= 0)
+            & (_values_at(price, last_high) > _values_at(price, previous_high))
+            & (_values_at(indicator, last_high) < _values_at(indicator, previous_high))
+        )
+    bullish &= ~bearish | (last_low > last_high)
+    return np.where(bullish, 1, np.where(bearish, -1, 0))
+
+
+def find_divergences(df, indicators=DIVERGENCE_INDICATORS, order=SWING_ORDER, lookback=DIVERGENCE_LOOKBACK):
+    """
+    Detects divergences between the closing price and indicator columns.
+    
+    Args:
+        df (pandas.DataFrame): Price data with a 'close' column and indicator columns
+        indicators (iterable): Indicator columns to check; missing ones are skipped
+            (default: DIVERGENCE_INDICATORS)
+        order (int): Swing order (default: SWING_ORDER)
+        lookback (int, optional): Most recent bars searched (default: DIVERGENCE_LOOKBACK)
+    
+    Returns:
+        dict: Indicator name to 'Bullish', 'Bearish' or None
+    """
+    price = df['close'].to_numpy()
+    return {
+        name: CROSSOVER_DIRECTIONS.get(int(divergence(price, df[name].to_numpy(), order, lookback)))
+        for name in indicators
+        if name in df.columns
+    }
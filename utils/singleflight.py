@@ -0,0 +1,72 @@
+import threading
+
+
+class _Call:
+    """
+    State of one in-flight call shared by every caller waiting on the same key.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into a single execution.
+    
+    The first caller for a key runs the function; callers arriving while it is
+    still running wait for it and receive the same result (or exception).
+    Once the call finishes the key is released, so later calls run again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, *args, **kwargs):
+        """
+        Runs fn(*args, **kwargs) unless a call with the same key is in flight.
+        
+        Args:
+            key (hashable): Identifies equivalent calls
+            fn (callable): Function performing the work
+        
+        Returns:
+            The result of the (possibly shared) call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result
+
+    def in_flight(self):
+        """
+        Returns the number of keys currently being fetched.
+        
+        Returns:
+            int: Number of in-flight calls
+        """
+        with self._lock:
+            return len(self._calls)
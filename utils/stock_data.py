@@ -1,154 +1,646 @@
+import numpy as np
 import pandas as pd
 import yfinance as yf
 import pandas_datareader as pdr
 from datetime import datetime, timedelta
-import ta
-from ta.trend import ADXIndicator, SMAIndicator, EMAIndicator
-from ta.momentum import RSIIndicator, StochasticOscillator
-from ta.volume import OnBalanceVolumeIndicator, MFIIndicator
-from ta.volatility import BollingerBands
 import json
 import os
+from utils.async_fetch import fetch_engine
+from utils.symbols import canonical_symbol
+from utils.cache import data_cache, negative_cache, indicator_cache, content_hash
+from utils.http_cache import http_session
+from utils.singleflight import SingleFlight
+from utils.indicators import (
+    indicator_frame,
+    resolve_indicators,
+    indicator_parameters,
+    price_panel,
+    compute_panel,
+    warmup_bars,
+    FULL_HISTORY_INDICATORS,
+)
+from utils.price_store import load_prices, save_prices, is_fresh, covers_period, slice_period, merge_prices, delta_start, longest_period, resample_prices, needs_readjustment, history_start
 
 
-def get_stock_data(ticker, period='1y'):
+# Maximum number of tickers requested from Yahoo in a single grouped download
+BATCH_DOWNLOAD_SIZE = 50
+
+# Maps yfinance history columns to the app's column names
+HISTORY_COLUMNS = {
+    'Date': 'date',
+    'Open': 'open',
+    'High': 'high',
+    'Low': 'low',
+    'Close': 'close',
+    'Volume': 'volume',
+    'Dividends': 'dividends',
+    'Stock Splits': 'stock_splits',
+}
+
+# Columns returned by get_stock_data; corporate actions are only kept in the price store
+PRICE_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'volume']
+ACTION_COLUMNS = ['dividends', 'stock_splits']
+
+# Compact dtypes for price frames (roughly half the memory of yfinance's float64 frames)
+PRICE_DTYPE = 'float32'
+VOLUME_DTYPE = 'int64'
+
+# Shortest history kept per ticker. Shorter requests are sliced from it, so the
+# periods used across the app share one download and one cache entry.
+HISTORY_PERIOD = '1y'
+
+# Coalesces concurrent fetches of the same symbol across Streamlit sessions
+_inflight = SingleFlight()
+
+
+def _normalize_history(hist_data):
+    """
+    Converts a yfinance history frame (or a previously stored one) into the app's
+    compact layout: a 'date' column, float32 prices and int64 volume.
+    Corporate action columns are kept under lowercase names.
+    
+    Args:
+        hist_data (pandas.DataFrame): History indexed by date with capitalized columns,
+            or already-normalized price data
+    
+    Returns:
+        pandas.DataFrame: Normalized price data
+    """
+    # Reset index to make date a column
+    if 'date' not in hist_data.columns and 'Date' not in hist_data.columns:
+        hist_data = hist_data.rename_axis('Date').reset_index()
+    
+    # Ensure column names are consistent
+    hist_data = hist_data.rename(columns=HISTORY_COLUMNS)
+    
+    dates = pd.to_datetime(hist_data['date'])
+    if dates.dt.tz is not None:
+        # Daily bars are stamped at local midnight, so the wall-clock date is kept
+        dates = dates.dt.tz_localize(None)
+    
+    return hist_data.assign(
+        date=dates.astype('datetime64[ns]'),
+        open=hist_data['open'].astype(PRICE_DTYPE),
+        high=hist_data['high'].astype(PRICE_DTYPE),
+        low=hist_data['low'].astype(PRICE_DTYPE),
+        close=hist_data['close'].astype(PRICE_DTYPE),
+        volume=hist_data['volume'].fillna(0).astype(VOLUME_DTYPE),
+    )
+
+
+def _load_stored_prices(ticker):
+    """
+    Loads a ticker's stored bars in the normalized layout.
+    
+    Args:
+        ticker (str): Yahoo Finance ticker symbol (with exchange suffix)
+    
+    Returns:
+        pandas.DataFrame: Stored price data, or None if nothing is stored
+    """
+    stored_data = load_prices(ticker)
+    if stored_data is None or stored_data.empty:
+        return None
+    return _normalize_history(stored_data)
+
+
+def get_stock_data(ticker, period='1y', incremental=True, include_actions=False):
     """
     Fetches stock data for a given ticker and period.
     
     Args:
         ticker (str): Stock ticker symbol
         period (str): Period for data fetching (default: '1y')
+        incremental (bool): If the price store already covers the period, only
+            download bars after the last stored one (default: True)
+        include_actions (bool): Also return the 'dividends' and 'stock_splits'
+            columns (default: False)
+    
+    Returns:
+        pandas.DataFrame: Historical stock data with a 'date' column, float32 prices
+            and int64 volume
+    """
+    # Resolve any alias to the canonical symbol used for fetching and cache keys
+    ticker = canonical_symbol(ticker)
+    
+    hist_data = _cached_history(ticker, period)
+    if hist_data is not None and not include_actions:
+        return hist_data
+    
+    if hist_data is None:
+        hist_data = _load_history(ticker, period, incremental)
+    
+    if hist_data is not None and include_actions:
+        # Corporate actions are only kept in the price store
+        stored_data = _load_stored_prices(ticker)
+        if stored_data is not None:
+            hist_data = slice_period(stored_data, period)
+    
+    return hist_data
+
+
+def _load_history(ticker, period, incremental):
+    """
+    Fetches a ticker's shared history and caches it in memory.
+    
+    Args:
+        ticker (str): Yahoo Finance ticker symbol (with exchange suffix)
+        period (str): Requested period
+        incremental (bool): Download only bars after the last stored one when possible
+    
+    Returns:
+        pandas.DataFrame: Historical stock data for the period, or None
+    """
+    # Fetch the longest history needed so far and serve this period from it
+    cached = data_cache.get('prices', ticker)
+    history_period = longest_period(period, HISTORY_PERIOD, *([cached[0]] if cached else []))
+    
+    # Concurrent callers asking for the same bars wait on a single fetch
+    hist_data = _inflight.do(('prices', ticker, history_period, incremental), _fetch_stock_data, ticker, history_period, incremental)
+    if hist_data is None:
+        return None
+    
+    hist_data = hist_data[PRICE_COLUMNS]
+    data_cache.set('prices', ticker, (history_period, hist_data))
+    return slice_period(hist_data, period)
+
+
+def _cached_history(ticker, period):
+    """
+    Serves a period from the ticker's cached history if it reaches back far enough.
+    
+    Args:
+        ticker (str): Yahoo Finance ticker symbol (with exchange suffix)
+        period (str): Requested period
+    
+    Returns:
+        pandas.DataFrame: View of the cached bars for the period, or None
+    """
+    cached = data_cache.get('prices', ticker)
+    if cached is None:
+        return None
+    history_period, hist_data = cached
+    if longest_period(history_period, period) != history_period:
+        return None
+    return slice_period(hist_data, period)
+
+
+def _fetch_stock_data(ticker, period, incremental):
+    """
+    Loads stock data from the price store, downloading missing bars as needed.
+    
+    Args:
+        ticker (str): Yahoo Finance ticker symbol (with exchange suffix)
+        period (str): Period for data fetching
+        incremental (bool): Download only bars after the last stored one when possible
     
     Returns:
         pandas.DataFrame: Historical stock data
     """
     try:
-        # Add .NS suffix for Indian stocks if not already present
-        if not ticker.endswith(('.NS', '.BO')) and ticker not in ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'META']:
-            ticker = f"{ticker}.NS"
+        # Serve from the local price store if it already holds the whole period
+        stored_data = _load_stored_prices(ticker)
+        if covers_period(stored_data, period) and is_fresh(ticker):
+            return slice_period(stored_data, period)
+        
+        # Don't retry symbols that recently failed or are known to be unavailable
+        if negative_cache.should_skip(ticker):
+            return slice_period(stored_data, period) if stored_data is not None else None
         
         # Fetch data from Yahoo Finance
-        stock = yf.Ticker(ticker)
-        hist_data = stock.history(period=period)
+        stock = yf.Ticker(ticker, session=http_session)
+        if incremental and covers_period(stored_data, period):
+            # Delta refresh: request only the bars after the last stored one
+            hist_data = stock.history(start=delta_start(stored_data))
+            if hist_data.empty:
+                # The delta re-reads stored bars, so an empty answer means the
+                # request failed: serve the stored bars as stale and back off
+                print(f"Delta download failed for {ticker}, serving stored data")
+                negative_cache.record_failure(ticker)
+                return slice_period(stored_data, period)
+            if needs_readjustment(stored_data, _normalize_history(hist_data)):
+                # A dividend or split re-based the adjusted history: replace the
+                # stored bars with a download of the whole stored span
+                full_data = stock.history(start=history_start(stored_data))
+                if not full_data.empty:
+                    hist_data = full_data
+                    stored_data = None
+        else:
+            hist_data = stock.history(period=period)
         
         # Check if data is available
         if hist_data.empty:
             print(f"No data available for {ticker}")
+            negative_cache.record_failure(ticker, empty=True)
             return None
         
-        # Reset index to make date a column
-        hist_data = hist_data.reset_index()
+        negative_cache.record_success(ticker)
+        hist_data = _normalize_history(hist_data)
         
-        # Ensure column names are consistent
-        hist_data.columns = [col if col != 'Date' else 'date' for col in hist_data.columns]
-        hist_data.columns = [col if col != 'Open' else 'open' for col in hist_data.columns]
-        hist_data.columns = [col if col != 'High' else 'high' for col in hist_data.columns]
-        hist_data.columns = [col if col != 'Low' else 'low' for col in hist_data.columns]
-        hist_data.columns = [col if col != 'Close' else 'close' for col in hist_data.columns]
-        hist_data.columns = [col if col != 'Volume' else 'volume' for col in hist_data.columns]
+        # Keep the downloaded bars for later calls
+        merged_data = merge_prices(stored_data, hist_data)
+        save_prices(ticker, merged_data)
         
-        return hist_data
+        return slice_period(merged_data, period)
     
     except Exception as e:
         print(f"Error fetching stock data for {ticker}: {e}")
+        negative_cache.record_failure(ticker, delisted='delisted' in str(e).lower())
         return None
 
 
-def calculate_technical_indicators(df):
+def get_stock_data_batch(tickers, period='1y', incremental=True):
+    """
+    Fetches stock data for many tickers using grouped Yahoo Finance downloads.
+    Tickers already held in the local price store are served from disk; the rest
+    are downloaded BATCH_DOWNLOAD_SIZE symbols per request.
+    
+    Args:
+        tickers (list): Stock ticker symbols
+        period (str): Period for data fetching (default: '1y')
+        incremental (bool): Download only recent bars for tickers whose stored
+            history already covers the period (default: True)
+    
+    Returns:
+        dict: Historical stock data keyed by the tickers as passed in
+              (None for tickers without data)
+    """
+    results = {}
+    histories = {}
+    stored = {}
+    pending = {}
+    
+    # Download the shared per-ticker history and slice the period out of it
+    history_period = longest_period(period, HISTORY_PERIOD)
+    
+    for ticker in tickers:
+        yf_ticker = canonical_symbol(ticker)
+        
+        hist_data = _cached_history(yf_ticker, period)
+        if hist_data is not None:
+            results[ticker] = hist_data
+            continue
+        
+        stored_data = _load_stored_prices(yf_ticker)
+        if covers_period(stored_data, history_period) and is_fresh(yf_ticker):
+            histories[yf_ticker] = slice_period(stored_data, history_period)
+        elif negative_cache.should_skip(yf_ticker):
+            # Recently failed or unavailable: serve whatever is stored without a download
+            if stored_data is not None:
+                histories[yf_ticker] = slice_period(stored_data, history_period)
+        else:
+            stored[yf_ticker] = stored_data
+        pending.setdefault(yf_ticker, []).append(ticker)
+    
+    # Tickers with enough stored history only need their most recent bars
+    delta_tickers = []
+    full_tickers = []
+    for yf_ticker in stored:
+        if incremental and covers_period(stored[yf_ticker], history_period):
+            delta_tickers.append(yf_ticker)
+        else:
+            full_tickers.append(yf_ticker)
+    
+    requests = []
+    for i in range(0, len(delta_tickers), BATCH_DOWNLOAD_SIZE):
+        chunk = delta_tickers[i:i + BATCH_DOWNLOAD_SIZE]
+        # One start date per request: the earliest one needed by the chunk
+        start = min(delta_start(stored[yf_ticker]) for yf_ticker in chunk)
+        requests.append((chunk, {'start': start}, False))
+    for i in range(0, len(full_tickers), BATCH_DOWNLOAD_SIZE):
+        requests.append((full_tickers[i:i + BATCH_DOWNLOAD_SIZE], {'period': history_period}, False))
+    
+    # Requests appended while iterating (re-downloads of re-based histories) are
+    # picked up by the loop as well
+    for chunk, request_args, replace in requests:
+        # Each request yfinance sends for the chunk takes a Yahoo rate-limit token
+        # in http_session
+        try:
+            # ignore_tz keeps every ticker on its own exchange-local dates; otherwise
+            # yfinance converts the chunk to one timezone and shifts the other
+            # exchanges' daily bars (e.g. NSE bars onto the previous US day)
+            data = yf.download(
+                chunk,
+                group_by='ticker',
+                actions=True,
+                auto_adjust=True,
+                ignore_tz=True,
+                progress=False,
+                threads=True,
+                session=http_session,
+                **request_args
+            )
+        except Exception as e:
+            print(f"Error downloading stock data for {', '.join(chunk)}: {e}")
+            data = None
+        
+        readjust = []
+        for yf_ticker in chunk:
+            hist_data = None
+            if data is not None and not data.empty and yf_ticker in data.columns.get_level_values(0):
+                hist_data = data[yf_ticker].dropna(subset=['Close'])
+            
+            # A failed request, a ticker missing from the response or an empty
+            # delta (which re-reads stored bars) is a failure, not "no new bars":
+            # serve stored bars as stale and back off, without marking them fresh
+            failed = hist_data is None
+            if 'start' in request_args and (failed or hist_data is None or hist_data.empty):
+                print(f"Delta download failed for {yf_ticker}, serving stored data")
+                negative_cache.record_failure(yf_ticker)
+                histories[yf_ticker] = slice_period(stored[yf_ticker], history_period)
+                continue
+            
+            if failed:
+                negative_cache.record_failure(yf_ticker)
+                continue
+            
+            if hist_data is None or hist_data.empty:
+                print(f"No data available for {yf_ticker}")
+                negative_cache.record_failure(yf_ticker, empty=True)
+                continue
+            
+            negative_cache.record_success(yf_ticker)
+            hist_data = _normalize_history(hist_data.rename_axis('Date'))
+            hist_data.columns.name = None
+            
+            if 'start' in request_args and not replace and needs_readjustment(stored[yf_ticker], hist_data):
+                # A dividend or split re-based the adjusted history: download the
+                # whole stored span again instead of merging onto the old basis
+                readjust.append(yf_ticker)
+                histories[yf_ticker] = slice_period(stored[yf_ticker], history_period)
+                continue
+            
+            # Keep the downloaded bars for later calls
+            merged_data = merge_prices(None if replace else stored[yf_ticker], hist_data)
+            save_prices(yf_ticker, merged_data)
+            histories[yf_ticker] = slice_period(merged_data, history_period)
+        
+        if readjust:
+            start = min(history_start(stored[yf_ticker]) for yf_ticker in readjust)
+            requests.append((readjust, {'start': start}, True))
+    
+    for yf_ticker, requested_as in pending.items():
+        hist_data = histories.get(yf_ticker)
+        if hist_data is not None:
+            hist_data = hist_data[PRICE_COLUMNS]
+            data_cache.set('prices', yf_ticker, (history_period, hist_data))
+            hist_data = slice_period(hist_data, period)
+        for ticker in requested_as:
+            results[ticker] = hist_data
+    
+    return results
+
+
+def calculate_technical_indicators(df, indicators=None, tail=None, tolerance=None):
     """
     Calculates technical indicators for a given dataframe.
     
     Args:
         df (pandas.DataFrame): DataFrame with stock price data
+        indicators (list, optional): Indicator columns the caller needs; only these
+            and the indicators they depend on are computed (default: all)
+        tail (int, optional): Number of most recent rows the caller reads. Indicators
+            are then computed over those rows plus their warm-up only, and are NaN
+            on earlier rows (except OBV and daily returns) (default: all rows)
+        tolerance (float, optional): Convergence tolerance of the smoothed indicators
+            in tail mode; a looser one needs fewer warm-up rows (default:
+            CONVERGENCE_TOLERANCE)
     
     Returns:
         pandas.DataFrame: DataFrame with added technical indicators
     """
+    columns = tuple(resolve_indicators(indicators))
+    
+    # Identical price frames (e.g. from analysis, recommendations and charts) share
+    # one result, in this session or any other in the process
+    cache_key = _indicator_cache_key(df, columns, tail, tolerance=tolerance)
+    if cache_key is not None:
+        cached = indicator_cache.get('indicators', cache_key)
+        if cached is not None:
+            return cached
+    
+    df_with_indicators = _compute_technical_indicators(df, columns, tail, tolerance)
+    if cache_key is not None and df_with_indicators is not df:
+        indicator_cache.set('indicators', cache_key, df_with_indicators)
+    
+    return df_with_indicators
+
+
+def calculate_technical_indicators_batch(frames, indicators=None, tail=None, tolerance=None):
+    """
+    Calculates technical indicators for many tickers in one vectorized pass.
+    Results are the same as calling calculate_technical_indicators per ticker
+    and share its cache.
+    
+    Args:
+        frames (dict): Ticker to DataFrame with stock price data (None values are skipped)
+        indicators (list, optional): Indicator columns the callers need (default: all)
+        tail (int, optional): Number of most recent rows the callers read (default: all rows)
+        tolerance (float, optional): Convergence tolerance in tail mode (default:
+            CONVERGENCE_TOLERANCE)
+    
+    Returns:
+        dict: Ticker to DataFrame with added technical indicators
+    """
+    columns = tuple(resolve_indicators(indicators))
+    results = {}
+    pending = {}
+    
+    required_cols = ['date', 'close', 'high', 'low', 'volume']
+    for ticker, df in frames.items():
+        if df is None:
+            continue
+        cache_key = _indicator_cache_key(df, columns, tail, tolerance=tolerance)
+        cached = indicator_cache.get('indicators', cache_key) if cache_key is not None else None
+        if cached is not None:
+            results[ticker] = cached
+        elif (
+            df.empty
+            or any(col not in df.columns for col in required_cols)
+            or not df['date'].is_unique
+            or df['close'].isna().any()
+        ):
+            # Frames the panel cannot align, or whose NaN closes it would read as
+            # missing bars, are handled one at a time
+            results[ticker] = calculate_technical_indicators(df, columns, tail, tolerance)
+        else:
+            pending[ticker] = (df, cache_key)
+    
+    if not pending:
+        return results
+    
+    # In tail mode the panel only needs each ticker's last rows plus warm-up
+    frames_by_ticker = {ticker: df for ticker, (df, _) in pending.items()}
+    panel_frames = frames_by_ticker
+    full_columns = []
+    if tail is not None:
+        full_columns = [name for name in columns if name in FULL_HISTORY_INDICATORS]
+        keep = tail + warmup_bars(columns, tolerance)
+        if any(len(df) > keep for df in frames_by_ticker.values()):
+            panel_frames = {ticker: df.iloc[-keep:] for ticker, df in frames_by_ticker.items()}
+    
     try:
-        # Make a copy to avoid modifying the original
-        df_with_indicators = df.copy()
+        prices = price_panel(panel_frames)
+        values = compute_panel(
+            prices['high'].to_numpy(),
+            prices['low'].to_numpy(),
+            prices['close'].to_numpy(),
+            prices['volume'].to_numpy(),
+            columns,
+        )
         
+        # The columns that need the whole history come from the same panel when
+        # nothing was trimmed, else from one more panel pass over the full frames
+        full_prices, full_values = prices, values[..., [columns.index(name) for name in full_columns]]
+        if full_columns and panel_frames is not frames_by_ticker:
+            full_prices = price_panel(frames_by_ticker)
+            full_values = compute_panel(
+                full_prices['high'].to_numpy(),
+                full_prices['low'].to_numpy(),
+                full_prices['close'].to_numpy(),
+                full_prices['volume'].to_numpy(),
+                full_columns,
+            )
+    except Exception as e:
+        print(f"Error calculating panel indicators, falling back to per-ticker: {e}")
+        for ticker, (df, _) in pending.items():
+            results[ticker] = calculate_technical_indicators(df, columns, tail, tolerance)
+        return results
+    
+    dates = prices.index.to_numpy()
+    full_dates = full_prices.index.to_numpy()
+    full_positions = [columns.index(name) for name in full_columns]
+    for j, (ticker, (df, cache_key)) in enumerate(pending.items()):
+        rows = np.searchsorted(dates, df['date'].to_numpy())
+        if tail is None:
+            ticker_values = values[rows, j, :]
+        else:
+            ticker_values = np.full((len(df), len(columns)), np.nan)
+            ticker_values[-tail:] = values[rows[-tail:], j, :]
+            if full_columns:
+                full_rows = np.searchsorted(full_dates, df['date'].to_numpy())
+                ticker_values[:, full_positions] = full_values[full_rows, j, :]
+        indicator_values = pd.DataFrame(ticker_values, index=df.index, columns=list(columns))
+        df_with_indicators = pd.concat([df, indicator_values], axis=1)
+        if cache_key is not None:
+            indicator_cache.set('indicators', cache_key, df_with_indicators)
+        results[ticker] = df_with_indicators
+    
+    return results
+
+
+def get_timeframe_data(ticker, timeframe, period='1y'):
+    """
+    Returns weekly or monthly bars for a ticker, resampled from its daily history.
+    The daily bars come from the same cache and price store as get_stock_data,
+    so no extra download is made for other timeframes.
+    
+    Args:
+        ticker (str): Stock ticker symbol
+        timeframe (str): 'daily', 'weekly' or 'monthly'
+        period (str): Period of daily history to resample (default: '1y')
+    
+    Returns:
+        pandas.DataFrame: Resampled price data, or None if no data is available
+    """
+    hist_data = get_stock_data(ticker, period)
+    if hist_data is None:
+        return None
+    return resample_prices(hist_data[PRICE_COLUMNS], timeframe)
+
+
+def calculate_timeframe_indicators(df, timeframe, indicators=None):
+    """
+    Calculates technical indicators on weekly or monthly bars resampled from a
+    daily price frame. Results are cached per timeframe, keyed by the daily bars.
+    
+    Args:
+        df (pandas.DataFrame): Daily stock price data (indicator columns, if any,
+            are ignored)
+        timeframe (str): 'daily', 'weekly' or 'monthly'
+        indicators (list, optional): Indicator columns needed (default: all)
+    
+    Returns:
+        pandas.DataFrame: Resampled bars with added technical indicators, or None
+                          if the frame cannot be resampled
+    """
+    columns = tuple(resolve_indicators(indicators))
+    try:
+        prices = df[PRICE_COLUMNS]
+    except KeyError as e:
+        print(f"Error resampling price data to {timeframe} bars: {e}")
+        return None
+    
+    cache_key = _indicator_cache_key(prices, columns, timeframe=timeframe)
+    if cache_key is not None:
+        cached = indicator_cache.get('indicators', cache_key)
+        if cached is not None:
+            return cached
+    
+    try:
+        bars = resample_prices(prices, timeframe)
+    except Exception as e:
+        print(f"Error resampling price data to {timeframe} bars: {e}")
+        return None
+    
+    bars_with_indicators = _compute_technical_indicators(bars, columns)
+    if cache_key is not None and bars_with_indicators is not bars:
+        indicator_cache.set('indicators', cache_key, bars_with_indicators)
+    
+    return bars_with_indicators
+
+
+def _indicator_cache_key(df, columns, tail=None, timeframe='daily', tolerance=None):
+    """
+    Builds the indicator cache key of a price frame.
+    
+    Args:
+        df (pandas.DataFrame): DataFrame with stock price data
+        columns (tuple): Indicator columns requested
+        tail (int, optional): Number of most recent rows requested
+        timeframe (str): Timeframe the daily bars are resampled to (default: 'daily')
+        tolerance (float, optional): Convergence tolerance requested in tail mode
+    
+    Returns:
+        tuple: Content hash of the frame, the timeframe, the columns, the tail, the
+               tolerance and the indicator parameters, or None if the frame cannot
+               be hashed
+    """
+    try:
+        return (content_hash(df), timeframe, columns, tail, tolerance, indicator_parameters())
+    except Exception as e:
+        print(f"Error hashing price data for the indicator cache: {e}")
+        return None
+
+
+def _compute_technical_indicators(df, columns, tail=None, tolerance=None):
+    """
+    Computes the technical indicator columns for calculate_technical_indicators.
+    
+    Args:
+        df (pandas.DataFrame): DataFrame with stock price data
+        columns (tuple): Indicator columns to compute
+        tail (int, optional): Number of most recent rows needed
+        tolerance (float, optional): Convergence tolerance in tail mode
+    
+    Returns:
+        pandas.DataFrame: DataFrame with added technical indicators
+    """
+    try:
         # Check if dataframe is empty
-        if df_with_indicators.empty:
-            return df_with_indicators
+        if df.empty:
+            return df.copy()
         
         # Ensure we have the necessary columns
         required_cols = ['close', 'high', 'low', 'volume']
         for col in required_cols:
-            if col not in df_with_indicators.columns:
+            if col not in df.columns:
                 print(f"Missing required column: {col}")
                 return df
         
-        # Moving Averages
-        df_with_indicators['sma_20'] = SMAIndicator(close=df_with_indicators['close'], window=20).sma_indicator()
-        df_with_indicators['sma_50'] = SMAIndicator(close=df_with_indicators['close'], window=50).sma_indicator()
-        df_with_indicators['sma_200'] = SMAIndicator(close=df_with_indicators['close'], window=200).sma_indicator()
-        
-        df_with_indicators['ema_12'] = EMAIndicator(close=df_with_indicators['close'], window=12).ema_indicator()
-        df_with_indicators['ema_26'] = EMAIndicator(close=df_with_indicators['close'], window=26).ema_indicator()
-        
-        # MACD (calculated from EMAs)
-        df_with_indicators['macd'] = df_with_indicators['ema_12'] - df_with_indicators['ema_26']
-        df_with_indicators['macd_signal'] = EMAIndicator(close=df_with_indicators['macd'], window=9).ema_indicator()
-        df_with_indicators['macd_hist'] = df_with_indicators['macd'] - df_with_indicators['macd_signal']
-        
-        # RSI
-        rsi = RSIIndicator(close=df_with_indicators['close'], window=14)
-        df_with_indicators['rsi'] = rsi.rsi()
-        
-        # Stochastic Oscillator
-        stoch = StochasticOscillator(
-            high=df_with_indicators['high'],
-            low=df_with_indicators['low'],
-            close=df_with_indicators['close'],
-            window=14,
-            smooth_window=3
-        )
-        df_with_indicators['stoch_k'] = stoch.stoch()
-        df_with_indicators['stoch_d'] = stoch.stoch_signal()
-        
-        # ADX
-        adx = ADXIndicator(
-            high=df_with_indicators['high'],
-            low=df_with_indicators['low'],
-            close=df_with_indicators['close'],
-            window=14
-        )
-        df_with_indicators['adx'] = adx.adx()
-        df_with_indicators['pdi'] = adx.adx_pos()
-        df_with_indicators['ndi'] = adx.adx_neg()
-        
-        # Bollinger Bands
-        bollinger = BollingerBands(close=df_with_indicators['close'], window=20, window_dev=2)
-        df_with_indicators['bollinger_high'] = bollinger.bollinger_hband()
-        df_with_indicators['bollinger_low'] = bollinger.bollinger_lband()
-        df_with_indicators['bollinger_mid'] = bollinger.bollinger_mavg()
-        
-        # Volume Indicators
-        df_with_indicators['obv'] = OnBalanceVolumeIndicator(
-            close=df_with_indicators['close'],
-            volume=df_with_indicators['volume']
-        ).on_balance_volume()
-        
-        try:
-            df_with_indicators['mfi'] = MFIIndicator(
-                high=df_with_indicators['high'],
-                low=df_with_indicators['low'],
-                close=df_with_indicators['close'],
-                volume=df_with_indicators['volume'],
-                window=14
-            ).money_flow_index()
-        except:
-            # MFI can fail if there are zeros in volume
-            df_with_indicators['mfi'] = None
-        
-        # Add daily returns
-        df_with_indicators['daily_return'] = df_with_indicators['close'].pct_change() * 100
-        
-        # Add daily volatility (rolling standard deviation of returns)
-        df_with_indicators['volatility_30d'] = df_with_indicators['daily_return'].rolling(window=30).std()
-        
-        return df_with_indicators
+        # The requested indicators are computed by the NumPy engine into one array
+        indicators = indicator_frame(df, columns, tail, tolerance)
+        return pd.concat([df, indicators], axis=1)
     
     except Exception as e:
         print(f"Error calculating technical indicators: {e}")
@@ -162,18 +654,42 @@ def get_fundamental_data(ticker):
     Args:
         ticker (str): Stock ticker symbol
     
+    Returns:
+        dict: Fundamental metrics for the stock
+    """
+    # Resolve any alias to the canonical symbol used for fetching and cache keys
+    yf_ticker = canonical_symbol(ticker)
+    
+    # Don't retry symbols that recently failed or are known to be unavailable
+    if negative_cache.should_skip(yf_ticker):
+        return _fallback_fundamental_data(ticker)
+    
+    fundamental_data = data_cache.get('fundamentals', yf_ticker)
+    if fundamental_data is None:
+        # Concurrent callers for the same symbol wait on a single fetch
+        fundamental_data = _inflight.do(('fundamentals', yf_ticker), _fetch_fundamental_data, ticker, yf_ticker)
+        # Failed lookups (no company info) are retried next time instead of cached
+        if fundamental_data.get('market_cap') is not None:
+            data_cache.set('fundamentals', yf_ticker, fundamental_data)
+    
+    # The shared result may have been requested under another alias of the symbol
+    return dict(fundamental_data, ticker=ticker)
+
+
+def _fetch_fundamental_data(ticker, yf_ticker):
+    """
+    Downloads and derives fundamental metrics for a ticker.
+    
+    Args:
+        ticker (str): Stock ticker symbol as requested
+        yf_ticker (str): Yahoo Finance ticker symbol (with exchange suffix)
+    
     Returns:
         dict: Fundamental metrics for the stock
     """
     try:
-        # Add .NS suffix for Indian stocks if not already present
-        if not ticker.endswith(('.NS', '.BO')) and ticker not in ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'META']:
-            yf_ticker = f"{ticker}.NS"
-        else:
-            yf_ticker = ticker
-        
         # Fetch data from Yahoo Finance
-        stock = yf.Ticker(yf_ticker)
+        stock = yf.Ticker(yf_ticker, session=http_session)
         
         # Get basic info
         try:
@@ -252,12 +768,84 @@ def get_fundamental_data(ticker):
     
     except Exception as e:
         print(f"Error fetching fundamental data for {ticker}: {e}")
-        return {
-            'ticker': ticker,
-            'name': ticker,
-            'sector': 'Unknown',
-            'industry': 'Unknown'
-        }
+        negative_cache.record_failure(yf_ticker, delisted='delisted' in str(e).lower())
+        return _fallback_fundamental_data(ticker)
+
+
+def _fallback_fundamental_data(ticker):
+    """
+    Returns the placeholder fundamentals used when a lookup fails.
+    
+    Args:
+        ticker (str): Stock ticker symbol
+    
+    Returns:
+        dict: Minimal fundamental data for the stock
+    """
+    return {
+        'ticker': ticker,
+        'name': ticker,
+        'sector': 'Unknown',
+        'industry': 'Unknown'
+    }
+
+
+async def get_stock_data_async(ticker, period='1y', incremental=True):
+    """
+    Async variant of get_stock_data. Cache misses run in a worker thread under
+    the fetch engine's concurrency cap, and their requests under the Yahoo rate
+    limit of http_session, so several tickers can be fetched together with
+    asyncio.gather.
+    
+    Args:
+        ticker (str): Stock ticker symbol
+        period (str): Period for data fetching (default: '1y')
+        incremental (bool): Download only bars after the last stored one when possible
+    
+    Returns:
+        pandas.DataFrame: Historical stock data
+    """
+    # Resolve any alias to the canonical symbol used for fetching and cache keys
+    ticker = canonical_symbol(ticker)
+    
+    # Cache hits skip the fetch engine
+    hist_data = _cached_history(ticker, period)
+    if hist_data is not None:
+        return hist_data
+    
+    # Symbols that are backing off are served from the store without a fetch
+    if negative_cache.should_skip(ticker):
+        return get_stock_data(ticker, period, incremental)
+    
+    # Concurrency cap only: http_session rate-limits each request the fetch sends
+    return await fetch_engine.run(None, get_stock_data, ticker, period, incremental)
+
+
+async def get_fundamental_data_async(ticker):
+    """
+    Async variant of get_fundamental_data, throttled by the fetch engine and the
+    rate limit of http_session.
+    
+    Args:
+        ticker (str): Stock ticker symbol
+    
+    Returns:
+        dict: Fundamental metrics for the stock
+    """
+    # Resolve any alias to the canonical symbol used for fetching and cache keys
+    yf_ticker = canonical_symbol(ticker)
+    
+    # Cache hits skip the fetch engine
+    fundamental_data = data_cache.get('fundamentals', yf_ticker)
+    if fundamental_data is not None:
+        return dict(fundamental_data, ticker=ticker)
+    
+    if negative_cache.should_skip(yf_ticker):
+        return _fallback_fundamental_data(ticker)
+    
+    # Concurrency cap only: get_fundamental_data sends several requests, each
+    # rate-limited in http_session
+    return await fetch_engine.run(None, get_fundamental_data, ticker)
 
 
 # Create a directory for caching stock lists
@@ -0,0 +1,661 @@
+import json
+import math
+import os
+from collections import deque
+import pandas as pd
+from utils.indicators import (
+    INDICATOR_COLUMNS,
+    SMA_WINDOWS,
+    EMA_FAST,
+    EMA_SLOW,
+    MACD_SIGNAL_WINDOW,
+    RSI_WINDOW,
+    STOCH_WINDOW,
+    STOCH_SMOOTH_WINDOW,
+    ADX_WINDOW,
+    BOLLINGER_WINDOW,
+    BOLLINGER_DEV,
+    MFI_WINDOW,
+    VOLATILITY_WINDOW,
+    DONCHIAN_WINDOW,
+    WILLIAMS_R_WINDOW,
+    YEAR_HIGH_LOW_WINDOW,
+)
+
+
+# Directory for saved indicator states (one JSON file per ticker)
+INDICATOR_STATE_DIR = os.path.join('cache', 'indicator_state')
+
+NAN = float('nan')
+
+# Scalar state saved before each bar, so that a revision of the bar can undo it
+# without copying the windows
+UNDO_SCALARS = (
+    'count', 'last_date', 'prev_high', 'prev_low', 'prev_close', 'prev_typical_price',
+    'ema_fast', 'ema_slow', 'macd_signal', 'macd_count', 'avg_gain', 'avg_loss',
+    'tr_sum', 'plus_dm_sum', 'minus_dm_sum', 'adx', 'obv', 'values',
+)
+
+# Marks a deque push that did not drop an old value
+_NOTHING_DROPPED = object()
+
+
+class RollingWindow:
+    """
+    Fixed-length window that keeps a running sum and sum of squares, so its mean
+    and standard deviation are updated in O(1) per value.
+    """
+
+    def __init__(self, size, values=()):
+        self.size = size
+        self.values = deque(maxlen=size)
+        self.total = 0.0
+        self.total_sq = 0.0
+        for value in values:
+            self.push(value)
+
+    def push(self, value):
+        """
+        Adds a value, dropping the oldest one once the window is full.
+        
+        Args:
+            value (float): New value
+        
+        Returns:
+            tuple: Record for undo
+        """
+        record = (self.full(), self.values[0] if self.full() else None, self.total, self.total_sq)
+        if len(self.values) == self.size:
+            oldest = self.values[0]
+            self.total -= oldest
+            self.total_sq -= oldest * oldest
+        self.values.append(value)
+        self.total += value
+        self.total_sq += value * value
+        return record
+
+    def undo(self, record):
+        """
+        Reverts the push that returned record (pushes are undone newest first).
+        
+        Args:
+            record (tuple): Record returned by push
+        """
+        was_full, oldest, self.total, self.total_sq = record
+        self.values.pop()
+        if was_full:
+            self.values.appendleft(oldest)
+
+    def full(self):
+        return len(self.values) == self.size
+
+    def mean(self):
+        """
+        Returns the window mean (NaN until the window is full or if it holds NaN).
+        """
+        if not self.full():
+            return NAN
+        return self.total / self.size
+
+    def std(self, ddof=0):
+        """
+        Returns the window standard deviation (NaN until the window is full).
+        
+        Args:
+            ddof (int): Delta degrees of freedom (default: 0)
+        """
+        if not self.full():
+            return NAN
+        mean = self.total / self.size
+        variance = (self.total_sq - self.size * mean * mean) / (self.size - ddof)
+        return math.sqrt(max(variance, 0.0))
+
+
+class MonotonicWindow:
+    """
+    Running maximum (or minimum) of the last size values. Candidates are kept in
+    a deque with values decreasing (increasing) from the front, so each push is
+    amortized O(1) however long the window, e.g. 252 bars for 52-week highs.
+    """
+
+    def __init__(self, size, largest=True, count=0, last_nan=-1, entries=()):
+        self.size = size
+        self.largest = largest
+        self.count = count
+        self.last_nan = last_nan
+        self.entries = deque(tuple(entry) for entry in entries)  # (position, value)
+
+    def push(self, value):
+        """
+        Adds a value, dropping values that left the window or can no longer be
+        the extreme.
+        
+        Args:
+            value (float): New value
+        
+        Returns:
+            tuple: Record for undo, holding only the entries this push removed
+        """
+        count, last_nan = self.count, self.last_nan
+        dominated = []
+        appended = not math.isnan(value)
+        if appended:
+            while self.entries and (
+                self.entries[-1][1] <= value if self.largest else self.entries[-1][1] >= value
+            ):
+                dominated.append(self.entries.pop())
+            self.entries.append((self.count, value))
+        else:
+            self.last_nan = self.count
+        self.count += 1
+        expired = []
+        while self.entries and self.entries[0][0] < self.count - self.size:
+            expired.append(self.entries.popleft())
+        return count, last_nan, dominated, appended, expired
+
+    def undo(self, record):
+        """
+        Reverts the push that returned record (pushes are undone newest first).
+        
+        Args:
+            record (tuple): Record returned by push
+        """
+        self.count, self.last_nan, dominated, appended, expired = record
+        self.entries.extendleft(reversed(expired))
+        if appended:
+            self.entries.pop()
+        self.entries.extend(reversed(dominated))
+
+    def value(self):
+        """
+        Returns the window extreme (NaN until the window is full or while it holds NaN).
+        """
+        if self.count < self.size or self.last_nan >= self.count - self.size:
+            return NAN
+        return self.entries[0][1]
+
+    def to_list(self):
+        return [self.count, self.last_nan, [list(entry) for entry in self.entries]]
+
+
+class StreamingIndicators:
+    """
+    Incremental version of calculate_technical_indicators for one ticker.
+    
+    Keeps rolling windows, EMA values and Wilder accumulators so that each new
+    daily bar costs O(1) instead of a pass over the whole history. Calling update
+    again with the date of the last bar replaces that bar, so an intraday bar can
+    be refreshed repeatedly. The state round-trips through to_dict/from_dict
+    (and save/load) to survive restarts.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.last_date = None
+        self.prev_high = NAN
+        self.prev_low = NAN
+        self.prev_close = NAN
+        self.prev_typical_price = NAN
+
+        self.sma_windows = {window: RollingWindow(window) for window in SMA_WINDOWS}
+        self.bollinger_window = RollingWindow(BOLLINGER_WINDOW)
+        self.return_window = RollingWindow(VOLATILITY_WINDOW)
+
+        self.ema_fast = NAN
+        self.ema_slow = NAN
+        self.macd_signal = NAN
+        self.macd_count = 0
+
+        self.avg_gain = NAN
+        self.avg_loss = NAN
+
+        # Highest highs and lowest lows, one window per look-back length in use
+        sizes = {STOCH_WINDOW, WILLIAMS_R_WINDOW, DONCHIAN_WINDOW, YEAR_HIGH_LOW_WINDOW}
+        self.highs = {size: MonotonicWindow(size, largest=True) for size in sizes}
+        self.lows = {size: MonotonicWindow(size, largest=False) for size in sizes}
+        self.stoch_ks = deque(maxlen=STOCH_SMOOTH_WINDOW)
+
+        # ADX: Wilder sums of true range and directional movement, plus the DX
+        # values collected to seed the ADX average
+        self.tr_sum = 0.0
+        self.plus_dm_sum = 0.0
+        self.minus_dm_sum = 0.0
+        self.dx_seed = []
+        self.adx = 0.0
+
+        self.obv = 0.0
+        self.positive_flows = deque(maxlen=MFI_WINDOW)
+        self.negative_flows = deque(maxlen=MFI_WINDOW)
+
+        self.values = {}
+        # Undo record of the last bar (scalars before it and the window pushes it
+        # made) and the bar itself, used when that bar is revised
+        self._undo = None
+        self._last_bar = None
+        self._pushes = []
+
+    @classmethod
+    def from_history(cls, df):
+        """
+        Builds the state by replaying a price history.
+        
+        Args:
+            df (pandas.DataFrame): Price data with 'date', 'high', 'low', 'close'
+                and 'volume' columns, sorted by date
+        
+        Returns:
+            StreamingIndicators: State after the last bar of df
+        """
+        state = cls()
+        bars = [bar._asdict() for bar in df[['date', 'high', 'low', 'close', 'volume']].itertuples(index=False)]
+        for bar in bars[:-1]:
+            state._apply(bar)
+        if bars:
+            # Go through update for the last bar so it can still be revised
+            state.update(bars[-1])
+        return state
+
+    def update(self, bar):
+        """
+        Adds a bar (or replaces the last one if it has the same date) and returns
+        the indicator values for it.
+        
+        Args:
+            bar (dict): Bar with 'date', 'high', 'low', 'close' and 'volume'
+        
+        Returns:
+            dict: Indicator values keyed like the calculate_technical_indicators columns
+        """
+        date = pd.Timestamp(bar['date'])
+        if self.last_date is not None and date < self.last_date:
+            raise ValueError(f"Bar dated {date.date()} is older than the last bar ({self.last_date.date()})")
+        if self.last_date is not None and date == self.last_date:
+            if self._undo is None:
+                raise ValueError(f"Bar dated {date.date()} cannot be revised after a restore")
+            self._revert()
+        
+        # O(1) undo information: the scalars, plus what each window push dropped
+        scalars = {name: getattr(self, name) for name in UNDO_SCALARS}
+        scalars['dx_seed'] = list(self.dx_seed)  # at most ADX_WINDOW values, early on
+        values = self._apply(bar)
+        self._undo = (scalars, self._pushes)
+        self._last_bar = {
+            'date': date.isoformat(),
+            **{field: float(bar[field]) for field in ('high', 'low', 'close', 'volume')},
+        }
+        return values
+
+    def _revert(self):
+        # Undoes the last bar: window pushes newest first, then the scalars
+        scalars, pushes = self._undo
+        for window, record in reversed(pushes):
+            if isinstance(window, deque):
+                window.pop()
+                if record is not _NOTHING_DROPPED:
+                    window.appendleft(record)
+            else:
+                window.undo(record)
+        for name, value in scalars.items():
+            setattr(self, name, value)
+        self._undo = None
+        self._last_bar = None
+
+    def _push(self, window, value):
+        # Pushes onto a window or bounded deque, logging the undo record
+        if isinstance(window, deque):
+            record = window[0] if len(window) == window.maxlen else _NOTHING_DROPPED
+            window.append(value)
+        else:
+            record = window.push(value)
+        self._pushes.append((window, record))
+
+    def _apply(self, bar):
+        date = pd.Timestamp(bar['date'])
+        high = float(bar['high'])
+        low = float(bar['low'])
+        close = float(bar['close'])
+        volume = float(bar['volume'])
+        i = self.count
+        values = {}
+        self._pushes = []
+
+        # Moving averages and Bollinger bands
+        for window, rolling_window in self.sma_windows.items():
+            self._push(rolling_window, close)
+            values[f"sma_{window}"] = rolling_window.mean()
+        self._push(self.bollinger_window, close)
+        mid = self.bollinger_window.mean()
+        band = BOLLINGER_DEV * self.bollinger_window.std()
+        values['bollinger_mid'] = mid
+        values['bollinger_high'] = mid + band
+        values['bollinger_low'] = mid - band
+
+        # EMAs and MACD
+        self.ema_fast = _ema_step(self.ema_fast, close, 2.0 / (EMA_FAST + 1))
+        self.ema_slow = _ema_step(self.ema_slow, close, 2.0 / (EMA_SLOW + 1))
+        values['ema_12'] = self.ema_fast if i >= EMA_FAST - 1 else NAN
+        values['ema_26'] = self.ema_slow if i >= EMA_SLOW - 1 else NAN
+        macd = values['ema_12'] - values['ema_26']
+        if not math.isnan(macd):
+            self.macd_signal = _ema_step(self.macd_signal, macd, 2.0 / (MACD_SIGNAL_WINDOW + 1))
+            self.macd_count += 1
+        signal = self.macd_signal if self.macd_count >= MACD_SIGNAL_WINDOW else NAN
+        values['macd'] = macd
+        values['macd_signal'] = signal
+        values['macd_hist'] = macd - signal
+
+        # RSI (Wilder averages; the first bar counts as no move)
+        diff = close - self.prev_close
+        gain = diff if diff > 0 else 0.0
+        loss = -diff if diff < 0 else 0.0
+        self.avg_gain = _ema_step(self.avg_gain, gain, 1.0 / RSI_WINDOW)
+        self.avg_loss = _ema_step(self.avg_loss, loss, 1.0 / RSI_WINDOW)
+        if i < RSI_WINDOW - 1:
+            values['rsi'] = NAN
+        elif self.avg_loss == 0:
+            values['rsi'] = 100.0
+        else:
+            values['rsi'] = 100.0 - 100.0 / (1.0 + self.avg_gain / self.avg_loss)
+
+        # Stochastic oscillator
+        for window in self.highs.values():
+            self._push(window, high)
+        for window in self.lows.values():
+            self._push(window, low)
+        stoch_k = _channel_position(close, self.highs[STOCH_WINDOW].value(), self.lows[STOCH_WINDOW].value())
+        self._push(self.stoch_ks, stoch_k)
+        values['stoch_k'] = stoch_k
+        values['stoch_d'] = (
+            sum(self.stoch_ks) / STOCH_SMOOTH_WINDOW if len(self.stoch_ks) == STOCH_SMOOTH_WINDOW else NAN
+        )
+
+        self._update_adx(i, high, low, close, values)
+
+        # Channels and 52-week range
+        values['donchian_high'] = self.highs[DONCHIAN_WINDOW].value()
+        values['donchian_low'] = self.lows[DONCHIAN_WINDOW].value()
+        values['donchian_mid'] = (values['donchian_high'] - values['donchian_low']) / 2.0 + values['donchian_low']
+        values['williams_r'] = _channel_position(
+            close, self.highs[WILLIAMS_R_WINDOW].value(), self.lows[WILLIAMS_R_WINDOW].value()
+        ) - 100.0
+        values['high_52w'] = self.highs[YEAR_HIGH_LOW_WINDOW].value()
+        values['low_52w'] = self.lows[YEAR_HIGH_LOW_WINDOW].value()
+
+        # On-balance volume
+        self.obv += -volume if close < self.prev_close else volume
+        values['obv'] = self.obv
+
+        # Money flow index
+        typical_price = (high + low + close) / 3.0
+        if typical_price > self.prev_typical_price:
+            flow = typical_price * volume
+        elif typical_price < self.prev_typical_price:
+            flow = -typical_price * volume
+        else:
+            flow = 0.0
+        self._push(self.positive_flows, flow if flow >= 0 else 0.0)
+        self._push(self.negative_flows, -flow if flow < 0 else 0.0)
+        if len(self.positive_flows) < MFI_WINDOW:
+            values['mfi'] = NAN
+        else:
+            positive = math.fsum(self.positive_flows)
+            negative = math.fsum(self.negative_flows)
+            if negative == 0:
+                values['mfi'] = NAN if positive == 0 else 100.0
+            else:
+                values['mfi'] = 100 - 100 / (1 + positive / negative)
+
+        # Daily return and volatility
+        daily_return = (close / self.prev_close - 1) * 100
+        values['daily_return'] = daily_return
+        if not math.isnan(daily_return):
+            self._push(self.return_window, daily_return)
+        values['volatility_30d'] = self.return_window.std(ddof=1)
+
+        self.count += 1
+        self.last_date = date
+        self.prev_high = high
+        self.prev_low = low
+        self.prev_close = close
+        self.prev_typical_price = typical_price
+        self.values = {column: values[column] for column in INDICATOR_COLUMNS}
+        return dict(self.values)
+
+    def _update_adx(self, i, high, low, close, values):
+        # Mirrors ta's ADXIndicator: sums are seeded over bars 1..w, +DI/-DI are
+        # reported from bar w+1 and ADX from bar 2w-1; earlier values are 0
+        w = ADX_WINDOW
+        values['adx'] = values['pdi'] = values['ndi'] = 0.0
+        if i == 0:
+            return
+
+        true_range = max(high, self.prev_close) - min(low, self.prev_close)
+        up_move = high - self.prev_high
+        down_move = self.prev_low - low
+        plus_dm = up_move if up_move > down_move and up_move > 0 else 0.0
+        minus_dm = down_move if down_move > up_move and down_move > 0 else 0.0
+
+        if i <= w:
+            self.tr_sum += true_range
+            self.plus_dm_sum += plus_dm
+            self.minus_dm_sum += minus_dm
+        else:
+            decay = 1 - 1.0 / w
+            self.tr_sum = self.tr_sum * decay + true_range
+            self.plus_dm_sum = self.plus_dm_sum * decay + plus_dm
+            self.minus_dm_sum = self.minus_dm_sum * decay + minus_dm
+        if i < w:
+            return
+
+        pos_di = 100 * self.plus_dm_sum / self.tr_sum if self.tr_sum != 0 else 0.0
+        neg_di = 100 * self.minus_dm_sum / self.tr_sum if self.tr_sum != 0 else 0.0
+        di_sum = pos_di + neg_di
+        dx = 100 * abs((pos_di - neg_di) / di_sum) if di_sum != 0 else 0.0
+        if i > w:
+            values['pdi'] = pos_di
+            values['ndi'] = neg_di
+
+        if i < 2 * w - 1:
+            self.dx_seed.append(dx)
+        elif i == 2 * w - 1:
+            self.dx_seed.append(dx)
+            self.adx = sum(self.dx_seed) / w
+            self.dx_seed = []
+        else:
+            self.adx = (self.adx * (w - 1) + dx) / float(w)
+        if i >= 2 * w - 1:
+            values['adx'] = self.adx
+
+    def to_dict(self):
+        """
+        Serializes the state (JSON-compatible apart from NaN floats).
+        
+        Returns:
+            dict: State that from_dict can restore
+        """
+        return {
+            'count': self.count,
+            'last_date': None if self.last_date is None else self.last_date.isoformat(),
+            'prev': [self.prev_high, self.prev_low, self.prev_close, self.prev_typical_price],
+            'sma_windows': {str(w): list(rw.values) for w, rw in self.sma_windows.items()},
+            'bollinger_window': list(self.bollinger_window.values),
+            'return_window': list(self.return_window.values),
+            'ema': [self.ema_fast, self.ema_slow, self.macd_signal, self.macd_count],
+            'rsi': [self.avg_gain, self.avg_loss],
+            'stoch': list(self.stoch_ks),
+            'extremes': {
+                'highs': {str(size): window.to_list() for size, window in self.highs.items()},
+                'lows': {str(size): window.to_list() for size, window in self.lows.items()},
+            },
+            'adx': [self.tr_sum, self.plus_dm_sum, self.minus_dm_sum, list(self.dx_seed), self.adx],
+            'obv': self.obv,
+            'flows': [list(self.positive_flows), list(self.negative_flows)],
+            'values': dict(self.values),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Restores a state produced by to_dict.
+        
+        Args:
+            data (dict): Serialized state
+        
+        Returns:
+            StreamingIndicators: Restored state
+        """
+        state = cls()
+        state._restore(data)
+        return state
+
+    def _restore(self, data):
+        self.count = data['count']
+        self.last_date = None if data['last_date'] is None else pd.Timestamp(data['last_date'])
+        self.prev_high, self.prev_low, self.prev_close, self.prev_typical_price = data['prev']
+        self.sma_windows = {int(w): RollingWindow(int(w), values) for w, values in data['sma_windows'].items()}
+        self.bollinger_window = RollingWindow(BOLLINGER_WINDOW, data['bollinger_window'])
+        self.return_window = RollingWindow(VOLATILITY_WINDOW, data['return_window'])
+        self.ema_fast, self.ema_slow, self.macd_signal, self.macd_count = data['ema']
+        self.avg_gain, self.avg_loss = data['rsi']
+        self.stoch_ks = deque(data['stoch'], maxlen=STOCH_SMOOTH_WINDOW)
+        self.highs = {
+            int(size): MonotonicWindow(int(size), True, *window)
+            for size, window in data['extremes']['highs'].items()
+        }
+        self.lows = {
+            int(size): MonotonicWindow(int(size), False, *window)
+            for size, window in data['extremes']['lows'].items()
+        }
+        self.tr_sum, self.plus_dm_sum, self.minus_dm_sum, dx_seed, self.adx = data['adx']
+        self.dx_seed = list(dx_seed)
+        self.obv = data['obv']
+        positive_flows, negative_flows = data['flows']
+        self.positive_flows = deque(positive_flows, maxlen=MFI_WINDOW)
+        self.negative_flows = deque(negative_flows, maxlen=MFI_WINDOW)
+        self.values = dict(data['values'])
+        self._undo = None
+        self._last_bar = None
+        self._pushes = []
+
+    def _previous_dict(self):
+        # State before the last bar, for saving: undo the bar, serialize, and
+        # apply it again (O(window), like to_dict itself)
+        if self._undo is None:
+            return None
+        bar = self._last_bar
+        self._revert()
+        previous = self.to_dict()
+        self.update(bar)
+        return previous
+
+    def save(self, ticker, state_dir=INDICATOR_STATE_DIR):
+        """
+        Writes the state for a ticker to disk.
+        
+        Args:
+            ticker (str): Stock ticker symbol
+            state_dir (str): Directory holding the state files
+        """
+        os.makedirs(state_dir, exist_ok=True)
+        path = _state_path(ticker, state_dir)
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                # Keep the state before the last bar, and the bar, so it can still be
+                # revised after a restart
+                json.dump({
+                    'state': self.to_dict(),
+                    'previous': self._previous_dict(),
+                    'last_bar': self._last_bar,
+                }, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Error saving indicator state for {ticker}: {e}")
+
+    @classmethod
+    def load(cls, ticker, state_dir=INDICATOR_STATE_DIR):
+        """
+        Reads the saved state for a ticker.
+        
+        Args:
+            ticker (str): Stock ticker symbol
+            state_dir (str): Directory holding the state files
+        
+        Returns:
+            StreamingIndicators: Saved state, or None if there is none
+        """
+        path = _state_path(ticker, state_dir)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+            if data.get('previous') is not None and data.get('last_bar') is not None:
+                # Replaying the last bar rebuilds the state and its undo record
+                state = cls.from_dict(data['previous'])
+                state.update(data['last_bar'])
+            else:
+                state = cls.from_dict(data['state'])
+            return state
+        except Exception as e:
+            print(f"Error reading indicator state for {ticker}: {e}")
+            return None
+
+
+def _ema_step(previous, value, alpha):
+    # adjust=False recursion, seeded with the first value
+    if math.isnan(previous):
+        return value
+    return (1 - alpha) * previous + alpha * value
+
+
+def _channel_position(close, highest, lowest):
+    # Close within the high-low range, 0 to 100 (NaN for an empty range)
+    if math.isnan(highest) or math.isnan(lowest) or highest == lowest:
+        return NAN
+    return 100 * (close - lowest) / (highest - lowest)
+
+
+def _state_path(ticker, state_dir):
+    safe_ticker = ticker.replace('/', '_').replace('^', '_')
+    return os.path.join(state_dir, f"{safe_ticker}.json")
+
+
+def refresh_state(ticker, df, state_dir=INDICATOR_STATE_DIR):
+    """
+    Brings the saved indicator state of a ticker up to date with a price frame.
+    Only bars from the last processed date onwards are applied; the state is
+    rebuilt from df when there is none or it no longer lines up with df.
+    
+    Args:
+        ticker (str): Stock ticker symbol
+        df (pandas.DataFrame): Price data with 'date', 'high', 'low', 'close' and
+            'volume' columns, sorted by date
+        state_dir (str): Directory holding the state files
+    
+    Returns:
+        StreamingIndicators: Updated state (also saved to disk)
+    """
+    if df is None or df.empty:
+        return None
+    
+    state = StreamingIndicators.load(ticker, state_dir)
+    first_date = pd.Timestamp(df['date'].iloc[0])
+    last_date = pd.Timestamp(df['date'].iloc[-1])
+    
+    # A state whose last bar cannot be revised (e.g. saved without it) is rebuilt
+    if (
+        state is None
+        or state.last_date is None
+        or state._undo is None
+        or not first_date <= state.last_date <= last_date
+    ):
+        state = StreamingIndicators.from_history(df)
+    else:
+        # Re-apply the last processed bar too, in case it has been revised
+        start = df['date'].searchsorted(state.last_date)
+        for bar in df.iloc[start:][['date', 'high', 'low', 'close', 'volume']].to_dict('records'):
+            state.update(bar)
+    
+    state.save(ticker, state_dir)
+    return state
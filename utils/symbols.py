@@ -0,0 +1,185 @@
+import csv
+import os
+import sys
+import threading
+from collections import namedtuple
+from functools import lru_cache
+
+
+# Reference file listing known instruments and their aliases
+SYMBOL_MASTER_FILE = os.path.join('data', 'symbol_master.csv')
+
+# Exchange assumed for bare symbols that are not in the symbol master
+DEFAULT_EXCHANGE = 'NSE'
+
+# Yahoo Finance suffix and currency per exchange
+EXCHANGE_SUFFIXES = {'NSE': '.NS', 'BSE': '.BO'}
+EXCHANGE_PREFIXES = {'NSE': 'NSE', 'BSE': 'BSE', 'BOM': 'BSE', 'NASDAQ': 'NASDAQ', 'NYSE': 'NYSE'}
+EXCHANGE_CURRENCIES = {'NSE': 'INR', 'BSE': 'INR', 'NASDAQ': 'USD', 'NYSE': 'USD'}
+
+# Most recent symbols missing from the symbol master whose inferred entries are
+# kept; lookups can come from user input, so the alias index itself never grows
+INFERRED_SYMBOL_CACHE_SIZE = 4096
+
+SymbolInfo = namedtuple('SymbolInfo', ['symbol', 'base', 'exchange', 'currency', 'isin', 'name'])
+
+_aliases = None
+_load_lock = threading.Lock()
+
+
+def _alias_keys(info, extra_aliases=()):
+    """
+    Lists the lookup keys under which an instrument can be found.
+    
+    Args:
+        info (SymbolInfo): Instrument
+        extra_aliases (iterable): Additional aliases from the reference file
+    
+    Returns:
+        list: Upper-case alias keys
+    """
+    keys = [info.symbol, f"{info.exchange}:{info.base}"]
+    if info.exchange == 'BSE':
+        keys.append(f"BOM:{info.base}")
+    if info.isin:
+        keys.append(info.isin)
+    keys.extend(extra_aliases)
+    return [key.upper() for key in keys]
+
+
+def _load_symbol_master():
+    """
+    Builds the alias index from the reference file.
+    Bare symbols and ISINs map to the NSE listing when an instrument trades on both
+    exchanges.
+    
+    Returns:
+        dict: Upper-case alias to SymbolInfo
+    """
+    aliases = {}
+    bare = {}
+
+    try:
+        with open(SYMBOL_MASTER_FILE, newline='') as f:
+            rows = list(csv.DictReader(f))
+    except Exception as e:
+        print(f"Error reading symbol master: {e}")
+        rows = []
+
+    for row in rows:
+        info = SymbolInfo(
+            symbol=sys.intern(row['symbol'].upper()),
+            base=sys.intern(row['base'].upper()),
+            exchange=row['exchange'],
+            currency=row['currency'],
+            isin=row['isin'] or None,
+            name=row['name'],
+        )
+        extra_aliases = [alias for alias in row.get('aliases', '').split('|') if alias]
+        for key in _alias_keys(info, extra_aliases):
+            # An ISIN is shared by all listings; like bare symbols it maps to NSE
+            if key == info.isin and key in aliases and info.exchange != DEFAULT_EXCHANGE:
+                continue
+            aliases[key] = info
+
+        # Prefer the NSE listing for bare symbols
+        if info.base not in bare or info.exchange == DEFAULT_EXCHANGE:
+            bare[info.base] = info
+
+    for base, info in bare.items():
+        aliases.setdefault(base, info)
+
+    return aliases
+
+
+def _get_aliases():
+    global _aliases
+    if _aliases is None:
+        with _load_lock:
+            if _aliases is None:
+                _aliases = _load_symbol_master()
+    return _aliases
+
+
+@lru_cache(maxsize=INFERRED_SYMBOL_CACHE_SIZE)
+def _infer_symbol(key):
+    """
+    Builds SymbolInfo for a symbol missing from the reference file.
+    
+    Args:
+        key (str): Upper-case symbol, e.g. 'ABC', 'ABC.BO' or 'BSE:ABC'
+    
+    Returns:
+        SymbolInfo: Inferred instrument (bare symbols are assumed to be NSE listings)
+    """
+    exchange = DEFAULT_EXCHANGE
+    base = key
+
+    if ':' in key:
+        prefix, base = key.split(':', 1)
+        exchange = EXCHANGE_PREFIXES.get(prefix, prefix)
+    else:
+        for suffix_exchange, suffix in EXCHANGE_SUFFIXES.items():
+            if key.endswith(suffix):
+                exchange = suffix_exchange
+                base = key[:-len(suffix)]
+                break
+
+    symbol = base + EXCHANGE_SUFFIXES.get(exchange, '')
+    return SymbolInfo(
+        symbol=sys.intern(symbol),
+        base=sys.intern(base),
+        exchange=exchange,
+        currency=EXCHANGE_CURRENCIES.get(exchange),
+        isin=None,
+        name=base,
+    )
+
+
+def resolve_symbol(symbol):
+    """
+    Resolves any alias of an instrument ('RELIANCE', 'reliance.ns', 'NSE:RELIANCE',
+    'INE002A01018') to its symbol-master entry in O(1).
+    
+    Args:
+        symbol (str): Ticker or alias
+    
+    Returns:
+        SymbolInfo: Canonical Yahoo Finance symbol, base ticker, exchange, currency,
+                    ISIN (None if unknown) and name
+    """
+    aliases = _get_aliases()
+    key = symbol.strip().upper()
+    info = aliases.get(key)
+    if info is None:
+        info = _infer_symbol(key)
+    return info
+
+
+def canonical_symbol(symbol):
+    """
+    Returns the canonical (Yahoo Finance) symbol used for fetching, cache keys and
+    the database.
+    
+    Args:
+        symbol (str): Ticker or alias
+    
+    Returns:
+        str: Interned canonical symbol, e.g. 'RELIANCE.NS'
+    """
+    return resolve_symbol(symbol).symbol
+
+
+def display_symbol(symbol):
+    """
+    Returns the short ticker shown in the UI: the base ticker for NSE listings,
+    the canonical symbol otherwise.
+    
+    Args:
+        symbol (str): Ticker or alias
+    
+    Returns:
+        str: Display ticker, e.g. 'RELIANCE' or 'RELIANCE.BO'
+    """
+    info = resolve_symbol(symbol)
+    return info.base if info.exchange == DEFAULT_EXCHANGE else info.symbol
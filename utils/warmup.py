@@ -0,0 +1,195 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta
+import pandas as pd
+from utils.db import SessionLocal, Stock, Holding
+from utils.cache import negative_cache
+from utils.symbols import canonical_symbol
+from utils.analysis import ANALYSIS_INDICATORS, CONFIRMATION_TIMEFRAMES, TIMEFRAME_INDICATORS
+from utils.stock_data import (
+    get_stock_list,
+    get_stock_data_batch,
+    get_fundamental_data_async,
+    calculate_technical_indicators_batch,
+    calculate_timeframe_indicators,
+)
+
+
+# Daily warm-up time in exchange local time (NSE opens at 09:15 IST). Prices are
+# warmed first and must still be cached at the open, so the warm-up starts less
+# than the price cache TTL (CACHE_TTLS['prices'], 5 minutes) before it; the
+# price store stays fresh for longer. Indicator entries do not expire, and
+# fundamentals stay cached for most of the session.
+WARMUP_TIME = '09:12'
+WARMUP_TIMEZONE = 'Asia/Kolkata'
+
+# Period warmed for prices and indicators (the default used by the analysis pages)
+WARMUP_PERIOD = '1y'
+
+_scheduler_thread = None
+_scheduler_lock = threading.Lock()
+_last_report = None
+
+
+def get_warmup_symbols():
+    """
+    Collects the symbols to warm: every stock held in any portfolio plus the
+    get_stock_list() universe. Symbols marked unavailable are left out.
+    
+    Returns:
+        list: Canonical ticker symbols, holdings first
+    """
+    tickers = []
+
+    db = SessionLocal()
+    try:
+        rows = db.query(Stock.ticker).join(Holding, Holding.stock_id == Stock.id).distinct().all()
+        tickers.extend(row.ticker for row in rows)
+    except Exception as e:
+        print(f"Error reading holdings for warm-up: {e}")
+    finally:
+        db.close()
+
+    tickers.extend(stock['ticker'] for stock in get_stock_list())
+
+    symbols = []
+    seen = set()
+    for ticker in tickers:
+        symbol = canonical_symbol(ticker)
+        if symbol in seen or negative_cache.is_unavailable(symbol):
+            continue
+        seen.add(symbol)
+        symbols.append(symbol)
+    return symbols
+
+
+async def _warm_fundamentals(symbols):
+    # get_fundamental_data_async runs under the fetch engine's concurrency cap;
+    # each Yahoo request it sends takes a token in http_session
+    results = await asyncio.gather(*(get_fundamental_data_async(symbol) for symbol in symbols))
+    return sum(1 for result in results if result.get('market_cap') is not None)
+
+
+def warm_caches(symbols=None):
+    """
+    Fills the price, indicator and fundamentals caches ahead of the session.
+    
+    Args:
+        symbols (list, optional): Symbols to warm (default: get_warmup_symbols())
+    
+    Returns:
+        dict: Number of symbols covered, how many were warmed per data type and
+              the duration in seconds
+    """
+    global _last_report
+
+    started = time.monotonic()
+    if symbols is None:
+        symbols = get_warmup_symbols()
+
+    # Prices: grouped downloads, each request taking a Yahoo rate-limit token
+    price_data = get_stock_data_batch(symbols, period=WARMUP_PERIOD)
+
+    # Indicators: computed in one panel pass from the same frames, with the same
+    # columns (and no tail) as perform_complete_analysis and the recommendations,
+    # so their cache keys match; plus the weekly and monthly confirmation bars
+    try:
+        indicator_data = calculate_technical_indicators_batch(price_data, ANALYSIS_INDICATORS)
+        indicators_warmed = sum(1 for data in indicator_data.values() if not data.empty)
+        for data in price_data.values():
+            if data is None or data.empty:
+                continue
+            for timeframe in CONFIRMATION_TIMEFRAMES:
+                calculate_timeframe_indicators(data, timeframe, TIMEFRAME_INDICATORS)
+    except Exception as e:
+        print(f"Error warming indicators: {e}")
+        indicators_warmed = 0
+
+    # Fundamentals: several requests per symbol, each rate-limited
+    try:
+        fundamentals_warmed = asyncio.run(_warm_fundamentals(symbols))
+    except Exception as e:
+        print(f"Error warming fundamentals: {e}")
+        fundamentals_warmed = 0
+
+    report = {
+        'symbols': len(symbols),
+        'prices': sum(1 for data in price_data.values() if data is not None),
+        'indicators': indicators_warmed,
+        'fundamentals': fundamentals_warmed,
+        'duration': round(time.monotonic() - started, 1),
+        'finished_at': datetime.now(),
+    }
+    _last_report = report
+
+    print(
+        f"Cache warm-up covered {report['symbols']} symbols in {report['duration']}s "
+        f"(prices: {report['prices']}, indicators: {report['indicators']}, "
+        f"fundamentals: {report['fundamentals']})"
+    )
+    return report
+
+
+def next_warmup_time(now=None):
+    """
+    Returns the next scheduled warm-up time.
+    
+    Args:
+        now (pandas.Timestamp, optional): Current time (default: now)
+    
+    Returns:
+        pandas.Timestamp: Next WARMUP_TIME in WARMUP_TIMEZONE, skipping weekends
+    """
+    if now is None:
+        now = pd.Timestamp.now(tz=WARMUP_TIMEZONE)
+    hour, minute = (int(part) for part in WARMUP_TIME.split(':'))
+    run_at = now.normalize() + timedelta(hours=hour, minutes=minute)
+    if run_at <= now:
+        run_at += timedelta(days=1)
+    while run_at.weekday() >= 5:
+        run_at += timedelta(days=1)
+    return run_at
+
+
+def _scheduler_loop():
+    while True:
+        now = pd.Timestamp.now(tz=WARMUP_TIMEZONE)
+        time.sleep(max((next_warmup_time(now) - now).total_seconds(), 0))
+        try:
+            warm_caches()
+        except Exception as e:
+            print(f"Error during cache warm-up: {e}")
+
+
+def start_warmup_scheduler():
+    """
+    Starts the background thread that warms the caches before each session.
+    Calling it again (e.g. on a Streamlit rerun) has no effect.
+    
+    Returns:
+        bool: True if the scheduler was started by this call
+    """
+    global _scheduler_thread
+
+    with _scheduler_lock:
+        if _scheduler_thread is not None and _scheduler_thread.is_alive():
+            return False
+        _scheduler_thread = threading.Thread(target=_scheduler_loop, name='cache-warmup', daemon=True)
+        _scheduler_thread.start()
+        return True
+
+
+def get_last_warmup_report():
+    """
+    Returns the report of the most recent warm-up in this process.
+    
+    Returns:
+        dict: Report from warm_caches, or None if no warm-up has run yet
+    """
+    return _last_report
+
+
+if __name__ == '__main__':
+    # Run a one-off warm-up, e.g. from cron before the market opens
+    warm_caches()